@@ -0,0 +1,420 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import logging
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.nav_graph import NavGraph
+from models.robot import RobotStatus
+from controllers.fleet_manager import FleetManager
+from controllers.simulator import Simulator
+from planning.planners import PLANNERS
+from planning.route_cache import NextHopTable
+from utils.log_pipeline import install_log_pipeline
+from utils.graph_generators import generate_grid_graph, generate_warehouse_graph, write_graph
+
+UPDATE_MODES = {
+    "scalar": {},
+    "vectorized": {"vectorized": True},
+    "event_driven": {"event_driven": True},
+}
+
+class MockCanvas:
+    """Stand-in for a Tk canvas that only hands out item IDs and counts calls."""
+    def __init__(self, width: int, height: int):
+        """
+        Initialize the canvas.
+
+        Args:
+            width: Canvas width in pixels.
+            height: Canvas height in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.next_item = 1
+        self.calls = 0
+
+    def _create(self, *args, **kwargs) -> int:
+        item = self.next_item
+        self.next_item += 1
+        self.calls += 1
+        return item
+
+    create_line = create_oval = create_text = _create
+
+    def _call(self, *args, **kwargs) -> None:
+        self.calls += 1
+
+    coords = itemconfig = delete = tag_raise = bind = _call
+
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+class MockText:
+    """Stand-in for the Tk widgets the GUI writes status and log text to."""
+    def insert(self, *args) -> None:
+        pass
+
+    def delete(self, *args) -> None:
+        pass
+
+    def see(self, *args) -> None:
+        pass
+
+    def config(self, **kwargs) -> None:
+        pass
+
+    def index(self, *args) -> str:
+        return "1.0"
+
+def create_headless_gui(nav_graph: NavGraph, fleet_manager: FleetManager, use_tk: bool):
+    """
+    Create a FleetGUI that is drawn on demand instead of from its own update loop.
+
+    Args:
+        nav_graph: NavGraph to display.
+        fleet_manager: FleetManager whose robots are drawn.
+        use_tk: True to draw on a real (withdrawn) Tk canvas, False to use MockCanvas.
+
+    Returns:
+        Tuple of (FleetGUI, backend name).
+    """
+    import tkinter as tk
+    from gui.fleet_gui import FleetGUI
+
+    class HeadlessFleetGUI(FleetGUI):
+        def update_display(self) -> None:
+            pass  # Frames are drawn by the benchmark
+
+        if not use_tk:
+            def setup_gui(self) -> None:
+                self.canvas = MockCanvas(self.canvas_width, self.canvas_height)
+                self.log_text = MockText()
+                self.status_label = MockText()
+
+    if use_tk:
+        root = tk.Tk()
+        root.withdraw()
+    else:
+        root = type("MockRoot", (), {"title": lambda self, title: None})()
+    simulator = Simulator(fleet_manager)
+    return HeadlessFleetGUI(root, nav_graph, fleet_manager, simulator), "tk" if use_tk else "mock"
+
+def tk_available() -> bool:
+    """
+    Check whether a Tk display can be opened.
+
+    Returns:
+        True if tkinter can create a root window.
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+def spawn_fleet(fleet_manager: FleetManager, num_robots: int, rng: random.Random) -> None:
+    """
+    Spawn robots at random vertices.
+
+    Args:
+        fleet_manager: FleetManager to spawn into.
+        num_robots: Number of robots.
+        rng: Random number generator.
+    """
+    num_vertices = len(fleet_manager.nav_graph.vertices)
+    for _ in range(num_robots):
+        fleet_manager.spawn_robot(rng.randrange(num_vertices))
+
+def assign_random_tasks(fleet_manager: FleetManager, rng: random.Random) -> int:
+    """
+    Give every idle or finished robot a random destination.
+
+    Args:
+        fleet_manager: FleetManager whose robots get tasks.
+        rng: Random number generator.
+
+    Returns:
+        Number of tasks assigned.
+    """
+    num_vertices = len(fleet_manager.nav_graph.vertices)
+    assigned = 0
+    for robot_id, robot in fleet_manager.get_all_robots().items():
+        if robot.get_status() in (RobotStatus.IDLE, RobotStatus.TASK_COMPLETE):
+            if fleet_manager.assign_task(robot_id, rng.randrange(num_vertices)):
+                assigned += 1
+    return assigned
+
+def random_queries(nav_graph: NavGraph, num_queries: int, seed: int) -> List[Tuple[int, int]]:
+    """
+    Pick random query endpoints.
+
+    Args:
+        nav_graph: NavGraph to query.
+        num_queries: Number of queries.
+        seed: Random seed.
+
+    Returns:
+        List of (start vertex, end vertex).
+    """
+    rng = random.Random(seed)
+    num_vertices = len(nav_graph.vertices)
+    return [(rng.randrange(num_vertices), rng.randrange(num_vertices)) for _ in range(num_queries)]
+
+def bench_path_queries(graph_file: str, planner: str, num_queries: int, seed: int) -> Dict[str, float]:
+    """
+    Measure path query throughput of a planner on a freshly loaded graph.
+    The route cache and the all-pairs next-hop table are disabled, so every
+    query runs the planner (see bench_next_hop_table for the table).
+
+    Args:
+        graph_file: Path to the graph JSON file.
+        planner: Name of the planner.
+        num_queries: Number of random queries.
+        seed: Random seed for the query endpoints.
+
+    Returns:
+        Dictionary with queries per second, the share of queries that found a
+        path and the time spent preprocessing before the first query.
+    """
+    nav_graph = NavGraph(graph_file, route_cache_size=0, all_pairs_max_vertices=0)
+    queries = random_queries(nav_graph, num_queries, seed)
+
+    start = time.perf_counter()
+    nav_graph.get_planner(planner).prepare()
+    preprocess_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(1 for start_vertex, end_vertex in queries
+                if nav_graph.find_path(start_vertex, end_vertex, planner))
+    elapsed = time.perf_counter() - start
+    return {
+        "queries_per_second": num_queries / elapsed if elapsed > 0 else math.inf,
+        "found_ratio": found / num_queries if num_queries else 0.0,
+        "preprocess_seconds": preprocess_seconds,
+    }
+
+def bench_next_hop_table(graph_file: str, num_queries: int, seed: int) -> Dict[str, float]:
+    """
+    Measure path query throughput of the all-pairs next-hop table that
+    NavGraph answers queries from on small graphs.
+
+    Args:
+        graph_file: Path to the graph JSON file.
+        num_queries: Number of random queries.
+        seed: Random seed for the query endpoints.
+
+    Returns:
+        Dictionary with queries per second, the share of queries that found a
+        path and the time spent building the table.
+    """
+    nav_graph = NavGraph(graph_file)
+    queries = random_queries(nav_graph, num_queries, seed)
+
+    start = time.perf_counter()
+    table = NextHopTable(nav_graph)
+    preprocess_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(1 for start_vertex, end_vertex in queries if table.find_path(start_vertex, end_vertex))
+    elapsed = time.perf_counter() - start
+    return {
+        "queries_per_second": num_queries / elapsed if elapsed > 0 else math.inf,
+        "found_ratio": found / num_queries if num_queries else 0.0,
+        "preprocess_seconds": preprocess_seconds,
+    }
+
+def bench_ticks(graph_file: str, mode: str, num_robots: int, num_ticks: int, seed: int) -> Dict[str, float]:
+    """
+    Measure simulation throughput with robots continuously given new tasks.
+
+    Args:
+        graph_file: Path to the graph JSON file.
+        mode: Key of UPDATE_MODES.
+        num_robots: Number of robots.
+        num_ticks: Number of ticks to simulate.
+        seed: Random seed for spawns and tasks.
+
+    Returns:
+        Dictionary with ticks per second and tasks assigned.
+    """
+    nav_graph = NavGraph(graph_file)
+    fleet_manager = FleetManager(nav_graph, os.devnull, **UPDATE_MODES[mode])
+    rng = random.Random(seed)
+    spawn_fleet(fleet_manager, num_robots, rng)
+    simulator = Simulator(fleet_manager)
+
+    tasks = assign_random_tasks(fleet_manager, rng)
+    remaining = num_ticks
+    while remaining > 0:
+        remaining -= simulator.run(num_ticks=min(30, remaining))
+        tasks += assign_random_tasks(fleet_manager, rng)
+    return {"ticks_per_second": simulator.get_ticks_per_second(), "tasks_assigned": tasks}
+
+def bench_memory(graph_file: str, num_robots: int, seed: int) -> Dict[str, float]:
+    """
+    Measure the memory allocated per robot, including its first task.
+
+    Args:
+        graph_file: Path to the graph JSON file.
+        num_robots: Number of robots.
+        seed: Random seed for spawns and tasks.
+
+    Returns:
+        Dictionary with bytes per robot.
+    """
+    nav_graph = NavGraph(graph_file)
+    fleet_manager = FleetManager(nav_graph, os.devnull)
+    rng = random.Random(seed)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    spawn_fleet(fleet_manager, num_robots, rng)
+    assign_random_tasks(fleet_manager, rng)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"bytes_per_robot": allocated / num_robots if num_robots else 0.0}
+
+def bench_render(graph_file: str, num_robots: int, num_frames: int, seed: int, use_tk: bool) -> Dict[str, Any]:
+    """
+    Measure the time to draw a frame of robots while the fleet moves.
+
+    Args:
+        graph_file: Path to the graph JSON file.
+        num_robots: Number of robots.
+        num_frames: Number of frames to draw.
+        seed: Random seed for spawns and tasks.
+        use_tk: True to draw on a real Tk canvas, False to use MockCanvas.
+
+    Returns:
+        Dictionary with the backend and mean and 95th percentile frame times in milliseconds.
+    """
+    nav_graph = NavGraph(graph_file)
+    fleet_manager = FleetManager(nav_graph, os.devnull)
+    rng = random.Random(seed)
+    spawn_fleet(fleet_manager, num_robots, rng)
+    gui, backend = create_headless_gui(nav_graph, fleet_manager, use_tk)
+
+    frame_times = []
+    for frame in range(num_frames):
+        if frame % 30 == 0:
+            assign_random_tasks(fleet_manager, rng)
+        fleet_manager.update_robots()
+        start = time.perf_counter()
+        gui.draw_robots()
+        if use_tk:
+            gui.root.update_idletasks()
+        frame_times.append((time.perf_counter() - start) * 1000)
+    if use_tk:
+        gui.root.destroy()
+
+    frame_times.sort()
+    return {
+        "backend": backend,
+        "mean_frame_ms": sum(frame_times) / len(frame_times) if frame_times else 0.0,
+        "p95_frame_ms": frame_times[int(0.95 * (len(frame_times) - 1))] if frame_times else 0.0,
+    }
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark planning, ticking and rendering on synthetic graphs.")
+    parser.add_argument("--layouts", default="grid,warehouse", help="Comma-separated graph layouts (grid, warehouse).")
+    parser.add_argument("--sizes", default="10,30", help="Comma-separated graph sizes: side length of the grid "
+                                                          "or number of aisles of the warehouse.")
+    parser.add_argument("--robots", type=int, default=100, help="Number of robots.")
+    parser.add_argument("--ticks", type=int, default=300, help="Ticks per simulation benchmark.")
+    parser.add_argument("--queries", type=int, default=1000, help="Path queries per planner.")
+    parser.add_argument("--frames", type=int, default=60, help="Frames per rendering benchmark.")
+    parser.add_argument("--planners", default=",".join(PLANNERS), help="Comma-separated planners.")
+    parser.add_argument("--modes", default=",".join(UPDATE_MODES), help="Comma-separated update modes.")
+    parser.add_argument("--render", choices=["auto", "tk", "mock", "none"], default="auto",
+                        help="Rendering backend; auto uses Tk when a display is available.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this file instead of stdout.")
+    return parser.parse_args()
+
+def main():
+    """
+    Run the benchmarks and emit the results as JSON.
+    """
+    args = parse_args()
+    # Install the pipeline before any FleetManager so robot events are not echoed to stderr
+    install_log_pipeline(os.devnull, stream=False)
+    logging.getLogger().setLevel(logging.WARNING)
+    use_tk = args.render == "tk" or (args.render == "auto" and tk_available())
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for layout in filter(None, args.layouts.split(",")):
+            for size in (int(size) for size in args.sizes.split(",") if size):
+                if layout == "grid":
+                    graph = generate_grid_graph(size, size)
+                elif layout == "warehouse":
+                    graph = generate_warehouse_graph(size, max(4, size // 2))
+                else:
+                    raise ValueError(f"Unknown layout '{layout}'")
+                graph_file = os.path.join(tmp_dir, f"{layout}_{size}.json")
+                write_graph(graph, graph_file)
+                level = graph["levels"]["level1"]
+
+                result: Dict[str, Any] = {
+                    "layout": layout,
+                    "size": size,
+                    "vertices": len(level["vertices"]),
+                    "lanes": len(level["lanes"]),
+                    "robots": args.robots,
+                    "path_queries": {
+                        planner: bench_path_queries(graph_file, planner, args.queries, args.seed)
+                        for planner in filter(None, args.planners.split(","))
+                    },
+                    "ticks": {
+                        mode: bench_ticks(graph_file, mode, args.robots, args.ticks, args.seed)
+                        for mode in filter(None, args.modes.split(","))
+                    },
+                    "memory": bench_memory(graph_file, args.robots, args.seed),
+                }
+                if result["vertices"] <= NavGraph.ALL_PAIRS_MAX_VERTICES:
+                    result["next_hop_table"] = bench_next_hop_table(graph_file, args.queries, args.seed)
+                if args.render != "none":
+                    result["render"] = bench_render(graph_file, args.robots, args.frames, args.seed, use_tk)
+                results.append(result)
+                print(f"{layout} {size}: {result['vertices']} vertices done", file=sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
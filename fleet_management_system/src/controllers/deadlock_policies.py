@@ -0,0 +1,69 @@
+from typing import Dict, List, Type
+
+class DeadlockPolicy:
+    """
+    Base class for ways of breaking a circular wait between robots.
+    Subclasses implement resolve and register themselves in DEADLOCK_POLICIES.
+    """
+    name = ""
+
+    def resolve(self, traffic_manager, cycle: List[str]) -> bool:
+        """
+        Break a deadlock.
+
+        Args:
+            traffic_manager: TrafficManager the robots are queued in.
+            cycle: IDs of the robots waiting on each other in a cycle.
+
+        Returns:
+            True if the cycle was broken, False otherwise.
+        """
+        raise NotImplementedError
+
+class BackoffYoungestPolicy(DeadlockPolicy):
+    """The youngest robot in the cycle gives up the lane it is holding and keeps waiting."""
+    name = "backoff_youngest"
+
+    def resolve(self, traffic_manager, cycle: List[str]) -> bool:
+        return traffic_manager.back_off(traffic_manager.get_youngest_robot(cycle))
+
+class ReplanPolicy(DeadlockPolicy):
+    """
+    A robot in the cycle is routed around the lane it is queued on, trying
+    the youngest first. A new route only counts if the robot is granted its
+    first lane or can queue for it without closing another cycle. Falls back
+    to backing off the youngest robot if no robot has such a route.
+    """
+    name = "replan"
+
+    def resolve(self, traffic_manager, cycle: List[str]) -> bool:
+        if traffic_manager.replan_callback:
+            candidates = sorted(cycle, key=lambda robot_id: traffic_manager.robot_order.get(robot_id, -1),
+                                reverse=True)
+            for robot_id in candidates:
+                lane_id = traffic_manager.robot_waiting_lane[robot_id]
+                if traffic_manager.replan_callback(robot_id, lane_id):
+                    return True
+        return BackoffYoungestPolicy().resolve(traffic_manager, cycle)
+
+# Registry of available deadlock policies by name
+DEADLOCK_POLICIES: Dict[str, Type[DeadlockPolicy]] = {
+    policy.name: policy for policy in (BackoffYoungestPolicy, ReplanPolicy)
+}
+
+def create_deadlock_policy(name: str) -> DeadlockPolicy:
+    """
+    Create a deadlock policy by name.
+
+    Args:
+        name: Policy name (one of DEADLOCK_POLICIES).
+
+    Returns:
+        DeadlockPolicy instance.
+
+    Raises:
+        ValueError: If no policy with the given name exists.
+    """
+    if name not in DEADLOCK_POLICIES:
+        raise ValueError(f"Unknown deadlock policy '{name}', expected one of {sorted(DEADLOCK_POLICIES)}")
+    return DEADLOCK_POLICIES[name]()
@@ -0,0 +1,129 @@
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+from models.robot import MOVING, WAITING, Robot
+from controllers.traffic_manager import TrafficManager
+
+class EventScheduler:
+    """
+    Discrete-event scheduler for robot movement.
+    Instead of touching every robot every tick, it schedules each moving
+    robot's arrival at its next vertex on a priority queue. Waiting robots
+    have no events; they are rescheduled when the traffic manager hands them
+    their lane. Time is measured in ticks, matching the progress-per-tick
+    speed of robots.
+    """
+    def __init__(self, traffic_manager: TrafficManager):
+        """
+        Initialize the scheduler.
+
+        Args:
+            traffic_manager: TrafficManager through which robots acquire and release lanes.
+        """
+        self.traffic_manager = traffic_manager
+        self.now = 0  # Current tick
+        self.events: List[Tuple[int, int, Robot, int]] = []  # (tick, sequence, robot, generation)
+        self.sequence = 0  # Tie-breaker keeping same-tick events in scheduling order
+        self.generations: Dict[str, int] = {}  # Bumped to cancel a robot's pending event
+        self.lane_starts: Dict[str, Tuple[int, float]] = {}  # Tick and progress at which a robot entered its lane
+        self.wait_starts: Dict[str, Tuple[int, int]] = {}  # Tick a robot started waiting and its waiting_time then
+        self.events_processed = 0
+
+    def _next_generation(self, robot: Robot) -> int:
+        """
+        Cancel whatever is pending for a robot by moving it to a new generation.
+
+        Args:
+            robot: Robot to cancel pending events for.
+
+        Returns:
+            The robot's new generation.
+        """
+        generation = self.generations.get(robot.id, 0) + 1
+        self.generations[robot.id] = generation
+        return generation
+
+    def _push(self, tick: int, robot: Robot) -> None:
+        """
+        Schedule an event for a robot, cancelling any event already pending for it.
+
+        Args:
+            tick: Tick at which the event fires.
+            robot: Robot the event belongs to.
+        """
+        generation = self._next_generation(robot)
+        self.sequence += 1
+        heapq.heappush(self.events, (tick, self.sequence, robot, generation))
+
+    def schedule_robot(self, robot: Robot) -> None:
+        """
+        Schedule the next event of a robot after its task or lane changed.
+
+        Args:
+            robot: Robot to schedule.
+        """
+        self.wait_starts.pop(robot.id, None)
+        if robot.status_code == MOVING:
+            self.lane_starts[robot.id] = (self.now, robot.progress)
+            ticks = max(1, math.ceil((1.0 - robot.progress) / robot.speed - 1e-9))
+            self._push(self.now + ticks, robot)
+            return
+
+        # Waiting, idle and finished robots have nothing to schedule
+        self._next_generation(robot)
+        self.lane_starts.pop(robot.id, None)
+        if robot.status_code == WAITING:
+            self.wait_starts[robot.id] = (self.now, robot.waiting_time)
+
+    def _handle_event(self, robot: Robot) -> None:
+        """
+        Process a robot's arrival at a vertex.
+
+        Args:
+            robot: Robot the event belongs to.
+        """
+        traffic_manager = self.traffic_manager
+        robot.reach_next_vertex(traffic_manager.request_lane, traffic_manager.release_lane)
+        self.schedule_robot(robot)
+
+    def advance(self, ticks: int = 1) -> int:
+        """
+        Advance simulated time, processing every event that falls due.
+
+        Args:
+            ticks: Number of ticks to advance.
+
+        Returns:
+            Number of events processed.
+        """
+        target = self.now + ticks
+        processed = 0
+        events = self.events
+        while events and events[0][0] <= target:
+            tick, _, robot, generation = heapq.heappop(events)
+            if generation != self.generations.get(robot.id):
+                continue  # Cancelled by a later reschedule
+            self.now = tick
+            self._handle_event(robot)
+            processed += 1
+            if self.traffic_manager.pending_deadlocks:
+                self.traffic_manager.resolve_deadlocks()
+        self.now = target
+        self.events_processed += processed
+        return processed
+
+    def sync_progress(self, robots: Dict[str, Robot]) -> None:
+        """
+        Bring the progress of moving robots and the waiting time of queued
+        robots up to the current tick.
+
+        Args:
+            robots: Dictionary mapping robot IDs to Robot instances.
+        """
+        for robot_id, (start_tick, start_progress) in self.lane_starts.items():
+            robot = robots[robot_id]
+            if robot.status_code == MOVING:
+                robot.progress = min(1.0, start_progress + (self.now - start_tick) * robot.speed)
+        for robot_id, (start_tick, start_waiting_time) in self.wait_starts.items():
+            robots[robot_id].waiting_time = start_waiting_time + self.now - start_tick
@@ -1,181 +1,770 @@
-import time
-import logging
-from typing import Dict, List, Tuple, Optional, Callable
-from models.robot import Robot, RobotStatus
-from models.nav_graph import NavGraph
-
-class FleetManager:
-    """
-    Manages a fleet of robots, including task assignment and state tracking.
-    """
-    def __init__(self, nav_graph: NavGraph, log_file: str = "logs/fleet_logs.txt"):
-        """
-        Initialize the fleet manager.
-        
-        Args:
-            nav_graph: NavGraph instance representing the environment.
-            log_file: Path to the log file.
-        """
-        self.nav_graph = nav_graph
-        self.robots: Dict[str, Robot] = {}
-        self.selected_robot: Optional[str] = None
-        self.next_robot_id = 1
-        self.log_file = log_file
-        
-        # Initialize logging
-        self.setup_logging()
-    
-    def setup_logging(self) -> None:
-        """Set up logging configuration."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            handlers=[
-                logging.FileHandler(self.log_file, mode='a'),
-                logging.StreamHandler()
-            ]
-        )
-    
-    def log_message(self, message: str) -> None:
-        """
-        Log a message to the log file.
-        
-        Args:
-            message: Message to log.
-        """
-        logging.info(message)
-    
-    def spawn_robot(self, vertex_index: int) -> str:
-        """
-        Spawn a new robot at the specified vertex.
-        
-        Args:
-            vertex_index: Index of the vertex where the robot will spawn.
-            
-        Returns:
-            ID of the spawned robot.
-        """
-        robot_id = f"Robot_{self.next_robot_id}"
-        self.next_robot_id += 1
-        
-        # Create a new robot
-        robot = Robot(robot_id, vertex_index, self.log_message)
-        self.robots[robot_id] = robot
-        
-        self.log_message(f"Spawned {robot_id} at vertex {vertex_index}")
-        return robot_id
-    
-    def assign_task(self, robot_id: str, target_vertex: int) -> bool:
-        """
-        Assign a navigation task to a robot.
-        
-        Args:
-            robot_id: ID of the robot.
-            target_vertex: Destination vertex index.
-            
-        Returns:
-            True if task was assigned successfully, False otherwise.
-        """
-        if robot_id not in self.robots:
-            self.log_message(f"Cannot assign task: Robot {robot_id} not found")
-            return False
-            
-        robot = self.robots[robot_id]
-        current_vertex = robot.current_vertex
-        
-        # Find path to target
-        path = self.nav_graph.find_path(current_vertex, target_vertex)
-        
-        if not path:
-            self.log_message(f"No path found from vertex {current_vertex} to {target_vertex}")
-            return False
-            
-        # Check if the first lane is available
-        if len(path) > 1:
-            from_vertex, to_vertex = path[0], path[1]
-            if not self.nav_graph.is_lane_free(from_vertex, to_vertex):
-                self.log_message(f"Cannot start task: Lane from {from_vertex} to {to_vertex} is occupied")
-                return False
-                
-            # Occupy the first lane
-            self.nav_graph.occupy_lane(from_vertex, to_vertex, robot_id)
-        
-        # Assign the task to the robot
-        success = robot.assign_task(target_vertex, path)
-        
-        if success:
-            self.log_message(f"Assigned task to {robot_id}: Navigate from {current_vertex} to {target_vertex}")
-        else:
-            self.log_message(f"Failed to assign task to {robot_id}")
-            
-        return success
-    
-    def select_robot(self, vertex_index: int) -> Optional[str]:
-        """
-        Select a robot at the specified vertex.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            
-        Returns:
-            ID of the selected robot, or None if no robot found.
-        """
-        for robot_id, robot in self.robots.items():
-            if robot.is_selected(vertex_index):
-                self.selected_robot = robot_id
-                self.log_message(f"Selected {robot_id} at vertex {vertex_index}")
-                return robot_id
-                
-        self.selected_robot = None
-        return None
-    
-    def get_selected_robot(self) -> Optional[str]:
-        """
-        Get the ID of the currently selected robot.
-        
-        Returns:
-            ID of the selected robot, or None if no robot is selected.
-        """
-        return self.selected_robot
-    
-    def update_robots(self) -> None:
-        """Update the state of all robots."""
-        for robot in self.robots.values():
-            robot.update(
-                self.nav_graph.is_lane_free,
-                self.nav_graph.occupy_lane,
-                self.nav_graph.free_lane
-            )
-    
-    def get_all_robots(self) -> Dict[str, Robot]:
-        """
-        Get all robots in the fleet.
-        
-        Returns:
-            Dictionary mapping robot IDs to Robot instances.
-        """
-        return self.robots
-    
-    def get_robot_positions(self) -> Dict[str, Tuple[int, int, float]]:
-        """
-        Get the current positions of all robots.
-        
-        Returns:
-            Dictionary mapping robot IDs to positions (from_vertex, to_vertex, progress).
-        """
-        positions = {}
-        for robot_id, robot in self.robots.items():
-            positions[robot_id] = robot.get_position()
-        return positions
-    
-    def get_robot_statuses(self) -> Dict[str, RobotStatus]:
-        """
-        Get the current statuses of all robots.
-        
-        Returns:
-            Dictionary mapping robot IDs to RobotStatus values.
-        """
-        statuses = {}
-        for robot_id, robot in self.robots.items():
-            statuses[robot_id] = robot.get_status()
+import math
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, Callable, Set
+
+import numpy as np
+
+from models.robot import IDLE, TASK_COMPLETE, WAITING, Robot, RobotStatus
+from models.nav_graph import NavGraph
+from models.fleet_state import FleetState
+from planning.planners import PLANNERS
+from planning.reservation_table import ReservationTable
+from planning.sipp_planner import SIPPPlanner
+from planning.task_assignment import compute_travel_times, solve_assignment
+from utils.event_journal import ASSIGN, COMPLETE, FREE, OCCUPY, SPAWN, WAIT, EventJournal
+from utils.event_log import EventLog
+from utils.log_pipeline import LogPipeline, RobotLogFilter, install_log_pipeline
+from utils.metrics import Metrics, timed
+from controllers.event_scheduler import EventScheduler
+from controllers.traffic_manager import TrafficManager
+
+class PlannedTask:
+    """A task assigned with FleetManager.assign_tasks_async, waiting to be committed."""
+    def __init__(self, robot_id: str, target_vertex: int, planner: str, start_vertex: int,
+                 graph_version: int, route: Optional[Future], result: Future):
+        """
+        Initialize the planned task.
+        
+        Args:
+            robot_id: ID of the robot.
+            target_vertex: Destination vertex index.
+            planner: Name of the path planner.
+            start_vertex: Vertex the route is planned from.
+            graph_version: NavGraph version the route is planned on.
+            route: Future resolving to the planned path, or None if the route
+                is planned when the task is committed.
+            result: Future to resolve once the task is committed.
+        """
+        self.robot_id = robot_id
+        self.target_vertex = target_vertex
+        self.planner = planner
+        self.start_vertex = start_vertex
+        self.graph_version = graph_version
+        self.route = route
+        self.result = result
+
+class FleetManager:
+    """
+    Manages a fleet of robots, including task assignment and state tracking.
+    """
+    # Robot events recorded in the journal; lane changes come from the traffic manager
+    JOURNAL_EVENTS = {"assigned": ASSIGN, "waiting": WAIT, "completed": COMPLETE}
+    
+    def __init__(self, nav_graph: NavGraph, log_file: str = "logs/fleet_logs.txt",
+                 planner: str = "astar", vectorized: bool = False, event_driven: bool = False,
+                 traffic_manager: Optional[TrafficManager] = None, journal_file: Optional[str] = None,
+                 metrics: Optional[Metrics] = None, planning_workers: int = 0):
+        """
+        Initialize the fleet manager.
+        
+        Args:
+            nav_graph: NavGraph instance representing the environment.
+            log_file: Path to the log file.
+            planner: Name of the default path planner used for task assignment;
+                "sipp" plans around the lane reservations of the other robots.
+            vectorized: True to advance robots with batched NumPy operations
+                over a FleetState instead of calling Robot.update per robot.
+            event_driven: True to move robots with an EventScheduler, which only
+                does work when a robot reaches a vertex or a lane is freed.
+            traffic_manager: TrafficManager through which robots acquire and
+                release lanes; a new one is created if not given.
+            journal_file: Path of a binary event journal to record the run to,
+                or None to record nothing.
+            metrics: Metrics to record phase timings and counters to, or None
+                to record nothing; can be changed later with set_metrics.
+            planning_workers: Number of threads planning the routes of
+                assign_task_async, or 0 to plan them on the calling thread.
+        """
+        if vectorized and event_driven:
+            raise ValueError("vectorized and event_driven updates cannot be combined")
+        
+        self.nav_graph = nav_graph
+        self.robots: Dict[str, Robot] = {}
+        self.vertex_robots: Dict[int, Dict[str, None]] = {}  # Vertex index -> IDs of robots there, in arrival order
+        self.robot_vertices: Dict[str, int] = {}  # Robot ID -> vertex it is indexed under
+        self.selected_robot: Optional[str] = None
+        self.next_robot_id = 1
+        self.log_file = log_file
+        self.planner = planner
+        self.fleet_state: Optional[FleetState] = FleetState() if vectorized else None
+        self.robot_slots: Dict[str, int] = {}  # Maps robot IDs to FleetState slots
+        self.current_tick = 0
+        
+        # Every assigned route reserves its lanes over the ticks it expects to
+        # hold them, so the SIPP planner can route new tasks around them
+        self.reservation_table = ReservationTable()
+        self.sipp_planner = SIPPPlanner(nav_graph, self.reservation_table)
+        
+        # All lane acquisition goes through the traffic manager, which
+        # notifies us when a queued robot is handed its lane
+        self.traffic_manager = traffic_manager or TrafficManager(nav_graph)
+        self.traffic_manager.grant_callback = self._on_lane_granted
+        self.traffic_manager.replan_callback = self._replan_around_lane
+        self.journal: Optional[EventJournal] = None
+        if journal_file is not None:
+            self.journal = EventJournal(journal_file)
+            self.traffic_manager.lane_callback = self._journal_lane_change
+        self.event_scheduler: Optional[EventScheduler] = (
+            EventScheduler(self.traffic_manager) if event_driven else None
+        )
+        self.set_metrics(metrics)
+        
+        # Routes requested with assign_task_async are planned off the tick
+        # thread and committed at the start of the next tick
+        self.planning_pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(planning_workers, thread_name_prefix="planner") if planning_workers > 0 else None
+        )
+        self.planned_tasks: List[PlannedTask] = []
+        self.robot_log_callback = self.log_robot_event  # One bound method shared by all robots
+        
+        # Initialize logging
+        self.setup_logging()
+    
+    def set_metrics(self, metrics: Optional[Metrics]) -> None:
+        """
+        Start or stop recording metrics, for the fleet manager as well as the
+        navigation graph and traffic manager it drives.
+        
+        Args:
+            metrics: Metrics to record to, or None to stop recording.
+        """
+        self.metrics = metrics
+        self.nav_graph.metrics = metrics
+        self.traffic_manager.metrics = metrics
+    
+    def get_metrics(self) -> Optional[Dict]:
+        """
+        Get the recorded metrics together with the deadlock and route cache statistics.
+        
+        Returns:
+            Dictionary of metrics (see Metrics.snapshot), or None if metrics are not recorded.
+        """
+        if self.metrics is None:
+            return None
+        result = self.metrics.snapshot()
+        result["deadlocks"] = self.traffic_manager.get_deadlock_stats()
+        result["route_cache"] = self.nav_graph.get_route_cache_stats()
+        return result
+    
+    def setup_logging(self) -> None:
+        """
+        Set up logging configuration.
+        Records are queued and written to the log file and stderr in batches
+        by a background thread, so the simulation tick never waits on I/O.
+        """
+        self.log_pipeline: LogPipeline = install_log_pipeline(self.log_file)
+        self.log_filter = RobotLogFilter()
+        self.event_log = EventLog()  # Recent events for the GUI
+    
+    def log_message(self, message: str) -> None:
+        """
+        Log a message to the log file.
+        
+        Args:
+            message: Message to log.
+        """
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(message)
+            self.event_log.append(logging.INFO, message)
+    
+    def log_robot_event(self, robot_id: str, event: str, message: str, *args) -> None:
+        """
+        Handle a robot event: update the vertex index and the journal, then log
+        the event at the level configured for its robot and event type.
+        Disabled events are dropped before their message is formatted.
+        
+        Args:
+            robot_id: ID of the robot.
+            event: Event type, such as "moving".
+            message: %-style format string.
+            *args: Arguments for the format string.
+        """
+        if event == "reached":
+            self._index_robot_vertex(robot_id, self.robots[robot_id].current_vertex)
+        if self.journal is not None and event in self.JOURNAL_EVENTS:
+            robot = self.robots[robot_id]
+            second = robot.target_vertex if event == "assigned" else robot.to_vertex
+            self.journal.record(self.get_current_tick(), robot_id, self.JOURNAL_EVENTS[event],
+                                robot.current_vertex, second)
+        
+        level = self.log_filter.get_level(robot_id, event)
+        if level is not None:
+            logging.log(level, message, *args)
+            self.event_log.append(level, message, *args)
+    
+    def spawn_robot(self, vertex_index: int, robot_id: Optional[str] = None) -> str:
+        """
+        Spawn a new robot at the specified vertex.
+        
+        Args:
+            vertex_index: Index of the vertex where the robot will spawn.
+            robot_id: ID to give the robot, or None to number it automatically.
+            
+        Returns:
+            ID of the spawned robot.
+        """
+        if robot_id is None:
+            robot_id = f"Robot_{self.next_robot_id}"
+            self.next_robot_id += 1
+        
+        # Create a new robot
+        robot = Robot(robot_id, vertex_index, self.robot_log_callback)
+        self.robots[robot_id] = robot
+        self._index_robot_vertex(robot_id, vertex_index)
+        if self.fleet_state is not None:
+            self.robot_slots[robot_id] = self.fleet_state.add_robot(robot)
+        if self.journal is not None:
+            self.journal.record(self.get_current_tick(), robot_id, SPAWN, vertex_index, round(robot.speed * 1e6))
+        
+        self.log_message(f"Spawned {robot_id} at vertex {vertex_index}")
+        return robot_id
+    
+    def adopt_robot(self, robot: Robot) -> None:
+        """
+        Take over a robot from another fleet manager, e.g. one simulating
+        another region of the graph in a different process.
+        
+        Args:
+            robot: Robot to manage; its log callback is replaced.
+            
+        Raises:
+            ValueError: If the fleet manager is vectorized or event-driven.
+        """
+        if self.fleet_state is not None or self.event_scheduler is not None:
+            raise ValueError("Robots can only be moved between scalar fleet managers")
+        robot.log_callback = self.robot_log_callback
+        self.robots[robot.id] = robot
+        self._index_robot_vertex(robot.id, robot.current_vertex)
+    
+    def remove_robot(self, robot_id: str) -> Robot:
+        """
+        Stop managing a robot, e.g. to hand it to another fleet manager.
+        Lanes it holds stay occupied until they are released for it.
+        
+        Args:
+            robot_id: ID of the robot.
+            
+        Returns:
+            The removed robot.
+            
+        Raises:
+            ValueError: If the fleet manager is vectorized or event-driven.
+        """
+        if self.fleet_state is not None or self.event_scheduler is not None:
+            raise ValueError("Robots can only be moved between scalar fleet managers")
+        robot = self.robots.pop(robot_id)
+        vertex_index = self.robot_vertices.pop(robot_id)
+        robots_at_vertex = self.vertex_robots[vertex_index]
+        del robots_at_vertex[robot_id]
+        if not robots_at_vertex:
+            del self.vertex_robots[vertex_index]
+        self.traffic_manager.cancel_request(robot_id)
+        self.reservation_table.release(robot_id)
+        if self.selected_robot == robot_id:
+            self.selected_robot = None
+        return robot
+    
+    @timed("assign_task")
+    def assign_task(self, robot_id: str, target_vertex: int, planner: Optional[str] = None) -> bool:
+        """
+        Assign a navigation task to a robot.
+        
+        Args:
+            robot_id: ID of the robot.
+            target_vertex: Destination vertex index.
+            planner: Name of the path planner to use, or None for the default.
+            
+        Returns:
+            True if task was assigned successfully, False otherwise.
+        """
+        if robot_id not in self.robots:
+            self.log_message(f"Cannot assign task: Robot {robot_id} not found")
+            return False
+            
+        robot = self.robots[robot_id]
+        
+        # Find path to target
+        self.reservation_table.prune(self.current_tick)
+        path, reservations = self._plan_route(robot, target_vertex, planner or self.planner)
+        return self._start_task(robot, target_vertex, path, reservations)
+    
+    def _start_task(self, robot: Robot, target_vertex: int, path: List[int],
+                    reservations: List[Tuple[int, int, int]]) -> bool:
+        """
+        Start a robot on a planned route if the first lane of the route is free.
+        
+        Args:
+            robot: Robot to start.
+            target_vertex: Destination vertex index.
+            path: Planned path, empty if none was found.
+            reservations: (lane ID, start tick, end tick) reservations of the route.
+            
+        Returns:
+            True if the task was started, False otherwise.
+        """
+        robot_id = robot.id
+        current_vertex = robot.current_vertex
+        if not path:
+            self.log_message(f"No path found from vertex {current_vertex} to {target_vertex}")
+            return False
+            
+        # Occupy the first lane if it is available
+        if len(path) > 1:
+            from_vertex, to_vertex = path[0], path[1]
+            if not self.traffic_manager.request_lane(robot_id, from_vertex, to_vertex, wait=False):
+                self.log_message(f"Cannot start task: Lane from {from_vertex} to {to_vertex} is occupied")
+                return False
+            
+            # A robot queued for a lane on its old path leaves that queue
+            self.traffic_manager.cancel_request(robot_id)
+        
+        # Assign the task to the robot
+        success = robot.assign_task(target_vertex, path)
+        if success and self.fleet_state is not None:
+            self.fleet_state.load(self.robot_slots[robot_id])
+        if success and self.event_scheduler is not None:
+            self.event_scheduler.schedule_robot(robot)
+        
+        if success:
+            self.reservation_table.reserve(robot_id, reservations)
+            if self.metrics is not None:
+                self.metrics.increment("tasks_assigned")
+            self.log_message(f"Assigned task to {robot_id}: Navigate from {current_vertex} to {target_vertex}")
+        else:
+            self.log_message(f"Failed to assign task to {robot_id}")
+            
+        return success
+    
+    @timed("dispatch_tasks")
+    def dispatch_tasks(self, target_vertices: List[int], planner: Optional[str] = None) -> List[Optional[str]]:
+        """
+        Assign a batch of tasks to idle and finished robots so that the total
+        travel time of the robots to their tasks is as low as possible.
+        Travel times come from one shortest path search per distinct robot
+        vertex or per distinct task vertex, whichever is fewer, and robots
+        are matched to tasks with the Hungarian algorithm.
+        
+        Args:
+            target_vertices: Destination vertex index of each task.
+            planner: Name of the path planner used to route the assigned
+                robots, or None for the default.
+            
+        Returns:
+            ID of the robot assigned to each task, or None for tasks left
+            unassigned because there were not enough robots, no robot could
+            reach them, or the matched robot's first lane was occupied.
+        """
+        assigned: List[Optional[str]] = [None] * len(target_vertices)
+        available = [robot for robot in self.robots.values() if robot.status_code in (IDLE, TASK_COMPLETE)]
+        num_vertices = len(self.nav_graph.vertices)
+        tasks = [index for index, vertex in enumerate(target_vertices) if 0 <= vertex < num_vertices]
+        if not available or not tasks:
+            return assigned
+        
+        weighted = getattr(PLANNERS.get(planner or self.planner), "weighted", True)
+        robot_vertices = [robot.current_vertex for robot in available]
+        task_vertices = [target_vertices[index] for index in tasks]
+        distinct_robot_vertices = list(dict.fromkeys(robot_vertices))
+        distinct_task_vertices = list(dict.fromkeys(task_vertices))
+        if len(distinct_robot_vertices) <= len(distinct_task_vertices):
+            times = compute_travel_times(self.nav_graph, distinct_robot_vertices, distinct_task_vertices,
+                                         weighted=weighted)
+        else:
+            times = compute_travel_times(self.nav_graph, distinct_task_vertices, distinct_robot_vertices,
+                                         reverse=True, weighted=weighted).T
+        robot_rows = {vertex: row for row, vertex in enumerate(distinct_robot_vertices)}
+        task_columns = {vertex: column for column, vertex in enumerate(distinct_task_vertices)}
+        costs = times[np.ix_([robot_rows[vertex] for vertex in robot_vertices],
+                             [task_columns[vertex] for vertex in task_vertices])]
+        # A robot already at a task's vertex has no lane to travel, which assign_task rejects
+        costs[np.equal.outer(robot_vertices, task_vertices)] = np.inf
+        
+        for robot_index, task_column in solve_assignment(costs):
+            robot_id = available[robot_index].id
+            task_index = tasks[task_column]
+            if self.assign_task(robot_id, target_vertices[task_index], planner):
+                assigned[task_index] = robot_id
+        
+        self.log_message(f"Dispatched {sum(robot_id is not None for robot_id in assigned)} of "
+                         f"{len(target_vertices)} tasks to {len(available)} available robots")
+        return assigned
+    
+    @timed("plan_route")
+    def _plan_route(self, robot: Robot, target_vertex: int, planner: str,
+                    avoid_lanes: Optional[Set[int]] = None) -> Tuple[List[int], List[Tuple[int, int, int]]]:
+        """
+        Plan a robot's route and the lane reservations it will make.
+        
+        Args:
+            robot: Robot to plan for.
+            target_vertex: Destination vertex index.
+            planner: Name of the path planner to use.
+            avoid_lanes: IDs of lanes the route must not use.
+            
+        Returns:
+            Tuple of the path (empty if none) and its (lane ID, start tick, end tick) reservations.
+        """
+        if planner == SIPPPlanner.name:
+            ticks_per_lane = max(1, math.ceil(1.0 / robot.speed - 1e-9))
+            plan = self.sipp_planner.plan(robot.id, robot.current_vertex, target_vertex,
+                                          self.current_tick, ticks_per_lane, avoid_lanes)
+            if plan is None:
+                return [], []
+            return plan.path, plan.get_reservations()
+        
+        path = self.nav_graph.find_path(robot.current_vertex, target_vertex, planner,
+                                        avoid_lanes=avoid_lanes)
+        return path, self._get_route_reservations(robot, path)
+    
+    def _get_route_reservations(self, robot: Robot, path: List[int]) -> List[Tuple[int, int, int]]:
+        """
+        Get the lane reservations of a route planned without regard to
+        reservations, assuming the robot never waits and starts this tick.
+        
+        Args:
+            robot: Robot following the route.
+            path: Planned path.
+            
+        Returns:
+            List of (lane ID, start tick, end tick) reservations.
+        """
+        ticks_per_lane = max(1, math.ceil(1.0 / robot.speed - 1e-9))
+        reservations = []
+        for i in range(len(path) - 1):
+            start = self.current_tick + i * ticks_per_lane
+            lane_id = self.nav_graph.get_lane_id(path[i], path[i + 1])
+            reservations.append((lane_id, start, start + ticks_per_lane))
+        return reservations
+    
+    def assign_task_async(self, robot_id: str, target_vertex: int, planner: Optional[str] = None) -> Future:
+        """
+        Assign a navigation task to a robot without waiting for its route to
+        be planned. See assign_tasks_async.
+        
+        Args:
+            robot_id: ID of the robot.
+            target_vertex: Destination vertex index.
+            planner: Name of the path planner to use, or None for the default.
+            
+        Returns:
+            Future resolving to True if the task was assigned, False otherwise.
+        """
+        return self.assign_tasks_async([(robot_id, target_vertex)], planner)[0]
+    
+    def assign_tasks_async(self, tasks: List[Tuple[str, int]], planner: Optional[str] = None) -> List[Future]:
+        """
+        Assign navigation tasks without waiting for their routes to be planned.
+        The routes are planned concurrently by the planning pool, and each one
+        is committed at the start of the first tick after it is ready: the
+        robot's first lane is checked again and the task starts as with
+        assign_task. A route planned from a vertex the robot has left, or on
+        a graph that has changed since, is planned again. SIPP routes depend
+        on the reservations at the tick they start, so they are planned when
+        they are committed.
+        
+        The futures are resolved by update_robots, on the thread that runs the
+        ticks, so their callbacks may touch state owned by that thread.
+        
+        Args:
+            tasks: List of (robot ID, destination vertex index).
+            planner: Name of the path planner to use, or None for the default.
+            
+        Returns:
+            One future per task, resolving to True if the task was assigned,
+            False otherwise.
+        """
+        planner = planner or self.planner
+        futures = []
+        for robot_id, target_vertex in tasks:
+            result: Future = Future()
+            result.set_running_or_notify_cancel()
+            robot = self.robots.get(robot_id)
+            if robot is None:
+                self.log_message(f"Cannot assign task: Robot {robot_id} not found")
+                result.set_result(False)
+            else:
+                self.planned_tasks.append(self._submit_route(robot, target_vertex, planner, result))
+            futures.append(result)
+        return futures
+    
+    def _submit_route(self, robot: Robot, target_vertex: int, planner: str, result: Future) -> PlannedTask:
+        """
+        Start planning a robot's route in the planning pool, or on this
+        thread if there is no pool.
+        
+        Args:
+            robot: Robot to plan for.
+            target_vertex: Destination vertex index.
+            planner: Name of the path planner to use.
+            result: Future to resolve once the task is committed.
+            
+        Returns:
+            PlannedTask to commit on a later tick.
+        """
+        route: Optional[Future] = None
+        if planner != SIPPPlanner.name:
+            args = (robot.current_vertex, target_vertex, planner)
+            if self.planning_pool is not None:
+                route = self.planning_pool.submit(self.nav_graph.find_path, *args)
+            else:
+                route = Future()
+                route.set_result(self.nav_graph.find_path(*args))
+        return PlannedTask(robot.id, target_vertex, planner, robot.current_vertex,
+                           self.nav_graph.version, route, result)
+    
+    def _commit_planned_tasks(self) -> None:
+        """Start the tasks whose routes have been planned since the last tick."""
+        self.reservation_table.prune(self.current_tick)
+        waiting = []
+        for task in self.planned_tasks:
+            if task.route is not None and not task.route.done():
+                waiting.append(task)
+                continue
+            robot = self.robots.get(task.robot_id)
+            if robot is None:
+                task.result.set_result(False)
+            elif robot.current_vertex != task.start_vertex or self.nav_graph.version != task.graph_version:
+                waiting.append(self._submit_route(robot, task.target_vertex, task.planner, task.result))
+            elif task.route is None:
+                task.result.set_result(
+                    self._start_task(robot, task.target_vertex, *self._plan_route(robot, task.target_vertex,
+                                                                                  task.planner))
+                )
+            elif task.route.exception() is not None:
+                task.result.set_exception(task.route.exception())
+            else:
+                path = task.route.result()
+                task.result.set_result(
+                    self._start_task(robot, task.target_vertex, path, self._get_route_reservations(robot, path))
+                )
+        self.planned_tasks = waiting
+    
+    def select_robot(self, vertex_index: int) -> Optional[str]:
+        """
+        Select a robot at the specified vertex.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            ID of the selected robot, or None if no robot found.
+        """
+        for robot_id in self.vertex_robots.get(vertex_index, ()):
+            if self.robots[robot_id].is_selected(vertex_index):
+                self.selected_robot = robot_id
+                self.log_message(f"Selected {robot_id} at vertex {vertex_index}")
+                return robot_id
+                
+        self.selected_robot = None
+        return None
+    
+    def _index_robot_vertex(self, robot_id: str, vertex_index: int) -> None:
+        """
+        Move a robot to a vertex in the vertex index.
+        
+        Args:
+            robot_id: ID of the robot.
+            vertex_index: Vertex the robot is now at.
+        """
+        previous_vertex = self.robot_vertices.get(robot_id)
+        if previous_vertex == vertex_index:
+            return
+        if previous_vertex is not None:
+            robots_at_vertex = self.vertex_robots[previous_vertex]
+            del robots_at_vertex[robot_id]
+            if not robots_at_vertex:
+                del self.vertex_robots[previous_vertex]
+        self.vertex_robots.setdefault(vertex_index, {})[robot_id] = None
+        self.robot_vertices[robot_id] = vertex_index
+    
+    def get_robots_at_vertex(self, vertex_index: int) -> List[str]:
+        """
+        Get the robots whose current vertex is the given one.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            List of robot IDs, in the order they arrived.
+        """
+        return list(self.vertex_robots.get(vertex_index, ()))
+    
+    def get_selected_robot(self) -> Optional[str]:
+        """
+        Get the ID of the currently selected robot.
+        
+        Returns:
+            ID of the selected robot, or None if no robot is selected.
+        """
+        return self.selected_robot
+    
+    @timed("update_robots")
+    def update_robots(self, ticks: int = 1) -> None:
+        """
+        Update the state of all robots.
+        
+        Args:
+            ticks: Number of ticks to advance.
+        """
+        if self.metrics is not None:
+            self.metrics.increment("ticks", ticks)
+        if self.planned_tasks:
+            self._commit_planned_tasks()
+        if self.event_scheduler is not None:
+            self.event_scheduler.advance(ticks)
+            self.current_tick += ticks
+            return
+            
+        for _ in range(ticks):
+            self.current_tick += 1
+            if self.fleet_state is not None:
+                self._update_robots_vectorized()
+                continue
+                
+            for robot in self.robots.values():
+                robot.update(
+                    self.traffic_manager.request_lane,
+                    self.traffic_manager.release_lane
+                )
+            self.traffic_manager.resolve_deadlocks()
+    
+    def _update_robots_vectorized(self) -> None:
+        """
+        Update all robots through the FleetState arrays.
+        Progress is advanced in one batched operation; only robots that reach
+        a vertex are handled per robot.
+        """
+        state = self.fleet_state
+        traffic_manager = self.traffic_manager
+        
+        for slot in state.advance().tolist():
+            robot = state.robots[slot]
+            robot.reach_next_vertex(traffic_manager.request_lane, traffic_manager.release_lane)
+            state.load(slot)
+        traffic_manager.resolve_deadlocks()
+    
+    def get_current_tick(self) -> int:
+        """
+        Get the tick being simulated, which advances event by event in
+        event-driven mode.
+        
+        Returns:
+            Current tick.
+        """
+        if self.event_scheduler is not None:
+            return self.event_scheduler.now
+        return self.current_tick
+    
+    def _journal_lane_change(self, robot_id: str, from_vertex: int, to_vertex: int, occupied: bool) -> None:
+        """
+        Record a lane being occupied or freed in the journal.
+        
+        Args:
+            robot_id: ID of the robot.
+            from_vertex: Starting vertex index of the lane.
+            to_vertex: Ending vertex index of the lane.
+            occupied: True if the robot took the lane, False if it freed it.
+        """
+        self.journal.record(self.get_current_tick(), robot_id, OCCUPY if occupied else FREE,
+                            from_vertex, to_vertex)
+    
+    def _on_lane_granted(self, robot_id: str, from_vertex: int, to_vertex: int) -> None:
+        """
+        Resume a queued robot after the traffic manager handed it its lane.
+        
+        Args:
+            robot_id: ID of the robot.
+            from_vertex: Starting vertex index of the lane.
+            to_vertex: Ending vertex index of the lane.
+        """
+        robot = self.robots[robot_id]
+        robot.on_lane_granted()
+        if self.fleet_state is not None:
+            self.fleet_state.load(self.robot_slots[robot_id])
+        if self.event_scheduler is not None:
+            self.event_scheduler.schedule_robot(robot)
+    
+    def _replan_around_lane(self, robot_id: str, lane_id: int) -> bool:
+        """
+        Route a waiting robot to its target without using the lane it is queued on.
+        Used by the traffic manager's replan deadlock policy. The new route is
+        only taken if the robot is granted its first lane, or can queue for it
+        without waiting on itself again; otherwise the robot stays queued on
+        its old route.
+        
+        Args:
+            robot_id: ID of the robot.
+            lane_id: ID of the lane to avoid.
+        
+        Returns:
+            True if the robot was given a new route, False if it has none that
+            breaks the wait.
+        """
+        robot = self.robots[robot_id]
+        path, reservations = self._plan_route(robot, robot.target_vertex, self.planner,
+                                              avoid_lanes={lane_id})
+        if len(path) < 2:
+            return False
+        
+        traffic_manager = self.traffic_manager
+        granted = traffic_manager.request_lane(robot_id, path[0], path[1], wait=False)
+        if not granted and traffic_manager.would_close_wait_cycle(robot_id, path[0], path[1]):
+            return False
+        
+        traffic_manager.cancel_request(robot_id)
+        robot.assign_task(robot.target_vertex, path)
+        self.reservation_table.reserve(robot_id, reservations)
+        if not granted:
+            traffic_manager.request_lane(robot_id, path[0], path[1])
+            robot.status_code = WAITING
+            if self.journal is not None:
+                self.journal.record(self.get_current_tick(), robot_id, WAIT, path[0], path[1])
+        self.log_message(f"Replanned {robot_id} around lane {lane_id} to break a deadlock")
+        if self.metrics is not None:
+            self.metrics.increment("replans")
+        
+        if self.fleet_state is not None:
+            self.fleet_state.load(self.robot_slots[robot_id])
+        if self.event_scheduler is not None:
+            self.event_scheduler.schedule_robot(robot)
+        return True
+    
+    def get_all_robots(self) -> Dict[str, Robot]:
+        """
+        Get all robots in the fleet.
+        
+        Returns:
+            Dictionary mapping robot IDs to Robot instances.
+        """
+        return self.robots
+    
+    def get_robot_positions(self) -> Dict[str, Tuple[int, int, float]]:
+        """
+        Get the current positions of all robots.
+        
+        Returns:
+            Dictionary mapping robot IDs to positions (from_vertex, to_vertex, progress).
+        """
+        if self.fleet_state is not None:
+            self.fleet_state.sync_progress()
+        if self.event_scheduler is not None:
+            self.event_scheduler.sync_progress(self.robots)
+            
+        positions = {}
+        for robot_id, robot in self.robots.items():
+            positions[robot_id] = robot.get_position()
+        return positions
+    
+    def get_robot_statuses(self) -> Dict[str, RobotStatus]:
+        """
+        Get the current statuses of all robots.
+        
+        Returns:
+            Dictionary mapping robot IDs to RobotStatus values.
+        """
+        statuses = {}
+        for robot_id, robot in self.robots.items():
+            statuses[robot_id] = robot.get_status()
         return statuses
\ No newline at end of file
@@ -0,0 +1,469 @@
+import os
+import time
+import random
+import logging
+import traceback
+import multiprocessing
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from models.nav_graph import NavGraph
+from models.robot import IDLE, MOVING, TASK_COMPLETE, WAITING, Robot
+from controllers.fleet_manager import FleetManager
+from controllers.traffic_manager import TrafficManager
+from utils.graph_partition import count_cut_lanes, get_region_neighbours, partition_graph
+
+class RegionTrafficManager(TrafficManager):
+    """
+    Traffic manager for one region of a partitioned simulation.
+    It owns the lanes starting in its region. A robot that asks for a lane
+    owned by another region is recorded as a handoff instead, and keeps the
+    lane it is standing on until the other region grants it the next one and
+    sends a release back. Robots handed over while still moving along a
+    lane of another region release it back the same way.
+    """
+    def __init__(self, nav_graph: NavGraph, region: int, vertex_regions: List[int], **kwargs):
+        """
+        Initialize the traffic manager.
+
+        Args:
+            nav_graph: NavGraph instance representing the whole environment.
+            region: Index of the region this manager owns.
+            vertex_regions: Region index of each vertex.
+            **kwargs: Further TrafficManager arguments.
+        """
+        super().__init__(nav_graph, **kwargs)
+        self.region = region
+        self.vertex_regions = vertex_regions
+        self.handoffs: List[str] = []  # Robots that asked for a lane owned by another region
+        self.finished: List[str] = []  # Robots that completed their task on a vertex of another region
+        self.remote_lanes: Dict[str, Tuple[int, int, int]] = {}  # Robot ID -> (region, from, to) of the lane it holds there
+        self.releases: Dict[int, List[Tuple[str, int, int]]] = {}  # Region -> lanes to release there
+        self.lane_callback = self._on_lane_change
+
+    def request_lane(self, robot_id: str, from_vertex: int, to_vertex: int, wait: bool = True) -> bool:
+        if self.vertex_regions[from_vertex] != self.region:
+            self.handoffs.append(robot_id)
+            return False
+        return super().request_lane(robot_id, from_vertex, to_vertex, wait)
+
+    def release_lane(self, robot_id: str, from_vertex: int, to_vertex: int) -> Optional[str]:
+        # Robots only release lanes themselves when they complete a task
+        remote_lane = self.remote_lanes.get(robot_id)
+        if remote_lane is not None and remote_lane[1:] == (from_vertex, to_vertex):
+            # Finished on the lane it was handed over on, which another region owns
+            del self.remote_lanes[robot_id]
+            self.releases.setdefault(remote_lane[0], []).append((robot_id, from_vertex, to_vertex))
+            return None
+        if self.vertex_regions[to_vertex] != self.region:
+            self.finished.append(robot_id)
+        return super().release_lane(robot_id, from_vertex, to_vertex)
+
+    def release_remote_lane(self, robot_id: str, from_vertex: int, to_vertex: int) -> None:
+        """
+        Release a lane held by a robot that has moved on to another region.
+
+        Args:
+            robot_id: ID of the robot.
+            from_vertex: Starting vertex index of the lane.
+            to_vertex: Ending vertex index of the lane.
+        """
+        super().release_lane(robot_id, from_vertex, to_vertex)
+
+    def _on_lane_change(self, robot_id: str, from_vertex: int, to_vertex: int, occupied: bool) -> None:
+        """
+        Once a robot handed over from another region takes its first lane
+        here, queue a release of the lane it left behind.
+
+        Args:
+            robot_id: ID of the robot.
+            from_vertex: Starting vertex index of the lane.
+            to_vertex: Ending vertex index of the lane.
+            occupied: True if the robot took the lane, False if it freed it.
+        """
+        if occupied and robot_id in self.remote_lanes:
+            region, remote_from, remote_to = self.remote_lanes.pop(robot_id)
+            self.releases.setdefault(region, []).append((robot_id, remote_from, remote_to))
+
+class RegionWorker:
+    """
+    Simulates the robots and lanes of one region in a worker process.
+    Every sync_interval ticks it sends each neighbouring region the robots
+    moving into it and the lanes to release for robots that came from it,
+    then waits for the same from every neighbour, so neighbouring regions
+    never drift more than sync_interval ticks apart.
+
+    A robot is handed over as soon as it is moving along a lane into another
+    region, and finishes the lane there. As long as a robot needs at least
+    sync_interval ticks per lane it therefore reaches the next region after
+    it has been handed over and carries on without waiting; only releases of
+    the lanes it held are delayed until the next exchange.
+    """
+    def __init__(self, graph_file: str, region: int, vertex_regions: List[int], neighbours: Set[int],
+                 inboxes: List[Any], planner: str, deadlock_policy: str, seed: int, sync_interval: int = 1):
+        """
+        Initialize the worker.
+
+        Args:
+            graph_file: Path to the navigation graph JSON file.
+            region: Index of the region.
+            vertex_regions: Region index of each vertex.
+            neighbours: Regions connected to this one by a lane.
+            inboxes: Message queue of every region.
+            planner: Name of the path planner used for task assignment.
+            deadlock_policy: Name of the policy used to break circular waits.
+            seed: Random seed for task destinations.
+            sync_interval: Ticks between exchanges with the neighbours.
+        """
+        self.region = region
+        self.vertex_regions = vertex_regions
+        self.neighbours = sorted(neighbours)
+        self.inboxes = inboxes
+        self.sync_interval = max(1, sync_interval)
+        self.rng = random.Random(seed * 1000003 + region)
+        self.nav_graph = NavGraph(graph_file)
+        self.traffic_manager = RegionTrafficManager(self.nav_graph, region, vertex_regions,
+                                                    deadlock_policy=deadlock_policy)
+        self.fleet_manager = FleetManager(self.nav_graph, os.devnull, planner=planner,
+                                          traffic_manager=self.traffic_manager)
+        logging.getLogger().setLevel(logging.WARNING)
+        self.tick = 0
+        self.pending: Dict[int, List[Tuple[int, Dict]]] = {}  # Tick -> (sender, message) received early
+        self.stats = {"tasks_assigned": 0, "handoffs": 0, "busy_time": 0.0, "wait_time": 0.0, "task_time": 0.0}
+
+    def spawn(self, robots: List[Tuple[str, int]]) -> None:
+        """
+        Spawn robots in this region.
+
+        Args:
+            robots: List of (robot ID, vertex index).
+        """
+        for robot_id, vertex_index in robots:
+            self.fleet_manager.spawn_robot(vertex_index, robot_id)
+
+    def assign_random_tasks(self) -> None:
+        """Give every idle or finished robot a task to a random vertex."""
+        start = time.perf_counter()
+        num_vertices = len(self.nav_graph.vertices)
+        for robot_id, robot in list(self.fleet_manager.robots.items()):
+            if robot.status_code in (IDLE, TASK_COMPLETE):
+                if self.fleet_manager.assign_task(robot_id, self.rng.randrange(num_vertices)):
+                    self.stats["tasks_assigned"] += 1
+        self.stats["task_time"] += time.perf_counter() - start
+
+    def collect_outgoing(self) -> Dict[int, Dict[str, list]]:
+        """
+        Remove the robots leaving this region and gather the messages for the neighbours.
+
+        Returns:
+            Dictionary mapping each neighbouring region to a message with the
+            "robots" moving there and the "releases" of lanes held there.
+        """
+        traffic_manager = self.traffic_manager
+        vertex_regions = self.vertex_regions
+        outgoing = {neighbour: {"robots": [], "releases": []} for neighbour in self.neighbours}
+        for region, releases in traffic_manager.releases.items():
+            outgoing[region]["releases"] = releases
+        traffic_manager.releases = {}
+
+        # Robots on a lane into another region, or that reached one before
+        # they could be handed over, keep holding the lane they are on
+        leaving = dict.fromkeys(robot_id for robot_id, robot in self.fleet_manager.robots.items()
+                                if robot.status_code == MOVING and vertex_regions[robot.to_vertex] != self.region)
+        leaving.update(dict.fromkeys(traffic_manager.handoffs))
+        for robot_id in leaving:
+            robot = self.fleet_manager.remove_robot(robot_id)
+            held_lane = traffic_manager.robot_lanes.get(robot_id)
+            held = self.nav_graph.get_lane_endpoints(held_lane) if held_lane is not None else None
+            target = robot.to_vertex if robot.status_code == MOVING else robot.current_vertex
+            outgoing[vertex_regions[target]]["robots"].append((robot.get_state(), held))
+        self.stats["handoffs"] += len(leaving)
+        traffic_manager.handoffs = []
+
+        # Robots that finished on another region's vertex are managed there from now on
+        for robot_id in traffic_manager.finished:
+            robot = self.fleet_manager.robots.get(robot_id)
+            if robot is not None and robot.status_code == TASK_COMPLETE:
+                self.fleet_manager.remove_robot(robot_id)
+                outgoing[vertex_regions[robot.current_vertex]]["robots"].append((robot.get_state(), None))
+        traffic_manager.finished = []
+        return outgoing
+
+    def apply_incoming(self, messages: List[Tuple[int, Dict]]) -> None:
+        """
+        Apply the messages of the neighbours: release lanes first, then take
+        over arriving robots and request the next lane of those waiting for one.
+
+        Args:
+            messages: List of (sender region, message), sorted by sender.
+        """
+        traffic_manager = self.traffic_manager
+        for _, message in messages:
+            for robot_id, from_vertex, to_vertex in message["releases"]:
+                traffic_manager.release_remote_lane(robot_id, from_vertex, to_vertex)
+
+        for sender, message in messages:
+            for state, held in message["robots"]:
+                robot = Robot.from_state(state)
+                self.fleet_manager.adopt_robot(robot)
+                if held is None:
+                    continue
+                traffic_manager.remote_lanes[robot.id] = (sender, held[0], held[1])
+                if robot.status_code == WAITING and traffic_manager.request_lane(robot.id, robot.from_vertex,
+                                                                                  robot.to_vertex):
+                    robot.on_lane_granted()
+
+    def exchange(self) -> None:
+        """Send the messages gathered since the last exchange to the neighbours and apply theirs."""
+        for region, message in self.collect_outgoing().items():
+            self.inboxes[region].put((self.tick, self.region, message))
+
+        # A neighbour may already be an exchange ahead; keep its next message for later
+        messages = self.pending.pop(self.tick, [])
+        inbox = self.inboxes[self.region]
+        while len(messages) < len(self.neighbours):
+            tick, sender, message = inbox.get()
+            if tick == self.tick:
+                messages.append((sender, message))
+            else:
+                self.pending.setdefault(tick, []).append((sender, message))
+        messages.sort(key=lambda item: item[0])
+        self.apply_incoming(messages)
+
+    def run(self, num_ticks: int, continuous: bool, task_interval: int) -> Dict[str, Any]:
+        """
+        Run ticks, exchanging with the neighbouring regions every sync_interval ticks.
+
+        Args:
+            num_ticks: Number of ticks to run.
+            continuous: True to give robots new random tasks every task_interval ticks.
+            task_interval: Ticks between task assignments in continuous mode.
+
+        Returns:
+            Statistics of the region, with tick_time the seconds spent in the
+            tick loop apart from assigning tasks.
+        """
+        start = time.perf_counter()
+        task_time = self.stats["task_time"]
+        for tick in range(num_ticks):
+            if continuous and tick > 0 and tick % task_interval == 0:
+                self.assign_random_tasks()
+            update_start = time.perf_counter()
+            self.fleet_manager.update_robots()
+            self.tick += 1
+            self.stats["busy_time"] += time.perf_counter() - update_start
+            if self.tick % self.sync_interval == 0:
+                exchange_start = time.perf_counter()
+                self.exchange()
+                self.stats["wait_time"] += time.perf_counter() - exchange_start
+        tick_time = time.perf_counter() - start - (self.stats["task_time"] - task_time)
+
+        robots = self.fleet_manager.robots.values()
+        return dict(
+            self.stats,
+            region=self.region,
+            tick_time=tick_time,
+            robots=len(self.fleet_manager.robots),
+            robots_finished=sum(1 for robot in robots if robot.status_code == TASK_COMPLETE),
+            deadlocks=self.traffic_manager.get_deadlock_stats()["detected"],
+        )
+
+def _run_region_worker(commands: Any, results: Any, graph_file: str, region: int, vertex_regions: List[int],
+                       neighbours: Set[int], inboxes: List[Any], planner: str, deadlock_policy: str,
+                       seed: int, sync_interval: int) -> None:
+    """
+    Entry point of a region worker process: execute commands until told to stop.
+
+    Args:
+        commands: Queue of commands from the coordinator.
+        results: Queue of results to the coordinator.
+        graph_file: Path to the navigation graph JSON file.
+        region: Index of the region.
+        vertex_regions: Region index of each vertex.
+        neighbours: Regions connected to this one by a lane.
+        inboxes: Message queue of every region.
+        planner: Name of the path planner used for task assignment.
+        deadlock_policy: Name of the policy used to break circular waits.
+        seed: Random seed for task destinations.
+        sync_interval: Ticks between exchanges with the neighbours.
+    """
+    try:
+        worker = RegionWorker(graph_file, region, vertex_regions, neighbours, inboxes,
+                              planner, deadlock_policy, seed, sync_interval)
+        while True:
+            command, *args = commands.get()
+            if command == "spawn":
+                worker.spawn(*args)
+            elif command == "assign":
+                worker.assign_random_tasks()
+                results.put(("done", region, None))
+            elif command == "run":
+                results.put(("done", region, worker.run(*args)))
+            elif command == "stop":
+                break
+    except Exception:
+        results.put(("error", region, traceback.format_exc()))
+
+class PartitionedSimulator:
+    """
+    Runs a fleet simulation on several cores by splitting the navigation
+    graph into regions, each simulated by its own worker process.
+
+    A region owns the lanes that start in it and the robots on them. Robots
+    crossing a region boundary are handed to the next region together with
+    the lane they hold, which is released back in the old region once they
+    are granted their next lane, so lane ownership rules are the same as in a
+    single FleetManager. Regions only exchange robots and releases every
+    sync_interval ticks: a lane left behind in another region stays occupied
+    until the next exchange, and a robot that reaches another region's vertex
+    before it was handed over waits there for it. Deadlocks are only detected
+    between robots of the same region. Workers use scalar FleetManagers;
+    planners ignore other regions' reservations.
+    """
+    def __init__(self, graph_file: str, num_regions: int, planner: str = "astar",
+                 deadlock_policy: str = "backoff_youngest", seed: Optional[int] = None,
+                 sync_interval: int = 10):
+        """
+        Partition the graph and start one worker process per region.
+
+        Args:
+            graph_file: Path to the navigation graph JSON file.
+            num_regions: Number of regions (worker processes).
+            planner: Name of the path planner used for task assignment.
+            deadlock_policy: Name of the policy used to break circular waits.
+            seed: Random seed for spawns and tasks.
+            sync_interval: Ticks between exchanges of neighbouring regions;
+                robots cross without waiting as long as they need at least
+                this many ticks per lane.
+        """
+        self.nav_graph = NavGraph(graph_file)
+        self.vertex_regions = partition_graph(self.nav_graph, num_regions)
+        self.num_regions = max(self.vertex_regions) + 1
+        self.neighbours = get_region_neighbours(self.nav_graph, self.vertex_regions)
+        self.cut_lanes = count_cut_lanes(self.nav_graph, self.vertex_regions)
+        self.rng = random.Random(seed)
+        self.next_robot_id = 1
+        self.num_robots = 0
+
+        # Spawned workers start from a fresh interpreter, which works on every platform
+        context = multiprocessing.get_context("spawn")
+        self.inboxes = [context.Queue() for _ in range(self.num_regions)]
+        self.commands = [context.Queue() for _ in range(self.num_regions)]
+        self.results = context.Queue()
+        worker_seed = self.rng.randrange(1 << 30)
+        self.processes = [
+            context.Process(
+                target=_run_region_worker, name=f"region-{region}", daemon=True,
+                args=(self.commands[region], self.results, graph_file, region, self.vertex_regions,
+                      self.neighbours[region], self.inboxes, planner, deadlock_policy, worker_seed,
+                      sync_interval)
+            )
+            for region in range(self.num_regions)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def spawn_robots(self, count: int) -> List[str]:
+        """
+        Spawn robots at random vertices, each in the region owning its vertex.
+
+        Args:
+            count: Number of robots.
+
+        Returns:
+            IDs of the spawned robots.
+        """
+        per_region: List[List[Tuple[str, int]]] = [[] for _ in range(self.num_regions)]
+        robot_ids = []
+        for _ in range(count):
+            robot_id = f"Robot_{self.next_robot_id}"
+            self.next_robot_id += 1
+            vertex_index = self.rng.randrange(len(self.nav_graph.vertices))
+            per_region[self.vertex_regions[vertex_index]].append((robot_id, vertex_index))
+            robot_ids.append(robot_id)
+        for region, robots in enumerate(per_region):
+            if robots:
+                self.commands[region].put(("spawn", robots))
+        self.num_robots += count
+        return robot_ids
+
+    def _collect_results(self) -> List[Any]:
+        """
+        Wait for every worker to finish its current command.
+
+        Returns:
+            Result of each region.
+
+        Raises:
+            RuntimeError: If a worker fails.
+        """
+        regions: List[Any] = [None] * self.num_regions
+        for _ in range(self.num_regions):
+            status, region, result = self.results.get()
+            if status == "error":
+                self.close(force=True)
+                raise RuntimeError(f"Region {region} worker failed:\n{result}")
+            regions[region] = result
+        return regions
+
+    def run(self, num_ticks: int, continuous: bool = False, task_interval: int = 30) -> Dict[str, Any]:
+        """
+        Run all regions for a number of ticks. Every idle robot is given a
+        random task before the ticks start.
+
+        Args:
+            num_ticks: Number of ticks to run.
+            continuous: True to give robots new random tasks every task_interval ticks.
+            task_interval: Ticks between task assignments in continuous mode.
+
+        Returns:
+            Dictionary with the wall-clock time of the ticks, ticks per second,
+            totals over all regions and the statistics of each region. As with
+            Simulator, the throughput leaves out time spent assigning tasks; it
+            is based on the slowest region.
+
+        Raises:
+            RuntimeError: If a worker fails.
+        """
+        for commands in self.commands:
+            commands.put(("assign",))
+        self._collect_results()
+
+        start = time.perf_counter()
+        for commands in self.commands:
+            commands.put(("run", num_ticks, continuous, task_interval))
+        regions: List[Dict[str, Any]] = self._collect_results()
+        elapsed = time.perf_counter() - start
+        tick_time = max(result["tick_time"] for result in regions)
+
+        return {
+            "regions": regions,
+            "ticks": num_ticks,
+            "elapsed": elapsed,
+            "ticks_per_second": num_ticks / tick_time if tick_time > 0 else 0.0,
+            "robots": sum(result["robots"] for result in regions),
+            "robots_finished": sum(result["robots_finished"] for result in regions),
+            "tasks_assigned": sum(result["tasks_assigned"] for result in regions),
+            "handoffs": sum(result["handoffs"] for result in regions),
+            "deadlocks": sum(result["deadlocks"] for result in regions),
+        }
+
+    def close(self, force: bool = False) -> None:
+        """
+        Stop the worker processes.
+
+        Args:
+            force: True to terminate the workers instead of asking them to stop.
+        """
+        for region, process in enumerate(self.processes):
+            if force:
+                process.terminate()
+            elif process.is_alive():
+                self.commands[region].put(("stop",))
+        for process in self.processes:
+            process.join()
+
+    def __enter__(self) -> "PartitionedSimulator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
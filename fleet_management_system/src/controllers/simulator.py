@@ -0,0 +1,111 @@
+import time
+from typing import Optional
+
+from controllers.fleet_manager import FleetManager
+
+class Simulator:
+    """
+    Fixed-timestep tick engine driving a FleetManager.
+    Runs headless, either as fast as possible or paced to wall-clock time,
+    and can also be stepped from a GUI event loop.
+    """
+    def __init__(self, fleet_manager: FleetManager, timestep: float = 1 / 30,
+                 realtime: bool = False):
+        """
+        Initialize the simulator.
+
+        Args:
+            fleet_manager: FleetManager whose robots are simulated.
+            timestep: Simulated seconds per tick.
+            realtime: True to pace ticks to wall-clock time, False to run
+                as fast as possible.
+        """
+        self.fleet_manager = fleet_manager
+        self.timestep = timestep
+        self.realtime = realtime
+        self.tick_count = 0
+        self.sim_time = 0.0  # Simulated seconds elapsed
+        self.wall_time = 0.0  # Wall-clock seconds spent inside ticks
+        self._last_wall_clock: Optional[float] = None  # Used by advance_realtime
+        self._accumulator = 0.0  # Wall-clock time not yet simulated
+
+    def step(self, ticks: int = 1) -> None:
+        """
+        Advance the simulation.
+
+        Args:
+            ticks: Number of ticks to advance in one call.
+        """
+        start = time.perf_counter()
+        self.fleet_manager.update_robots(ticks)
+        self.tick_count += ticks
+        self.sim_time += ticks * self.timestep
+        self.wall_time += time.perf_counter() - start
+
+    def run(self, num_ticks: Optional[int] = None, duration: Optional[float] = None) -> int:
+        """
+        Run the simulation until a tick count or simulated duration is reached.
+
+        Args:
+            num_ticks: Number of ticks to run.
+            duration: Simulated seconds to run; ignored if num_ticks is given.
+
+        Returns:
+            Number of ticks run.
+        """
+        if num_ticks is None:
+            if duration is None:
+                raise ValueError("Either num_ticks or duration must be given")
+            num_ticks = int(round(duration / self.timestep))
+
+        if not self.realtime:
+            # Let the fleet manager batch the ticks (an event-driven fleet skips idle time)
+            self.step(num_ticks)
+            return num_ticks
+
+        start = time.perf_counter()
+        for tick in range(num_ticks):
+            self.step()
+            # Sleep until the wall clock catches up with simulated time
+            delay = start + (tick + 1) * self.timestep - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return num_ticks
+
+    def advance_realtime(self, max_ticks: int = 5) -> int:
+        """
+        Run as many ticks as the wall-clock time since the last call covers.
+        Meant to be called from an external loop, such as the GUI's redraw timer.
+
+        Args:
+            max_ticks: Upper bound on ticks per call, so a stalled caller does
+                not trigger a long catch-up burst.
+
+        Returns:
+            Number of ticks run.
+        """
+        now = time.perf_counter()
+        if self._last_wall_clock is None:
+            self._last_wall_clock = now - self.timestep
+        self._accumulator += now - self._last_wall_clock
+        self._last_wall_clock = now
+
+        ticks = 0
+        while self._accumulator >= self.timestep and ticks < max_ticks:
+            self.step()
+            self._accumulator -= self.timestep
+            ticks += 1
+        if ticks == max_ticks:
+            self._accumulator = 0.0
+        return ticks
+
+    def get_ticks_per_second(self) -> float:
+        """
+        Get the measured tick throughput.
+
+        Returns:
+            Ticks per wall-clock second spent simulating, or 0.0 before any tick.
+        """
+        if self.wall_time <= 0:
+            return 0.0
+        return self.tick_count / self.wall_time
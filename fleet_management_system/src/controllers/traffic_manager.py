@@ -1,168 +1,423 @@
-from typing import Dict, List, Tuple, Set, Optional
-from models.nav_graph import NavGraph
-
-class TrafficManager:
-    """
-    Manages traffic and collision avoidance between robots.
-    """
-    def __init__(self, nav_graph: NavGraph):
-        """
-        Initialize the traffic manager.
-        
-        Args:
-            nav_graph: NavGraph instance representing the environment.
-        """
-        self.nav_graph = nav_graph
-        self.vertex_occupancy: Dict[int, str] = {}  # Maps vertex index to robot ID
-        self.lane_wait_queue: Dict[str, List[str]] = {}  # Maps lane ID to list of waiting robot IDs
-        
-        # Initialize lane wait queues
-        for lane in self.nav_graph.get_all_lanes():
-            from_vertex, to_vertex = lane
-            lane_id = self._get_lane_id(from_vertex, to_vertex)
-            self.lane_wait_queue[lane_id] = []
-    
-    def _get_lane_id(self, from_vertex: int, to_vertex: int) -> str:
-        """
-        Generate a unique identifier for a lane.
-        
-        Args:
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            
-        Returns:
-            String identifier for the lane.
-        """
-        return f"{from_vertex}->{to_vertex}"
-    
-    def request_lane(self, robot_id: str, from_vertex: int, to_vertex: int) -> bool:
-        """
-        Request permission for a robot to enter a lane.
-        
-        Args:
-            robot_id: ID of the robot requesting permission.
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            
-        Returns:
-            True if permission granted, False otherwise.
-        """
-        lane_id = self._get_lane_id(from_vertex, to_vertex)
-        
-        # Check if the lane exists
-        if not self.nav_graph.lane_exists(from_vertex, to_vertex):
-            return False
-            
-        # Check if the lane is free
-        if self.nav_graph.is_lane_free(from_vertex, to_vertex):
-            # Lane is free, grant permission
-            self.nav_graph.occupy_lane(from_vertex, to_vertex, robot_id)
-            return True
-        else:
-            # Lane is occupied, add robot to wait queue
-            if robot_id not in self.lane_wait_queue[lane_id]:
-                self.lane_wait_queue[lane_id].append(robot_id)
-            return False
-    
-    def release_lane(self, robot_id: str, from_vertex: int, to_vertex: int) -> None:
-        """
-        Release a lane after a robot has traversed it.
-        
-        Args:
-            robot_id: ID of the robot releasing the lane.
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-        """
-        lane_id = self._get_lane_id(from_vertex, to_vertex)
-        
-        # Free the lane
-        self.nav_graph.free_lane(from_vertex, to_vertex, robot_id)
-        
-        # Check wait queue
-        if self.lane_wait_queue[lane_id]:
-            next_robot_id = self.lane_wait_queue[lane_id].pop(0)
-            # The next robot will request the lane on its next update
-    
-    def mark_vertex_occupied(self, vertex_index: int, robot_id: str) -> bool:
-        """
-        Mark a vertex as occupied by a robot.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            robot_id: ID of the robot occupying the vertex.
-            
-        Returns:
-            True if successful, False if vertex is already occupied.
-        """
-        if vertex_index in self.vertex_occupancy:
-            return False
-            
-        self.vertex_occupancy[vertex_index] = robot_id
-        return True
-    
-    def mark_vertex_free(self, vertex_index: int, robot_id: str) -> bool:
-        """
-        Mark a vertex as free.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            robot_id: ID of the robot that was occupying the vertex.
-            
-        Returns:
-            True if successful, False if vertex was not occupied by this robot.
-        """
-        if vertex_index in self.vertex_occupancy and self.vertex_occupancy[vertex_index] == robot_id:
-            del self.vertex_occupancy[vertex_index]
-            return True
-        return False
-    
-    def is_vertex_occupied(self, vertex_index: int) -> bool:
-        """
-        Check if a vertex is occupied.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            
-        Returns:
-            True if the vertex is occupied, False otherwise.
-        """
-        return vertex_index in self.vertex_occupancy
-    
-    def get_congestion_points(self) -> List[int]:
-        """
-        Get a list of vertices with high congestion (multiple robots waiting).
-        
-        Returns:
-            List of vertex indices with high congestion.
-        """
-        congestion_count = {}
-        
-        # Count robots waiting for each vertex
-        for lane_id, wait_queue in self.lane_wait_queue.items():
-            if len(wait_queue) > 1:
-                # Extract destination vertex from lane ID
-                _, to_vertex = lane_id.split("->")
-                to_vertex = int(to_vertex)
-                
-                if to_vertex not in congestion_count:
-                    congestion_count[to_vertex] = 0
-                congestion_count[to_vertex] += len(wait_queue)
-        
-        # Return vertices with high congestion
-        return [vertex for vertex, count in congestion_count.items() if count > 2]
-    
-    def get_waiting_robots(self) -> Dict[str, Tuple[int, int]]:
-        """
-        Get all robots that are waiting to enter a lane.
-        
-        Returns:
-            Dictionary mapping robot IDs to (from_vertex, to_vertex) tuples.
-        """
-        waiting_robots = {}
-        
-        for lane_id, wait_queue in self.lane_wait_queue.items():
-            for robot_id in wait_queue:
-                from_vertex, to_vertex = lane_id.split("->")
-                waiting_robots[robot_id] = (int(from_vertex), int(to_vertex))
-        
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Set, Optional, Callable
+from models.nav_graph import NavGraph
+from controllers.deadlock_policies import DeadlockPolicy, create_deadlock_policy
+from utils.metrics import Metrics, timed
+
+class TrafficManager:
+    """
+    Manages traffic and collision avoidance between robots.
+    All lane acquisition goes through request_lane and release_lane: robots
+    that find a lane occupied join a FIFO queue, and a released lane is handed
+    straight to the robot at the head of its queue.
+    
+    A robot keeps the lane it has just finished until it is granted the next
+    one, since it is still physically standing at the end of it. Robots can
+    therefore wait on each other in a cycle; the wait-for graph (each queued
+    robot waits for the owner of the lane it is queued on) is checked for a
+    cycle whenever a robot joins a queue, and cycles are broken by a
+    pluggable DeadlockPolicy. The graph is not stored: it is read off the
+    wait queues and lane occupancy, and a check follows one chain of
+    blockers, so it takes time linear in the length of that chain.
+    """
+    def __init__(self, nav_graph: NavGraph, grant_callback: Optional[Callable[[str, int, int], None]] = None,
+                 deadlock_policy: str = "backoff_youngest"):
+        """
+        Initialize the traffic manager.
+        
+        Args:
+            nav_graph: NavGraph instance representing the environment.
+            grant_callback: Function called with (robot_id, from_vertex, to_vertex)
+                when a queued robot is handed a lane.
+            deadlock_policy: Name of the policy used to break circular waits.
+        """
+        self.nav_graph = nav_graph
+        self.grant_callback = grant_callback
+        self.replan_callback: Optional[Callable[[str, int], bool]] = None  # (robot_id, lane ID to avoid) -> replanned
+        self.lane_callback: Optional[Callable[[str, int, int, bool], None]] = None  # (robot_id, from, to, occupied)
+        self.vertex_occupancy: Dict[int, str] = {}  # Maps vertex index to robot ID
+        self.lane_wait_queue: Dict[int, Deque[str]] = {}  # Maps lane ID to FIFO queue of waiting robot IDs
+        self.robot_waiting_lane: Dict[str, int] = {}  # Maps waiting robot ID to the lane ID it is queued on
+        self.robot_lanes: Dict[str, int] = {}  # Maps robot ID to the lane ID it owns
+        self.robot_order: Dict[str, int] = {}  # Order in which robots first requested a lane (higher is younger)
+        self.metrics: Optional[Metrics] = None  # Records lane timings and contention when set
+        
+        # Deadlock handling
+        self.deadlock_policy: DeadlockPolicy = create_deadlock_policy(deadlock_policy)
+        self.pending_deadlocks: Deque[Tuple[List[str], float]] = deque()  # (cycle of robot IDs, detection time)
+        self.deadlocks_detected = 0
+        self.deadlocks_resolved = 0
+        self.resolution_latencies: List[float] = []  # Seconds from detection to resolution
+    
+    def request_lane(self, robot_id: str, from_vertex: int, to_vertex: int, wait: bool = True) -> bool:
+        """
+        Request permission for a robot to enter a lane. When granted, the lane
+        the robot owned before is released.
+        
+        Args:
+            robot_id: ID of the robot requesting permission.
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            wait: True to queue the robot if the lane is occupied; it is then
+                granted the lane through grant_callback once it reaches the
+                head of the queue.
+            
+        Returns:
+            True if permission granted, False otherwise.
+        """
+        lane_id = self.nav_graph.get_lane_id(from_vertex, to_vertex)
+        
+        # Check if the lane exists
+        if lane_id is None:
+            return False
+        self.robot_order.setdefault(robot_id, len(self.robot_order))
+            
+        # Grant the lane if it is free and nobody is queued ahead of this robot
+        queue = self.lane_wait_queue.get(lane_id)
+        if not queue and self.nav_graph.occupy_lane(from_vertex, to_vertex, robot_id):
+            if self.lane_callback is not None:
+                self.lane_callback(robot_id, from_vertex, to_vertex, True)
+            previous_lane = self.robot_lanes.get(robot_id)
+            self.robot_lanes[robot_id] = lane_id
+            if previous_lane is not None:
+                self._release(robot_id, previous_lane)
+            return True
+            
+        # Lane is occupied, add robot to wait queue
+        if self.metrics is not None:
+            self.metrics.increment("lane_contention")
+        if wait and self.robot_waiting_lane.get(robot_id) != lane_id:
+            if self.metrics is not None:
+                self.metrics.increment("waits")
+            self.cancel_request(robot_id)
+            if queue is None:
+                queue = self.lane_wait_queue[lane_id] = deque()
+            queue.append(robot_id)
+            self.robot_waiting_lane[robot_id] = lane_id
+            self._check_deadlock(robot_id)
+        return False
+    
+    def release_lane(self, robot_id: str, from_vertex: int, to_vertex: int) -> Optional[str]:
+        """
+        Release a lane after a robot has traversed it, handing it to the next
+        queued robot if there is one.
+        
+        Args:
+            robot_id: ID of the robot releasing the lane.
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            
+        Returns:
+            ID of the robot the lane was handed to, or None.
+        """
+        lane_id = self.nav_graph.get_lane_id(from_vertex, to_vertex)
+        if lane_id is None or self.robot_lanes.get(robot_id) != lane_id:
+            return None
+        del self.robot_lanes[robot_id]
+        return self._release(robot_id, lane_id)
+    
+    def _release(self, robot_id: str, lane_id: int) -> Optional[str]:
+        """
+        Free a lane and hand it to the head of its wait queue. The new owner
+        releases the lane it was holding while it waited, which may in turn be
+        handed on, so the handoff walks down the chain of waiting robots.
+        
+        Args:
+            robot_id: ID of the robot releasing the lane.
+            lane_id: ID of the lane.
+            
+        Returns:
+            ID of the robot the lane was handed to, or None.
+        """
+        grants = []
+        while lane_id is not None:
+            from_vertex, to_vertex = self.nav_graph.get_lane_endpoints(lane_id)
+            self.nav_graph.free_lane(from_vertex, to_vertex, robot_id)
+            if self.lane_callback is not None:
+                self.lane_callback(robot_id, from_vertex, to_vertex, False)
+            
+            # Hand the lane to the first robot in the wait queue
+            queue = self.lane_wait_queue.get(lane_id)
+            if not queue:
+                break
+            next_robot_id = queue.popleft()
+            if not queue:
+                del self.lane_wait_queue[lane_id]
+            del self.robot_waiting_lane[next_robot_id]
+            self.nav_graph.occupy_lane(from_vertex, to_vertex, next_robot_id)
+            if self.lane_callback is not None:
+                self.lane_callback(next_robot_id, from_vertex, to_vertex, True)
+            grants.append((next_robot_id, from_vertex, to_vertex))
+            
+            # Continue with the lane the new owner held while it waited
+            previous_lane = self.robot_lanes.get(next_robot_id)
+            self.robot_lanes[next_robot_id] = lane_id
+            robot_id, lane_id = next_robot_id, previous_lane
+        
+        if self.grant_callback:
+            for grant in grants:
+                self.grant_callback(*grant)
+        return grants[0][0] if grants else None
+    
+    def cancel_request(self, robot_id: str) -> bool:
+        """
+        Remove a robot from the wait queue it is in, e.g. when it is given a new task.
+        
+        Args:
+            robot_id: ID of the robot.
+            
+        Returns:
+            True if the robot was queued, False otherwise.
+        """
+        lane_id = self.robot_waiting_lane.pop(robot_id, None)
+        if lane_id is None:
+            return False
+        queue = self.lane_wait_queue[lane_id]
+        queue.remove(robot_id)
+        if not queue:
+            del self.lane_wait_queue[lane_id]
+        return True
+    
+    def back_off(self, robot_id: str) -> bool:
+        """
+        Make a waiting robot give up the lane it is holding, while staying in
+        the queue for the lane it wants.
+        
+        Args:
+            robot_id: ID of the robot.
+            
+        Returns:
+            True if the robot was holding a lane, False otherwise.
+        """
+        lane_id = self.robot_lanes.pop(robot_id, None)
+        if lane_id is None:
+            return False
+        self._release(robot_id, lane_id)
+        return True
+    
+    def get_blocker(self, robot_id: str) -> Optional[str]:
+        """
+        Get the robot a waiting robot is waiting for (its edge in the wait-for graph).
+        
+        Args:
+            robot_id: ID of the robot.
+            
+        Returns:
+            ID of the robot owning the lane the robot is queued on, or None if
+            the robot is not waiting.
+        """
+        lane_id = self.robot_waiting_lane.get(robot_id)
+        if lane_id is None:
+            return None
+        return self.nav_graph.lane_occupancy[lane_id]
+    
+    def get_wait_for_graph(self) -> Dict[str, str]:
+        """
+        Get the wait-for graph between robots.
+        
+        Returns:
+            Dictionary mapping each waiting robot ID to the robot it waits for.
+        """
+        return {robot_id: self.get_blocker(robot_id) for robot_id in self.robot_waiting_lane}
+    
+    def find_wait_cycle(self, robot_id: str) -> Optional[List[str]]:
+        """
+        Follow the wait-for graph from a robot to see if it leads back to it.
+        Every waiting robot has a single outgoing edge, so this walks one
+        chain rather than searching the graph, in time linear in its length.
+        
+        Args:
+            robot_id: ID of the robot.
+            
+        Returns:
+            Robot IDs forming the cycle, starting with robot_id, or None.
+        """
+        cycle = [robot_id]
+        seen = {robot_id}
+        blocker = self.get_blocker(robot_id)
+        while blocker is not None:
+            if blocker == robot_id:
+                return cycle
+            if blocker in seen:
+                return None  # Leads into a cycle the robot is not part of
+            cycle.append(blocker)
+            seen.add(blocker)
+            blocker = self.get_blocker(blocker)
+        return None
+    
+    def would_close_wait_cycle(self, robot_id: str, from_vertex: int, to_vertex: int) -> bool:
+        """
+        Check whether queueing a robot for a lane would close a cycle in the
+        wait-for graph, i.e. whether the lane's owner is waiting, directly or
+        through other robots, for the robot. Like find_wait_cycle, this walks
+        the owner's chain of blockers.
+    
+        Args:
+            robot_id: ID of the robot.
+            from_vertex: Starting vertex index of the lane.
+            to_vertex: Ending vertex index of the lane.
+    
+        Returns:
+            True if the robot would end up waiting on itself.
+        """
+        lane_id = self.nav_graph.get_lane_id(from_vertex, to_vertex)
+        if lane_id is None:
+            return False
+        seen = set()
+        blocker = self.nav_graph.lane_occupancy[lane_id]
+        while blocker is not None and blocker not in seen:
+            if blocker == robot_id:
+                return True
+            seen.add(blocker)
+            blocker = self.get_blocker(blocker)
+        return False
+    
+    def _check_deadlock(self, robot_id: str) -> None:
+        """
+        Record a deadlock if queueing a robot closed a cycle in the wait-for graph.
+        Only a new wait edge can close a cycle, so this is the only place one
+        can appear.
+        
+        Args:
+            robot_id: ID of the robot that was just queued.
+        """
+        cycle = self.find_wait_cycle(robot_id)
+        if cycle:
+            self.deadlocks_detected += 1
+            if self.metrics is not None:
+                self.metrics.increment("deadlocks")
+            self.pending_deadlocks.append((cycle, time.perf_counter()))
+    
+    def get_youngest_robot(self, robot_ids: List[str]) -> str:
+        """
+        Get the robot that first requested a lane most recently.
+        
+        Args:
+            robot_ids: Robot IDs to choose from.
+            
+        Returns:
+            ID of the youngest robot.
+        """
+        return max(robot_ids, key=lambda robot_id: self.robot_order.get(robot_id, -1))
+    
+    @timed("resolve_deadlocks")
+    def resolve_deadlocks(self) -> int:
+        """
+        Break every pending deadlock with the configured policy.
+        
+        Returns:
+            Number of deadlocks resolved.
+        """
+        resolved = 0
+        # Resolving one deadlock can queue robots again and detect new ones
+        for _ in range(len(self.robot_waiting_lane) + len(self.pending_deadlocks)):
+            if not self.pending_deadlocks:
+                break
+            cycle, detected_at = self.pending_deadlocks.popleft()
+            cycle = self.find_wait_cycle(cycle[0])
+            if not cycle:
+                continue  # Already broken, e.g. by a robot being reassigned
+            if self.deadlock_policy.resolve(self, cycle):
+                resolved += 1
+                self.deadlocks_resolved += 1
+                self.resolution_latencies.append(time.perf_counter() - detected_at)
+        return resolved
+    
+    def get_deadlock_stats(self) -> Dict[str, float]:
+        """
+        Get deadlock detection and resolution statistics.
+        
+        Returns:
+            Dictionary with deadlock counts and resolution latencies in seconds.
+        """
+        latencies = self.resolution_latencies
+        return {
+            "policy": self.deadlock_policy.name,
+            "detected": self.deadlocks_detected,
+            "resolved": self.deadlocks_resolved,
+            "pending": len(self.pending_deadlocks),
+            "mean_resolution_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_resolution_latency": max(latencies) if latencies else 0.0,
+        }
+    
+    def mark_vertex_occupied(self, vertex_index: int, robot_id: str) -> bool:
+        """
+        Mark a vertex as occupied by a robot.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            robot_id: ID of the robot occupying the vertex.
+            
+        Returns:
+            True if successful, False if vertex is already occupied.
+        """
+        if vertex_index in self.vertex_occupancy:
+            return False
+            
+        self.vertex_occupancy[vertex_index] = robot_id
+        return True
+    
+    def mark_vertex_free(self, vertex_index: int, robot_id: str) -> bool:
+        """
+        Mark a vertex as free.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            robot_id: ID of the robot that was occupying the vertex.
+            
+        Returns:
+            True if successful, False if vertex was not occupied by this robot.
+        """
+        if vertex_index in self.vertex_occupancy and self.vertex_occupancy[vertex_index] == robot_id:
+            del self.vertex_occupancy[vertex_index]
+            return True
+        return False
+    
+    def is_vertex_occupied(self, vertex_index: int) -> bool:
+        """
+        Check if a vertex is occupied.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            True if the vertex is occupied, False otherwise.
+        """
+        return vertex_index in self.vertex_occupancy
+    
+    def get_congestion_points(self) -> List[int]:
+        """
+        Get a list of vertices with high congestion (multiple robots waiting).
+        
+        Returns:
+            List of vertex indices with high congestion.
+        """
+        congestion_count = {}
+        
+        # Count robots waiting for each vertex
+        for lane_id, wait_queue in self.lane_wait_queue.items():
+            if len(wait_queue) > 1:
+                _, to_vertex = self.nav_graph.get_lane_endpoints(lane_id)
+                
+                if to_vertex not in congestion_count:
+                    congestion_count[to_vertex] = 0
+                congestion_count[to_vertex] += len(wait_queue)
+        
+        # Return vertices with high congestion
+        return [vertex for vertex, count in congestion_count.items() if count > 2]
+    
+    def get_waiting_robots(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Get all robots that are waiting to enter a lane.
+        
+        Returns:
+            Dictionary mapping robot IDs to (from_vertex, to_vertex) tuples.
+        """
+        waiting_robots = {}
+        
+        for lane_id, wait_queue in self.lane_wait_queue.items():
+            for robot_id in wait_queue:
+                waiting_robots[robot_id] = self.nav_graph.get_lane_endpoints(lane_id)
+        
         return waiting_robots
\ No newline at end of file
@@ -1,431 +1,760 @@
-import os
-import tkinter as tk
-from tkinter import messagebox, Canvas, Frame, Label, scrolledtext
-import math
-import time
-from typing import Dict, List, Tuple, Optional, Callable
-
-from models.nav_graph import NavGraph
-from models.robot import Robot, RobotStatus
-from controllers.fleet_manager import FleetManager
-from controllers.traffic_manager import TrafficManager
-
-class FleetGUI:
-    """
-    GUI for the Fleet Management System.
-    Visualizes the navigation graph, robots, and allows user interaction.
-    """
-    def __init__(self, root: tk.Tk, nav_graph: NavGraph, fleet_manager: FleetManager):
-        """
-        Initialize the Fleet GUI.
-        
-        Args:
-            root: Tkinter root window.
-            nav_graph: NavGraph instance representing the environment.
-            fleet_manager: FleetManager instance managing the robot fleet.
-        """
-        self.root = root
-        self.root.title("Fleet Management System")
-        self.nav_graph = nav_graph
-        self.fleet_manager = fleet_manager
-        
-        self.canvas_width = 800
-        self.canvas_height = 600
-        self.vertex_radius = 15
-        self.robot_radius = 10
-        
-        # Store screen coordinates mapped from vertex coordinates
-        self.vertex_positions = {}
-        
-        # For scaling and translating vertex coordinates to screen coordinates
-        self.scale_factor = 1
-        self.offset_x = 0
-        self.offset_y = 0
-        
-        # For tracking selected vertex and robot
-        self.selected_vertex = None
-        self.selected_robot = None
-        
-        # GUI elements
-        self.canvas = None
-        self.log_text = None
-        self.status_label = None
-        
-        # For tracking canvas elements
-        self.vertex_elements = {}
-        self.lane_elements = {}
-        self.robot_elements = {}
-        self.label_elements = {}
-        
-        # Initialize the GUI
-        self.setup_gui()
-        self.calculate_layout()
-        self.draw_navigation_graph()
-        
-        # Start the update loop
-        self.update_display()
-    
-    def setup_gui(self) -> None:
-        """Set up the main GUI layout."""
-        # Main frame
-        main_frame = Frame(self.root)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Top frame for canvas
-        canvas_frame = Frame(main_frame)
-        canvas_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # Canvas for visualization
-        self.canvas = Canvas(canvas_frame, width=self.canvas_width, height=self.canvas_height, 
-                            bg="white", borderwidth=2, relief="sunken")
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Add mouse event bindings
-        self.canvas.bind("<Button-1>", self.on_canvas_click)
-        
-        # Bottom frame for logs and status
-        bottom_frame = Frame(main_frame)
-        bottom_frame.pack(fill=tk.X, pady=5)
-        
-        # Status label
-        self.status_label = Label(bottom_frame, text="Ready", anchor="w", padx=5)
-        self.status_label.pack(fill=tk.X, side=tk.TOP)
-        
-        # Log text area
-        log_frame = Frame(bottom_frame)
-        log_frame.pack(fill=tk.BOTH, expand=True)
-        
-        log_label = Label(log_frame, text="Event Log:")
-        log_label.pack(anchor="w")
-        
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=10)
-        self.log_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Instructions label
-        instructions = (
-            "Click on any location to spawn a robot.\n"
-            "Click on a robot to select it, then click on a destination to assign a task."
-        )
-        instructions_label = Label(main_frame, text=instructions, justify=tk.LEFT)
-        instructions_label.pack(anchor="w", pady=5)
-    
-    def calculate_layout(self) -> None:
-        """Calculate the layout by scaling vertex coordinates to fit the canvas."""
-        vertices = self.nav_graph.get_all_vertices()
-        
-        if not vertices:
-            return
-            
-        # Find the min/max coordinates
-        min_x = min(vertex[1] for vertex in vertices)
-        max_x = max(vertex[1] for vertex in vertices)
-        min_y = min(vertex[2] for vertex in vertices)
-        max_y = max(vertex[2] for vertex in vertices)
-        
-        # Add some padding
-        padding = 50
-        
-        # Calculate scale factors for x and y dimensions
-        width_scale = (self.canvas_width - 2 * padding) / (max_x - min_x if max_x > min_x else 1)
-        height_scale = (self.canvas_height - 2 * padding) / (max_y - min_y if max_y > min_y else 1)
-        
-        # Use the smaller scale factor to maintain aspect ratio
-        self.scale_factor = min(width_scale, height_scale)
-        
-        # Calculate offsets to center the graph
-        self.offset_x = padding - min_x * self.scale_factor
-        self.offset_y = padding - min_y * self.scale_factor
-        
-        # Store the screen positions of each vertex
-        for vertex in vertices:
-            index, x, y, _ = vertex
-            screen_x = x * self.scale_factor + self.offset_x
-            screen_y = y * self.scale_factor + self.offset_y
-            self.vertex_positions[index] = (screen_x, screen_y)
-    
-    def vertex_to_screen(self, x: float, y: float) -> Tuple[float, float]:
-        """
-        Convert vertex coordinates to screen coordinates.
-        
-        Args:
-            x: Vertex x-coordinate.
-            y: Vertex y-coordinate.
-            
-        Returns:
-            Tuple of (screen_x, screen_y).
-        """
-        screen_x = x * self.scale_factor + self.offset_x
-        screen_y = y * self.scale_factor + self.offset_y
-        return screen_x, screen_y
-    
-    def screen_to_vertex_index(self, screen_x: float, screen_y: float) -> Optional[int]:
-        """
-        Find the vertex nearest to the given screen coordinates.
-        
-        Args:
-            screen_x: Screen x-coordinate.
-            screen_y: Screen y-coordinate.
-            
-        Returns:
-            Index of the nearest vertex, or None if no vertex is close enough.
-        """
-        closest_dist = float('inf')
-        closest_vertex = None
-        
-        for vertex_index, (x, y) in self.vertex_positions.items():
-            dist = math.sqrt((screen_x - x) ** 2 + (screen_y - y) ** 2)
-            if dist < self.vertex_radius * 1.5 and dist < closest_dist:
-                closest_dist = dist
-                closest_vertex = vertex_index
-                
-        return closest_vertex
-    
-    def draw_navigation_graph(self) -> None:
-        """Draw the navigation graph on the canvas."""
-        # Clear existing elements
-        for element_id in self.lane_elements.values():
-            self.canvas.delete(element_id)
-        for element_id in self.vertex_elements.values():
-            self.canvas.delete(element_id)
-        for element_id in self.label_elements.values():
-            self.canvas.delete(element_id)
-            
-        self.lane_elements = {}
-        self.vertex_elements = {}
-        self.label_elements = {}
-        
-        # Draw lanes first (so they're underneath vertices)
-        lanes = self.nav_graph.get_all_lanes()
-        for lane in lanes:
-            from_vertex, to_vertex = lane
-            if from_vertex in self.vertex_positions and to_vertex in self.vertex_positions:
-                from_x, from_y = self.vertex_positions[from_vertex]
-                to_x, to_y = self.vertex_positions[to_vertex]
-                
-                # Calculate angle for arrow head
-                angle = math.atan2(to_y - from_y, to_x - from_x)
-                
-                # Calculate endpoint adjusted for vertex radius
-                end_x = to_x - self.vertex_radius * math.cos(angle)
-                end_y = to_y - self.vertex_radius * math.sin(angle)
-                
-                # Calculate start point adjusted for vertex radius
-                start_x = from_x + self.vertex_radius * math.cos(angle)
-                start_y = from_y + self.vertex_radius * math.sin(angle)
-                
-                # Draw lane
-                lane_id = f"{from_vertex}->{to_vertex}"
-                lane_element = self.canvas.create_line(
-                    start_x, start_y, end_x, end_y,
-                    arrow=tk.LAST, width=2, fill="gray"
-                )
-                self.lane_elements[lane_id] = lane_element
-        
-        # Draw vertices
-        vertices = self.nav_graph.get_all_vertices()
-        for vertex in vertices:
-            index, _, _, attributes = vertex
-            if index in self.vertex_positions:
-                x, y = self.vertex_positions[index]
-                
-                # Determine vertex color based on attributes
-                color = "#3498db"  # Default blue
-                if attributes.get("is_charger", False):
-                    color = "#2ecc71"  # Green for chargers
-                
-                # Draw vertex
-                vertex_element = self.canvas.create_oval(
-                    x - self.vertex_radius, y - self.vertex_radius,
-                    x + self.vertex_radius, y + self.vertex_radius,
-                    fill=color, outline="black", width=2
-                )
-                self.vertex_elements[index] = vertex_element
-                
-                # Add vertex name label
-                name = attributes.get("name", f"V{index}")
-                if name:
-                    label_element = self.canvas.create_text(
-                        x, y - self.vertex_radius - 10,
-                        text=name, font=("Arial", 10, "bold")
-                    )
-                    self.label_elements[f"name_{index}"] = label_element
-    
-    def draw_robots(self) -> None:
-        """Draw all robots on the canvas."""
-        # Clear existing robot elements
-        for element_id in self.robot_elements.values():
-            self.canvas.delete(element_id)
-        self.robot_elements = {}
-        
-        # Get current robot positions and statuses
-        robot_positions = self.fleet_manager.get_robot_positions()
-        robot_statuses = self.fleet_manager.get_robot_statuses()
-        all_robots = self.fleet_manager.get_all_robots()
-        
-        # Draw each robot
-        for robot_id, position in robot_positions.items():
-            from_vertex, to_vertex, progress = position
-            status = robot_statuses.get(robot_id)
-            robot = all_robots.get(robot_id)
-            
-            if not robot:
-                continue
-                
-            # Calculate robot position
-            if status == RobotStatus.MOVING:
-                # Interpolate position along the lane
-                if from_vertex in self.vertex_positions and to_vertex in self.vertex_positions:
-                    from_x, from_y = self.vertex_positions[from_vertex]
-                    to_x, to_y = self.vertex_positions[to_vertex]
-                    
-                    # Adjust for vertex radius
-                    angle = math.atan2(to_y - from_y, to_x - from_x)
-                    start_x = from_x + self.vertex_radius * math.cos(angle)
-                    start_y = from_y + self.vertex_radius * math.sin(angle)
-                    end_x = to_x - self.vertex_radius * math.cos(angle)
-                    end_y = to_y - self.vertex_radius * math.sin(angle)
-                    
-                    x = start_x + progress * (end_x - start_x)
-                    y = start_y + progress * (end_y - start_y)
-                else:
-                    continue
-            else:
-                # Robot is at a vertex
-                if from_vertex in self.vertex_positions:
-                    x, y = self.vertex_positions[from_vertex]
-                else:
-                    continue
-            
-            # Determine robot color based on status
-            color = robot.color
-            outline_color = "black"
-            
-            if status == RobotStatus.WAITING:
-                outline_color = "red"
-            elif status == RobotStatus.TASK_COMPLETE:
-                outline_color = "green"
-            
-            # Determine if this robot is selected
-            width = 2
-            if robot_id == self.selected_robot:
-                width = 4
-                
-            # Draw robot
-            robot_element = self.canvas.create_oval(
-                x - self.robot_radius, y - self.robot_radius,
-                x + self.robot_radius, y + self.robot_radius,
-                fill=color, outline=outline_color, width=width
-            )
-            
-            # Add robot ID label
-            label_element = self.canvas.create_text(
-                x, y, text=robot_id.split("_")[1], 
-                font=("Arial", 8, "bold"), fill="white"
-            )
-            
-            # Store elements
-            self.robot_elements[robot_id] = (robot_element, label_element)
-            
-            # Add status indicator for waiting robots
-            if status == RobotStatus.WAITING:
-                wait_element = self.canvas.create_text(
-                    x, y + self.robot_radius + 10,
-                    text="WAIT", font=("Arial", 8), fill="red"
-                )
-                self.robot_elements[f"{robot_id}_wait"] = wait_element
-    
-    def on_canvas_click(self, event) -> None:
-        """
-        Handle click events on the canvas.
-        
-        Args:
-            event: Tkinter event object.
-        """
-        x, y = event.x, event.y
-        vertex_index = self.screen_to_vertex_index(x, y)
-        
-        if vertex_index is not None:
-            # If no robot is selected, spawn a new robot or select an existing one
-            if self.selected_robot is None:
-                # Check if there's a robot at this vertex to select
-                robot_id = self.fleet_manager.select_robot(vertex_index)
-                
-                if robot_id:
-                    # Selected a robot
-                    self.selected_robot = robot_id
-                    self.update_status(f"Selected {robot_id}. Click on a destination.")
-                else:
-                    # Spawn a new robot
-                    robot_id = self.fleet_manager.spawn_robot(vertex_index)
-                    self.update_status(f"Spawned {robot_id}. Click on it to select.")
-            else:
-                # A robot is already selected, so assign a task to it
-                success = self.fleet_manager.assign_task(self.selected_robot, vertex_index)
-                
-                if success:
-                    self.update_status(
-                        f"Assigned {self.selected_robot} to navigate to vertex {vertex_index}."
-                    )
-                else:
-                    self.update_status(
-                        f"Cannot assign task to {self.selected_robot}. Path may be blocked."
-                    )
-                
-                # Deselect the robot
-                self.selected_robot = None
-                self.fleet_manager.selected_robot = None
-        else:
-            # Click was not on a vertex, deselect robot
-            self.selected_robot = None
-            self.fleet_manager.selected_robot = None
-            self.update_status("Ready")
-    
-    def update_display(self) -> None:
-        """Update the display and schedule the next update."""
-        # Update all robots
-        self.fleet_manager.update_robots()
-        
-        # Draw the robots
-        self.draw_robots()
-        
-        # Update logs
-        self.update_logs()
-        
-        # Schedule next update (30 FPS)
-        self.root.after(33, self.update_display)
-    
-    def update_status(self, message: str) -> None:
-        """
-        Update the status message.
-        
-        Args:
-            message: Status message to display.
-        """
-        self.status_label.config(text=message)
-    
-    def update_logs(self) -> None:
-        """Update the log text area with the latest logs."""
-        try:
-            with open(self.fleet_manager.log_file, 'r') as f:
-                logs = f.readlines()
-                
-                # Show only the last 10 log entries
-                recent_logs = logs[-10:]
-                
-                log_text = "".join(recent_logs)
-                
-                # Update log text
-                self.log_text.delete(1.0, tk.END)
-                self.log_text.insert(tk.END, log_text)
-                self.log_text.see(tk.END)  # Scroll to the end
-        except FileNotFoundError:
-            pass
-    
-    def show_notification(self, message: str) -> None:
-        """
-        Show a popup notification.
-        
-        Args:
-            message: Message to display.
-        """
+import os
+import tkinter as tk
+from tkinter import messagebox, Canvas, Frame, Label, scrolledtext
+import math
+import time
+from typing import Dict, List, Tuple, Optional, Callable
+
+import numpy as np
+
+from models.nav_graph import NavGraph
+from models.robot import TASK_COMPLETE, WAITING, Robot, RobotStatus
+from controllers.fleet_manager import FleetManager
+from controllers.traffic_manager import TrafficManager
+from controllers.simulator import Simulator
+from utils.metrics import Metrics, timed
+from utils.spatial_index import GridIndex
+
+class FleetGUI:
+    """
+    GUI for the Fleet Management System.
+    Visualizes the navigation graph, robots, and allows user interaction.
+    """
+    # Levels of detail, chosen from how long a typical lane is on screen
+    DETAIL_DOTS = 0  # Vertices and robots as dots, no labels or arrows
+    DETAIL_SHAPES = 1  # Full shapes without vertex labels
+    DETAIL_FULL = 2
+    DOTS_BELOW = 25  # Typical lane length in pixels below which everything is a dot
+    LABELS_ABOVE = 60  # Typical lane length in pixels above which vertex labels are drawn
+    MIN_ZOOM = 0.05  # Zoom limits relative to fitting the whole graph
+    MAX_ZOOM = 40.0
+    OVERLAY_REFRESH_FRAMES = 15  # Frames between metrics overlay refreshes
+    
+    def __init__(self, root: tk.Tk, nav_graph: NavGraph, fleet_manager: FleetManager,
+                 simulator: Optional[Simulator] = None):
+        """
+        Initialize the Fleet GUI.
+        
+        Args:
+            root: Tkinter root window.
+            nav_graph: NavGraph instance representing the environment.
+            fleet_manager: FleetManager instance managing the robot fleet.
+            simulator: Simulator driving the fleet; defaults to a real-time
+                simulator with the standard timestep.
+        """
+        self.root = root
+        self.root.title("Fleet Management System")
+        self.nav_graph = nav_graph
+        self.fleet_manager = fleet_manager
+        self.simulator = simulator or Simulator(fleet_manager, realtime=True)
+        
+        self.canvas_width = 800
+        self.canvas_height = 600
+        self.vertex_radius = 15
+        self.robot_radius = 10
+        
+        # Store screen coordinates mapped from vertex coordinates
+        self.vertex_positions = {}
+        self.vertex_grid = GridIndex(self.vertex_radius * 1.5)  # Screen positions for hit-testing
+        self.vertex_draw_radius = self.vertex_radius
+        self.robot_draw_radius = self.robot_radius
+        
+        # Screen geometry of each lane, indexed by lane ID: trimmed start and
+        # end points and unit direction, plus end minus start for interpolation
+        self.lane_geometry = np.empty((0, 6))
+        self.lane_deltas = np.empty((0, 2))
+        self.lane_geometry_version = None
+        
+        # For scaling and translating vertex coordinates to screen coordinates
+        self.scale_factor = 1
+        self.offset_x = 0
+        self.offset_y = 0
+        self.fit_scale = 1
+        self.typical_lane_length = 1.0
+        self.detail_level = self.DETAIL_FULL
+        self.view_dirty = False  # Set by zoom and pan; the graph is redrawn on the next frame
+        self.pan_anchor = None  # Last pointer position while dragging the view
+        
+        # For tracking selected vertex and robot
+        self.selected_vertex = None
+        self.selected_robot = None
+        
+        # GUI elements
+        self.canvas = None
+        self.log_text = None
+        self.status_label = None
+        self.max_log_lines = 200  # Lines kept in the log text area
+        self.next_log_sequence = 0  # First event log entry not shown yet
+        
+        # For tracking canvas elements
+        self.vertex_elements = {}
+        self.lane_elements = {}
+        self.robot_elements = {}  # Robot ID -> (oval, ID label, WAIT text)
+        self.robot_render_state = {}  # Robot ID -> (x, y, outline, width, waiting, visible, detail) last drawn
+        self.label_elements = {}
+        
+        # Metrics overlay, toggled with F2; the sampling profiler is toggled with F3
+        self.overlay_element = None
+        self.overlay_visible = False
+        self.owns_metrics = False  # True if the overlay attached the fleet manager's metrics
+        self.frames_since_overlay = 0
+        
+        # Initialize the GUI
+        self.setup_gui()
+        self.calculate_layout()
+        self.draw_navigation_graph()
+        
+        # Start the update loop
+        self.update_display()
+    
+    def setup_gui(self) -> None:
+        """Set up the main GUI layout."""
+        # Main frame
+        main_frame = Frame(self.root)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Top frame for canvas
+        canvas_frame = Frame(main_frame)
+        canvas_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        # Canvas for visualization
+        self.canvas = Canvas(canvas_frame, width=self.canvas_width, height=self.canvas_height, 
+                            bg="white", borderwidth=2, relief="sunken")
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        
+        # Add mouse event bindings
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-3>", self.on_pan_start)
+        self.canvas.bind("<B3-Motion>", self.on_pan_drag)
+        self.canvas.bind("<Double-Button-3>", self.reset_view)
+        self.root.bind("<F2>", self.toggle_metrics_overlay)
+        self.root.bind("<F3>", self.toggle_profiler)
+        
+        # Bottom frame for logs and status
+        bottom_frame = Frame(main_frame)
+        bottom_frame.pack(fill=tk.X, pady=5)
+        
+        # Status label
+        self.status_label = Label(bottom_frame, text="Ready", anchor="w", padx=5)
+        self.status_label.pack(fill=tk.X, side=tk.TOP)
+        
+        # Log text area
+        log_frame = Frame(bottom_frame)
+        log_frame.pack(fill=tk.BOTH, expand=True)
+        
+        log_label = Label(log_frame, text="Event Log:")
+        log_label.pack(anchor="w")
+        
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=10)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
+        
+        # Instructions label
+        instructions = (
+            "Click on any location to spawn a robot.\n"
+            "Click on a robot to select it, then click on a destination to assign a task.\n"
+            "Scroll to zoom, drag with the right mouse button to pan, double right-click to reset the view.\n"
+            "Press F2 to show timing metrics and F3 to start or stop the sampling profiler."
+        )
+        instructions_label = Label(main_frame, text=instructions, justify=tk.LEFT)
+        instructions_label.pack(anchor="w", pady=5)
+    
+    def calculate_layout(self) -> None:
+        """Calculate the layout by scaling vertex coordinates to fit the canvas."""
+        vertices = self.nav_graph.get_all_vertices()
+        
+        if not vertices:
+            return
+            
+        # Find the min/max coordinates
+        min_x = min(vertex[1] for vertex in vertices)
+        max_x = max(vertex[1] for vertex in vertices)
+        min_y = min(vertex[2] for vertex in vertices)
+        max_y = max(vertex[2] for vertex in vertices)
+        
+        # Add some padding
+        padding = 50
+        
+        # Calculate scale factors for x and y dimensions
+        width_scale = (self.canvas_width - 2 * padding) / (max_x - min_x if max_x > min_x else 1)
+        height_scale = (self.canvas_height - 2 * padding) / (max_y - min_y if max_y > min_y else 1)
+        
+        # Use the smaller scale factor to maintain aspect ratio
+        self.scale_factor = min(width_scale, height_scale)
+        self.fit_scale = self.scale_factor
+        
+        # Calculate offsets to center the graph
+        self.offset_x = padding - min_x * self.scale_factor
+        self.offset_y = padding - min_y * self.scale_factor
+        
+        # Typical lane length in graph units, used for level-of-detail decisions
+        lane_lengths = [
+            math.hypot(vertices[to_vertex][1] - vertices[from_vertex][1],
+                       vertices[to_vertex][2] - vertices[from_vertex][2])
+            for from_vertex, to_vertex in self.nav_graph.get_all_lanes()
+        ]
+        self.typical_lane_length = float(np.median(lane_lengths)) if lane_lengths else 1.0
+        
+        self.update_view()
+    
+    def update_view(self) -> None:
+        """
+        Recompute everything that depends on the current zoom and pan: the
+        level of detail, vertex screen positions, the hit-testing grid and the
+        lane geometry.
+        """
+        screen_lane_length = self.typical_lane_length * self.scale_factor
+        if screen_lane_length < self.DOTS_BELOW:
+            self.detail_level = self.DETAIL_DOTS
+        elif screen_lane_length < self.LABELS_ABOVE:
+            self.detail_level = self.DETAIL_SHAPES
+        else:
+            self.detail_level = self.DETAIL_FULL
+        self.vertex_draw_radius = self.vertex_radius if self.detail_level != self.DETAIL_DOTS else 3
+        self.robot_draw_radius = self.robot_radius if self.detail_level != self.DETAIL_DOTS else 4
+        
+        # Store the screen positions of each vertex
+        self.vertex_positions = {}
+        self.vertex_grid = GridIndex(self.get_hit_radius())
+        for vertex in self.nav_graph.get_all_vertices():
+            index, x, y, _ = vertex
+            screen_x, screen_y = self.vertex_to_screen(x, y)
+            self.vertex_positions[index] = (screen_x, screen_y)
+            self.vertex_grid.insert(index, screen_x, screen_y)
+        
+        self.build_lane_geometry()
+        self.view_dirty = False
+    
+    def get_hit_radius(self) -> float:
+        """
+        Get how close a click must be to a vertex to hit it.
+        
+        Returns:
+            Distance in pixels.
+        """
+        return max(self.vertex_draw_radius * 1.5, 8)
+    
+    def get_viewport(self) -> Tuple[float, float, float, float]:
+        """
+        Get the visible region of the canvas.
+        
+        Returns:
+            Tuple of (min_x, min_y, max_x, max_y) in screen coordinates.
+        """
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # Not mapped yet; use the requested size
+            width, height = self.canvas_width, self.canvas_height
+        return (0, 0, width, height)
+    
+    def zoom(self, factor: float, screen_x: float, screen_y: float) -> None:
+        """
+        Zoom the view around a screen point.
+        
+        Args:
+            factor: Scale multiplier; above 1 zooms in.
+            screen_x: Screen x-coordinate that stays in place.
+            screen_y: Screen y-coordinate that stays in place.
+        """
+        new_scale = min(max(self.scale_factor * factor, self.fit_scale * self.MIN_ZOOM),
+                        self.fit_scale * self.MAX_ZOOM)
+        factor = new_scale / self.scale_factor
+        self.scale_factor = new_scale
+        self.offset_x = screen_x - (screen_x - self.offset_x) * factor
+        self.offset_y = screen_y - (screen_y - self.offset_y) * factor
+        self.view_dirty = True
+    
+    def pan(self, delta_x: float, delta_y: float) -> None:
+        """
+        Move the view.
+        
+        Args:
+            delta_x: Pixels to move the graph right.
+            delta_y: Pixels to move the graph down.
+        """
+        self.offset_x += delta_x
+        self.offset_y += delta_y
+        self.view_dirty = True
+    
+    def on_mouse_wheel(self, event) -> None:
+        """
+        Zoom with the mouse wheel around the cursor.
+        
+        Args:
+            event: Tkinter event object.
+        """
+        zoom_in = event.num == 4 or event.delta > 0
+        self.zoom(1.2 if zoom_in else 1 / 1.2, event.x, event.y)
+    
+    def on_pan_start(self, event) -> None:
+        """
+        Start dragging the view.
+        
+        Args:
+            event: Tkinter event object.
+        """
+        self.pan_anchor = (event.x, event.y)
+    
+    def on_pan_drag(self, event) -> None:
+        """
+        Drag the view.
+        
+        Args:
+            event: Tkinter event object.
+        """
+        if self.pan_anchor is None:
+            return
+        self.pan(event.x - self.pan_anchor[0], event.y - self.pan_anchor[1])
+        self.pan_anchor = (event.x, event.y)
+    
+    def reset_view(self, event=None) -> None:
+        """
+        Fit the whole graph on the canvas again.
+        
+        Args:
+            event: Tkinter event object, if called from a binding.
+        """
+        self.calculate_layout()
+        self.draw_navigation_graph()
+    
+    def build_lane_geometry(self) -> None:
+        """
+        Precompute the screen geometry of every lane, trimmed by the vertex
+        radius at both ends. Lanes whose vertices have no screen position get NaN.
+        """
+        num_lanes = len(self.nav_graph.lanes)
+        geometry = np.full((num_lanes, 6), np.nan)
+        radius = self.vertex_draw_radius
+        for lane_id in range(num_lanes):
+            from_vertex, to_vertex = self.nav_graph.get_lane_endpoints(lane_id)
+            if from_vertex not in self.vertex_positions or to_vertex not in self.vertex_positions:
+                continue
+            from_x, from_y = self.vertex_positions[from_vertex]
+            to_x, to_y = self.vertex_positions[to_vertex]
+            length = math.hypot(to_x - from_x, to_y - from_y)
+            dir_x, dir_y = ((to_x - from_x) / length, (to_y - from_y) / length) if length > 0 else (0.0, 0.0)
+            geometry[lane_id] = (
+                from_x + radius * dir_x, from_y + radius * dir_y,
+                to_x - radius * dir_x, to_y - radius * dir_y,
+                dir_x, dir_y
+            )
+        self.lane_geometry = geometry
+        self.lane_deltas = geometry[:, 2:4] - geometry[:, 0:2]
+        self.lane_geometry_version = self.nav_graph.version
+    
+    def vertex_to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Convert vertex coordinates to screen coordinates.
+        
+        Args:
+            x: Vertex x-coordinate.
+            y: Vertex y-coordinate.
+            
+        Returns:
+            Tuple of (screen_x, screen_y).
+        """
+        screen_x = x * self.scale_factor + self.offset_x
+        screen_y = y * self.scale_factor + self.offset_y
+        return screen_x, screen_y
+    
+    def screen_to_vertex_index(self, screen_x: float, screen_y: float) -> Optional[int]:
+        """
+        Find the vertex nearest to the given screen coordinates.
+        
+        Args:
+            screen_x: Screen x-coordinate.
+            screen_y: Screen y-coordinate.
+            
+        Returns:
+            Index of the nearest vertex, or None if no vertex is close enough.
+        """
+        return self.vertex_grid.nearest(screen_x, screen_y, self.get_hit_radius())
+    
+    @timed("draw_graph")
+    def draw_navigation_graph(self) -> None:
+        """
+        Draw the part of the navigation graph inside the viewport.
+        Vertex labels are left out when zoomed out, and vertices become dots
+        without lane arrows when zoomed out further.
+        """
+        # Clear existing elements
+        for element_id in self.lane_elements.values():
+            self.canvas.delete(element_id)
+        for element_id in self.vertex_elements.values():
+            self.canvas.delete(element_id)
+        for element_id in self.label_elements.values():
+            self.canvas.delete(element_id)
+            
+        self.lane_elements = {}
+        self.vertex_elements = {}
+        self.label_elements = {}
+        
+        if self.lane_geometry_version != self.nav_graph.version:
+            self.build_lane_geometry()
+        min_x, min_y, max_x, max_y = self.get_viewport()
+        dots = self.detail_level == self.DETAIL_DOTS
+        
+        # Draw lanes first (so they're underneath vertices), skipping those
+        # whose bounding box misses the viewport
+        geometry = self.lane_geometry
+        with np.errstate(invalid='ignore'):
+            visible = (
+                (np.minimum(geometry[:, 0], geometry[:, 2]) <= max_x) &
+                (np.maximum(geometry[:, 0], geometry[:, 2]) >= min_x) &
+                (np.minimum(geometry[:, 1], geometry[:, 3]) <= max_y) &
+                (np.maximum(geometry[:, 1], geometry[:, 3]) >= min_y)
+            )
+        lanes = self.nav_graph.lanes
+        for lane_id in np.flatnonzero(visible).tolist():
+            from_vertex, to_vertex = lanes[lane_id][0], lanes[lane_id][1]
+            start_x, start_y, end_x, end_y = geometry[lane_id, :4].tolist()
+                
+            # Draw lane
+            lane_key = f"{from_vertex}->{to_vertex}"
+            lane_element = self.canvas.create_line(
+                start_x, start_y, end_x, end_y,
+                arrow=tk.NONE if dots else tk.LAST, width=1 if dots else 2, fill="gray"
+            )
+            self.lane_elements[lane_key] = lane_element
+        
+        # Draw vertices
+        radius = self.vertex_draw_radius
+        vertices = self.nav_graph.get_all_vertices()
+        for vertex in vertices:
+            index, _, _, attributes = vertex
+            if index not in self.vertex_positions:
+                continue
+            x, y = self.vertex_positions[index]
+            if not (min_x - radius <= x <= max_x + radius and min_y - radius <= y <= max_y + radius):
+                continue
+                
+            # Determine vertex color based on attributes
+            color = "#3498db"  # Default blue
+            if attributes.get("is_charger", False):
+                color = "#2ecc71"  # Green for chargers
+            
+            # Draw vertex
+            vertex_element = self.canvas.create_oval(
+                x - radius, y - radius, x + radius, y + radius,
+                fill=color, outline="" if dots else "black", width=2
+            )
+            self.vertex_elements[index] = vertex_element
+            
+            # Add vertex name label
+            name = attributes.get("name", f"V{index}")
+            if name and self.detail_level == self.DETAIL_FULL:
+                label_element = self.canvas.create_text(
+                    x, y - radius - 10,
+                    text=name, font=("Arial", 10, "bold")
+                )
+                self.label_elements[f"name_{index}"] = label_element
+        
+        # Keep robots above the redrawn graph
+        self.canvas.tag_raise("robot")
+        self.canvas.tag_raise("overlay")
+    
+    def get_robot_screen_positions(self, robot_positions: Dict[str, Tuple[int, int, float]]
+                                   ) -> Dict[str, Tuple[float, float]]:
+        """
+        Get the screen positions of many robots at once. Positions along lanes
+        are interpolated in one batched NumPy operation over all moving robots.
+        
+        Args:
+            robot_positions: Dictionary mapping robot IDs to (from_vertex, to_vertex, progress).
+            
+        Returns:
+            Dictionary mapping robot IDs to (screen_x, screen_y), rounded to a
+            tenth of a pixel; robots without a screen position are left out.
+        """
+        if self.lane_geometry_version != self.nav_graph.version:
+            self.build_lane_geometry()
+        
+        screen_positions = {}
+        moving_ids, moving_lanes, moving_progress = [], [], []
+        for robot_id, (from_vertex, to_vertex, progress) in robot_positions.items():
+            if from_vertex == to_vertex:
+                # Robot is at a vertex
+                position = self.vertex_positions.get(from_vertex)
+                if position is not None:
+                    screen_positions[robot_id] = (round(position[0], 1), round(position[1], 1))
+                continue
+            lane_id = self.nav_graph.get_lane_id(from_vertex, to_vertex)
+            if lane_id is not None:
+                moving_ids.append(robot_id)
+                moving_lanes.append(lane_id)
+                moving_progress.append(progress)
+        
+        if moving_ids:
+            lanes = np.array(moving_lanes)
+            points = self.lane_geometry[lanes, :2] + np.array(moving_progress)[:, None] * self.lane_deltas[lanes]
+            for robot_id, (x, y) in zip(moving_ids, np.round(points, 1).tolist()):
+                if not math.isnan(x):
+                    screen_positions[robot_id] = (x, y)
+        return screen_positions
+    
+    @timed("draw_robots")
+    def draw_robots(self) -> None:
+        """
+        Draw all robots inside the viewport.
+        Each robot's canvas items are created once, when it is first visible,
+        and afterwards only moved, restyled or hidden when its position,
+        status, selection or visibility changed. Zoomed out, robots are
+        drawn as dots without labels.
+        """
+        # Get current robot positions and statuses
+        robot_positions = self.fleet_manager.get_robot_positions()
+        all_robots = self.fleet_manager.get_all_robots()
+        
+        # Remove the items of robots that no longer exist
+        for robot_id in [robot_id for robot_id in self.robot_elements if robot_id not in all_robots]:
+            for element_id in self.robot_elements.pop(robot_id):
+                self.canvas.delete(element_id)
+            self.robot_render_state.pop(robot_id, None)
+        
+        min_x, min_y, max_x, max_y = self.get_viewport()
+        radius = self.robot_draw_radius
+        detail = self.detail_level
+        for robot_id, (x, y) in self.get_robot_screen_positions(robot_positions).items():
+            visible = min_x - radius <= x <= max_x + radius and min_y - radius <= y <= max_y + radius
+            previous = self.robot_render_state.get(robot_id)
+            if not visible:
+                # Hide robots that left the viewport; never create items for off-screen ones
+                if previous is not None and previous[5]:
+                    for element_id in self.robot_elements[robot_id]:
+                        self.canvas.itemconfig(element_id, state=tk.HIDDEN)
+                    self.robot_render_state[robot_id] = previous[:5] + (False, previous[6])
+                continue
+            
+            robot = all_robots[robot_id]
+            status = robot.status_code
+            
+            # Determine robot outline based on status and selection
+            outline_color = "black"
+            if status == WAITING:
+                outline_color = "red"
+            elif status == TASK_COMPLETE:
+                outline_color = "green"
+            width = 4 if robot_id == self.selected_robot else 2
+            if detail == self.DETAIL_DOTS:
+                width = 2 if robot_id == self.selected_robot else 0
+            waiting = status == WAITING
+            
+            render_state = (x, y, outline_color, width, waiting, True, detail)
+            if previous == render_state:
+                continue
+            self.robot_render_state[robot_id] = render_state
+            
+            label_state = tk.NORMAL if detail != self.DETAIL_DOTS else tk.HIDDEN
+            wait_state = tk.NORMAL if waiting and detail != self.DETAIL_DOTS else tk.HIDDEN
+            if previous is None:
+                # Draw robot, its ID label and the status indicator shown while waiting
+                robot_element = self.canvas.create_oval(
+                    x - radius, y - radius, x + radius, y + radius,
+                    fill=robot.color, outline=outline_color, width=width, tags="robot"
+                )
+                label_element = self.canvas.create_text(
+                    x, y, text=robot_id.split("_")[1],
+                    font=("Arial", 8, "bold"), fill="white", state=label_state, tags="robot"
+                )
+                wait_element = self.canvas.create_text(
+                    x, y + radius + 10,
+                    text="WAIT", font=("Arial", 8), fill="red", state=wait_state, tags="robot"
+                )
+                self.robot_elements[robot_id] = (robot_element, label_element, wait_element)
+                continue
+            
+            robot_element, label_element, wait_element = self.robot_elements[robot_id]
+            if previous[:2] != (x, y) or previous[6] != detail:
+                self.canvas.coords(robot_element, x - radius, y - radius, x + radius, y + radius)
+                self.canvas.coords(label_element, x, y)
+                self.canvas.coords(wait_element, x, y + radius + 10)
+            if previous[2:4] != (outline_color, width):
+                self.canvas.itemconfig(robot_element, outline=outline_color, width=width)
+            if not previous[5]:
+                self.canvas.itemconfig(robot_element, state=tk.NORMAL)
+            if not previous[5] or previous[6] != detail:
+                self.canvas.itemconfig(label_element, state=label_state)
+            if not previous[5] or previous[6] != detail or previous[4] != waiting:
+                self.canvas.itemconfig(wait_element, state=wait_state)
+    
+    def on_canvas_click(self, event) -> None:
+        """
+        Handle click events on the canvas.
+        
+        Args:
+            event: Tkinter event object.
+        """
+        x, y = event.x, event.y
+        vertex_index = self.screen_to_vertex_index(x, y)
+        
+        if vertex_index is not None:
+            # If no robot is selected, spawn a new robot or select an existing one
+            if self.selected_robot is None:
+                # Check if there's a robot at this vertex to select
+                robot_id = self.fleet_manager.select_robot(vertex_index)
+                
+                if robot_id:
+                    # Selected a robot
+                    self.selected_robot = robot_id
+                    self.update_status(f"Selected {robot_id}. Click on a destination.")
+                else:
+                    # Spawn a new robot
+                    robot_id = self.fleet_manager.spawn_robot(vertex_index)
+                    self.update_status(f"Spawned {robot_id}. Click on it to select.")
+            else:
+                # A robot is already selected, so assign a task to it; the route
+                # is planned off the Tk thread and the task starts on a later tick
+                robot_id = self.selected_robot
+                self.update_status(f"Planning a route for {robot_id} to vertex {vertex_index}...")
+                future = self.fleet_manager.assign_task_async(robot_id, vertex_index)
+                future.add_done_callback(
+                    lambda future: self.on_task_assigned(robot_id, vertex_index,
+                                                         future.exception() is None and future.result())
+                )
+                
+                # Deselect the robot
+                self.selected_robot = None
+                self.fleet_manager.selected_robot = None
+        else:
+            # Click was not on a vertex, deselect robot
+            self.selected_robot = None
+            self.fleet_manager.selected_robot = None
+            self.update_status("Ready")
+    
+    def on_task_assigned(self, robot_id: str, vertex_index: int, success: bool) -> None:
+        """
+        Report the outcome of a task assigned by clicking. Called on the Tk
+        thread, which runs the simulation ticks that commit tasks.
+        
+        Args:
+            robot_id: ID of the robot.
+            vertex_index: Destination vertex index.
+            success: True if the task was assigned.
+        """
+        if success:
+            self.update_status(f"Assigned {robot_id} to navigate to vertex {vertex_index}.")
+        else:
+            self.update_status(f"Cannot assign task to {robot_id}. Path may be blocked.")
+    
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        """Metrics of the fleet manager, which drawing timings are recorded to."""
+        return self.fleet_manager.metrics
+    
+    def toggle_metrics_overlay(self, event=None) -> None:
+        """
+        Show or hide the metrics overlay. Showing it starts recording metrics
+        if the fleet manager is not recording already; hiding it stops
+        recording again if it was started here.
+        
+        Args:
+            event: Key event, unused.
+        """
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            if self.fleet_manager.metrics is None:
+                self.fleet_manager.set_metrics(Metrics())
+                self.owns_metrics = True
+            self.frames_since_overlay = self.OVERLAY_REFRESH_FRAMES
+            return
+        
+        if self.owns_metrics:
+            self.fleet_manager.metrics.stop_profiler()
+            self.fleet_manager.set_metrics(None)
+            self.owns_metrics = False
+        if self.overlay_element is not None:
+            self.canvas.delete(self.overlay_element)
+            self.overlay_element = None
+    
+    def toggle_profiler(self, event=None) -> None:
+        """
+        Start or stop the sampling profiler, showing the metrics overlay if needed.
+        
+        Args:
+            event: Key event, unused.
+        """
+        if not self.overlay_visible:
+            self.toggle_metrics_overlay()
+        running = self.fleet_manager.metrics.toggle_profiler()
+        self.update_status(f"Sampling profiler {'started' if running else 'stopped'}")
+    
+    def draw_metrics_overlay(self) -> None:
+        """Refresh the metrics overlay text every OVERLAY_REFRESH_FRAMES frames."""
+        self.frames_since_overlay += 1
+        if self.frames_since_overlay < self.OVERLAY_REFRESH_FRAMES:
+            return
+        self.frames_since_overlay = 0
+        
+        lines = self.fleet_manager.metrics.format_summary()
+        text = "\n".join(lines) if lines else "Collecting metrics..."
+        if self.overlay_element is None:
+            self.overlay_element = self.canvas.create_text(
+                10, 10, text=text, anchor="nw", font=("Courier", 9), fill="#202060", tags="overlay"
+            )
+        else:
+            self.canvas.itemconfig(self.overlay_element, text=text)
+        self.canvas.tag_raise("overlay")
+    
+    @timed("frame")
+    def update_display(self) -> None:
+        """Update the display and schedule the next update."""
+        # Advance the simulation by the wall-clock time since the last frame
+        self.simulator.advance_realtime()
+        
+        # Redraw the graph once per frame after zooming or panning
+        if self.view_dirty:
+            self.update_view()
+            self.draw_navigation_graph()
+        
+        # Draw the robots
+        self.draw_robots()
+        
+        # Update logs
+        self.update_logs()
+        
+        if self.overlay_visible:
+            self.draw_metrics_overlay()
+        
+        # Schedule next update (30 FPS)
+        self.root.after(33, self.update_display)
+    
+    def update_status(self, message: str) -> None:
+        """
+        Update the status message.
+        
+        Args:
+            message: Status message to display.
+        """
+        self.status_label.config(text=message)
+    
+    @timed("update_logs")
+    def update_logs(self) -> None:
+        """Append the events logged since the last update to the log text area."""
+        event_log = self.fleet_manager.event_log
+        # Entries that would be trimmed right away are not formatted at all
+        first_sequence = max(self.next_log_sequence, event_log.next_sequence - self.max_log_lines)
+        entries = event_log.get_since(first_sequence)
+        if not entries:
+            return
+        self.next_log_sequence = entries[-1][0] + 1
+        
+        log_text = "".join(line + "\n" for _, line in entries)
+        self.log_text.insert(tk.END, log_text)
+        
+        # Drop the oldest lines beyond the limit
+        line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if line_count > self.max_log_lines:
+            self.log_text.delete("1.0", f"{line_count - self.max_log_lines + 1}.0")
+        self.log_text.see(tk.END)  # Scroll to the end
+    
+    def show_notification(self, message: str) -> None:
+        """
+        Show a popup notification.
+        
+        Args:
+            message: Message to display.
+        """
         messagebox.showinfo("Notification", message)
\ No newline at end of file
@@ -0,0 +1,581 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import logging
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Compiled graphs are cached next to the JSON file they were compiled from
+CACHE_SUFFIX = ".graphcache"
+MAGIC = b"NAVGRAPH"
+FORMAT_VERSION = 3
+ALIGNMENT = 64  # Arrays start at multiples of this many bytes
+
+# Array name -> (memoryview format, NumPy dtype)
+ARRAY_FORMATS = {
+    "vertex_x": ("d", np.float64),  # Coordinates of each vertex
+    "vertex_y": ("d", np.float64),
+    "vertex_attributes": ("i", np.int32),  # Index into the vertex attribute table
+    "vertex_named": ("B", np.uint8),  # 1 if the vertex has a name attribute
+    "name_offsets": ("q", np.int64),  # Byte offsets of each vertex name in the name text
+    "name_text": ("B", np.uint8),  # UTF-8 text of all vertex names, concatenated
+    "lane_from": ("i", np.int32),  # Endpoints of each lane, indexed by lane ID
+    "lane_to": ("i", np.int32),
+    "lane_attributes": ("i", np.int32),  # Index into the lane attribute table
+    "lane_travel_times": ("d", np.float64),
+    "out_offsets": ("q", np.int64),  # CSR of outgoing lanes, in lane ID order per vertex
+    "out_targets": ("i", np.int32),
+    "out_lanes": ("i", np.int32),
+    "in_offsets": ("q", np.int64),  # CSR of incoming lanes, in lane ID order per vertex
+    "in_sources": ("i", np.int32),
+}
+
+class CompiledGraph:
+    """
+    Navigation graph compiled to flat arrays: vertex coordinates, lane
+    endpoints and travel times, CSR adjacency in both directions, a table of
+    vertex names and interned attribute tables, so that vertices or lanes
+    with equal attributes share one dictionary.
+    Arrays are memoryviews, either of NumPy arrays or of a memory-mapped
+    cache file, and indexing them gives plain Python numbers. Pages of a
+    mapped file are only read once something indexes into them.
+    """
+    def __init__(self, arrays: Dict[str, memoryview], vertex_attribute_table: List[Dict[str, Any]],
+                 lane_attribute_table: List[Dict[str, Any]], max_lane_speed: float,
+                 levels: List[Tuple[str, int]], transition_lanes: List[int], buffer: Any = None):
+        """
+        Initialize the compiled graph.
+
+        Args:
+            arrays: Memoryview of each array in ARRAY_FORMATS, by name.
+            vertex_attribute_table: Distinct vertex attribute dictionaries, without names.
+            lane_attribute_table: Distinct lane attribute dictionaries.
+            max_lane_speed: Fastest lane speed.
+            levels: (name, first vertex index) of each level, in vertex order.
+            transition_lanes: IDs of the lanes whose endpoints are on different levels.
+            buffer: Memory map the arrays point into, kept open while they are used.
+        """
+        self.arrays = arrays
+        self.vertex_attribute_table = vertex_attribute_table
+        self.lane_attribute_table = lane_attribute_table
+        self.max_lane_speed = max_lane_speed
+        self.levels = levels
+        self.transition_lanes = transition_lanes
+        self.buffer = buffer
+        self.num_vertices = len(arrays["vertex_x"])
+        self.num_lanes = len(arrays["lane_from"])
+
+    def get_vertex_name(self, vertex: int) -> Optional[str]:
+        """
+        Get the name of a vertex.
+
+        Args:
+            vertex: Vertex index.
+
+        Returns:
+            The vertex name, or None if the vertex has no name attribute.
+        """
+        if not self.arrays["vertex_named"][vertex]:
+            return None
+        offsets = self.arrays["name_offsets"]
+        return bytes(self.arrays["name_text"][offsets[vertex]:offsets[vertex + 1]]).decode("utf-8")
+
+    def get_vertex_names(self) -> List[Optional[str]]:
+        """
+        Get the name of each vertex.
+
+        Returns:
+            List of vertex names, None for vertices without a name attribute.
+        """
+        text = bytes(self.arrays["name_text"])
+        offsets = self.arrays["name_offsets"].tolist()
+        named = self.arrays["vertex_named"]
+        return [text[offsets[i]:offsets[i + 1]].decode("utf-8") if named[i] else None
+                for i in range(self.num_vertices)]
+
+def flatten_levels(data: Dict[str, Any]) -> Tuple[List[List[Any]], List[List[Any]], List[Tuple[str, int]]]:
+    """
+    Combine the levels of a graph JSON document into one vertex list and one
+    lane list. Each level's vertices get a contiguous range of indices, in
+    file order, and its lanes are renumbered to match. Transitions, given as
+    [from level, from vertex, to level, to vertex, attributes] with vertex
+    indices local to their level, are added as lanes after all level lanes.
+
+    Args:
+        data: Parsed graph JSON document.
+
+    Returns:
+        Tuple of the vertices, the lanes, and the (name, first vertex index) of each level.
+
+    Raises:
+        KeyError: If a transition names a level that does not exist.
+        IndexError: If a transition names a vertex that does not exist.
+    """
+    vertices: List[List[Any]] = []
+    lanes: List[List[Any]] = []
+    levels: List[Tuple[str, int]] = []
+    offsets: Dict[str, int] = {}
+    for name, level_data in data.get('levels', {}).items():
+        offset = len(vertices)
+        levels.append((name, offset))
+        offsets[name] = offset
+        level_vertices = level_data.get('vertices', [])
+        level_lanes = level_data.get('lanes', [])
+        if offset == 0:
+            vertices, lanes = list(level_vertices), list(level_lanes)
+            continue
+        vertices.extend(level_vertices)
+        lanes.extend([lane[0] + offset, lane[1] + offset] + list(lane[2:]) for lane in level_lanes)
+    if not levels:
+        levels.append(("level1", 0))
+
+    sizes = {name: (levels[i + 1][1] if i + 1 < len(levels) else len(vertices)) - offset
+             for i, (name, offset) in enumerate(levels)}
+    for from_level, from_vertex, to_level, to_vertex, *attributes in data.get('transitions', []):
+        for level, vertex in ((from_level, from_vertex), (to_level, to_vertex)):
+            if not 0 <= vertex < sizes[level]:
+                raise IndexError(f"Transition vertex {vertex} is not on level {level}")
+        lanes.append([offsets[from_level] + from_vertex, offsets[to_level] + to_vertex,
+                      attributes[0] if attributes else {}])
+    return vertices, lanes, levels
+
+def _intern(attributes: Dict[str, Any], table: List[Dict[str, Any]], index: Dict[Any, int]) -> int:
+    """
+    Get the position of an attribute dictionary in a table of distinct ones, adding it if new.
+
+    Args:
+        attributes: Attribute dictionary.
+        table: Distinct attribute dictionaries.
+        index: Key of each dictionary in the table -> position.
+
+    Returns:
+        Position of the dictionary in the table.
+    """
+    try:
+        # Types are part of the key so that e.g. 0 and False stay distinct
+        key = tuple((name, type(value), value) for name, value in attributes.items())
+        position = index.get(key)
+    except TypeError:
+        # Unhashable values such as lists are compared by their JSON
+        key = json.dumps(attributes, sort_keys=True)
+        position = index.get(key)
+    if position is None:
+        position = index[key] = len(table)
+        table.append(attributes)
+    return position
+
+def compile_graph(vertices: List[List[Any]], lanes: List[List[Any]], default_speed: float,
+                  levels: Optional[List[Tuple[str, int]]] = None) -> CompiledGraph:
+    """
+    Compile vertex and lane lists as found in a graph JSON file.
+    Duplicate lanes keep their lane IDs but only the first one is in the adjacency.
+
+    Args:
+        vertices: List of [x, y, attributes] vertices.
+        lanes: List of [from, to, attributes] lanes.
+        default_speed: Speed of lanes whose speed_limit is missing or 0.
+        levels: (name, first vertex index) of each level, as returned by flatten_levels.
+            Defaults to a single level.
+
+    Returns:
+        CompiledGraph backed by NumPy arrays.
+    """
+    num_vertices = len(vertices)
+    vertex_attribute_table: List[Dict[str, Any]] = []
+    vertex_attribute_index: Dict[Any, int] = {}
+    vertex_attributes = np.empty(num_vertices, np.int32)
+    vertex_named = np.zeros(num_vertices, np.uint8)
+    names = []
+    for i, vertex in enumerate(vertices):
+        attributes = dict(vertex[2]) if len(vertex) > 2 else {}
+        name = attributes.pop('name', None)
+        if name is not None:
+            vertex_named[i] = 1
+            names.append(name.encode("utf-8"))
+        else:
+            names.append(b"")
+        vertex_attributes[i] = _intern(attributes, vertex_attribute_table, vertex_attribute_index)
+    name_offsets = np.zeros(num_vertices + 1, np.int64)
+    np.cumsum([len(name) for name in names], out=name_offsets[1:])
+    coordinates = np.array([(vertex[0], vertex[1]) for vertex in vertices], np.float64).reshape(-1, 2)
+
+    num_lanes = len(lanes)
+    lane_attribute_table: List[Dict[str, Any]] = []
+    lane_attribute_index: Dict[Any, int] = {}
+    lane_attributes = np.empty(num_lanes, np.int32)
+    for lane_id, lane in enumerate(lanes):
+        lane_attributes[lane_id] = _intern(lane[2] if len(lane) > 2 else {}, lane_attribute_table,
+                                           lane_attribute_index)
+    endpoints = np.array([(lane[0], lane[1]) for lane in lanes], np.int32).reshape(-1, 2)
+    lane_from, lane_to = endpoints[:, 0], endpoints[:, 1]
+
+    # Travel time from the straight-line length and the speed limit, unless the lane
+    # has a fixed travel_time; such lanes move at their length divided by it
+    speed_limits = [attributes.get('speed_limit', 0) for attributes in lane_attribute_table]
+    speeds = np.array([limit if limit and limit > 0 else default_speed for limit in speed_limits], np.float64)
+    fixed_times = np.array([attributes.get('travel_time', 0) or 0 for attributes in lane_attribute_table],
+                           np.float64)
+    lengths = np.hypot(coordinates[lane_to, 0] - coordinates[lane_from, 0],
+                       coordinates[lane_to, 1] - coordinates[lane_from, 1])
+    if num_lanes:
+        lane_fixed_times = fixed_times[lane_attributes]
+        fixed = lane_fixed_times > 0
+        lane_travel_times = np.where(fixed, lane_fixed_times, lengths / speeds[lane_attributes])
+        lane_speeds = np.where(fixed, lengths / np.where(fixed, lane_fixed_times, 1), speeds[lane_attributes])
+        max_lane_speed = float(max(default_speed, lane_speeds.max()))
+    else:
+        lane_travel_times = np.empty(0, np.float64)
+        max_lane_speed = float(default_speed)
+
+    # Adjacency over the first lane between each pair of vertices, in lane ID order
+    _, first = np.unique(lane_from.astype(np.int64) * max(num_vertices, 1) + lane_to, return_index=True)
+    unique_lanes = np.sort(first).astype(np.int32)
+    out_order = unique_lanes[np.argsort(lane_from[unique_lanes], kind="stable")]
+    in_order = unique_lanes[np.argsort(lane_to[unique_lanes], kind="stable")]
+
+    def offsets(lane_vertices: np.ndarray) -> np.ndarray:
+        result = np.zeros(num_vertices + 1, np.int64)
+        np.cumsum(np.bincount(lane_vertices, minlength=num_vertices), out=result[1:])
+        return result
+
+    arrays = {
+        "vertex_x": coordinates[:, 0].copy(),
+        "vertex_y": coordinates[:, 1].copy(),
+        "vertex_attributes": vertex_attributes,
+        "vertex_named": vertex_named,
+        "name_offsets": name_offsets,
+        "name_text": np.frombuffer(b"".join(names), np.uint8),
+        "lane_from": lane_from.copy(),
+        "lane_to": lane_to.copy(),
+        "lane_attributes": lane_attributes,
+        "lane_travel_times": lane_travel_times,
+        "out_offsets": offsets(lane_from[unique_lanes]),
+        "out_targets": lane_to[out_order],
+        "out_lanes": out_order,
+        "in_offsets": offsets(lane_to[unique_lanes]),
+        "in_sources": lane_from[in_order],
+    }
+    # Lanes between levels, found once here so that loading never scans every lane
+    levels = levels or [("level1", 0)]
+    first_vertices = np.array([offset for _, offset in levels[1:]], np.int64)
+    from_levels = np.searchsorted(first_vertices, lane_from, side="right")
+    to_levels = np.searchsorted(first_vertices, lane_to, side="right")
+    transition_lanes = np.flatnonzero(from_levels != to_levels).tolist()
+
+    views = {}
+    for name, (fmt, dtype) in ARRAY_FORMATS.items():
+        views[name] = memoryview(np.ascontiguousarray(arrays[name], dtype)).cast("B").cast(fmt)
+    return CompiledGraph(views, vertex_attribute_table, lane_attribute_table, max_lane_speed,
+                         levels, transition_lanes)
+
+def hash_file(path: str) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        Hex digest of the file.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_compiled_graph(path: str, graph: CompiledGraph, source: Dict[str, Any]) -> None:
+    """
+    Write a compiled graph to a cache file. The file is written under a
+    temporary name and renamed, so readers never see a partial file.
+
+    Args:
+        path: Path of the cache file.
+        graph: Compiled graph.
+        source: Hash of the JSON file it was compiled from and the default speed used.
+    """
+    layout = {}
+    offset = 0
+    for name in ARRAY_FORMATS:
+        layout[name] = [offset, len(graph.arrays[name])]
+        offset += -(-graph.arrays[name].nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "source": source,
+        "arrays": layout,
+        "vertex_attribute_table": graph.vertex_attribute_table,
+        "lane_attribute_table": graph.lane_attribute_table,
+        "max_lane_speed": graph.max_lane_speed,
+        "levels": graph.levels,
+        "transition_lanes": graph.transition_lanes,
+    }).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, 'wb') as f:
+            f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+            for name in ARRAY_FORMATS:
+                f.seek(data_start + layout[name][0])
+                f.write(graph.arrays[name])
+            f.truncate(data_start + offset)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+def read_cache_header(path: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    Read the header of a cache file.
+
+    Args:
+        path: Path of the cache file.
+
+    Returns:
+        Tuple of the header and the offset its arrays start at, or None if
+        the file is missing or not a cache of this format.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_length).decode("utf-8"))
+    except (OSError, ValueError, struct.error):
+        return None
+    if header.get("format") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+        return None
+    return header, -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+
+def map_compiled_graph(path: str, header: Dict[str, Any], data_start: int) -> CompiledGraph:
+    """
+    Memory-map the arrays of a cache file.
+
+    Args:
+        path: Path of the cache file.
+        header: Header returned by read_cache_header.
+        data_start: Offset the arrays start at.
+
+    Returns:
+        CompiledGraph whose arrays point into the mapped file.
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    arrays = {}
+    for name, (fmt, dtype) in ARRAY_FORMATS.items():
+        offset, length = header["arrays"][name]
+        start = data_start + offset
+        arrays[name] = view[start:start + length * np.dtype(dtype).itemsize].cast(fmt)
+    return CompiledGraph(arrays, header["vertex_attribute_table"], header["lane_attribute_table"],
+                         header["max_lane_speed"], [tuple(level) for level in header["levels"]],
+                         header["transition_lanes"], buffer)
+
+def load_compiled_graph(graph_file: str, default_speed: float, use_cache: bool = True) -> CompiledGraph:
+    """
+    Load a graph JSON file in compiled form. The JSON file is hashed on every
+    load, and a cache file next to it is used if it was compiled from the
+    same hash with the same default speed. A missing or stale cache is
+    rebuilt, unless the directory is not writable. A matching cache is never
+    rewritten, so a cache another graph still has mapped is only replaced
+    once the JSON file changes.
+
+    Args:
+        graph_file: Path to the JSON file.
+        default_speed: Speed of lanes whose speed_limit is missing or 0.
+        use_cache: False to compile the JSON file without reading or writing a cache.
+
+    Returns:
+        CompiledGraph.
+
+    Raises:
+        FileNotFoundError: If the JSON file does not exist.
+        json.JSONDecodeError: If the JSON file is invalid.
+    """
+    cache_path = graph_file + CACHE_SUFFIX
+    if use_cache:
+        source = {"hash": hash_file(graph_file), "default_speed": default_speed}
+        cached = read_cache_header(cache_path)
+        if cached is not None and cached[0].get("source") == source:
+            return map_compiled_graph(cache_path, *cached)
+
+    with open(graph_file, 'r') as f:
+        data = json.load(f)
+    vertices, lanes, levels = flatten_levels(data)
+    graph = compile_graph(vertices, lanes, default_speed, levels)
+    if use_cache:
+        try:
+            write_compiled_graph(cache_path, graph, source)
+        except OSError as e:
+            logging.warning("Could not write graph cache %s: %s", cache_path, e)
+    return graph
+
+class VertexTable(Sequence):
+    """
+    Read-only list-like view of compiled vertices, giving (x, y, attributes)
+    tuples like the [x, y, attributes] entries of the JSON file. Attribute
+    dictionaries, names included, are built on access and are not shared
+    with the graph.
+    """
+    def __init__(self, graph: CompiledGraph):
+        """
+        Initialize the view.
+
+        Args:
+            graph: Compiled graph.
+        """
+        self.xs = graph.arrays["vertex_x"]
+        self.ys = graph.arrays["vertex_y"]
+        self.attribute_ids = graph.arrays["vertex_attributes"]
+        self.attribute_table = graph.vertex_attribute_table
+        self.graph = graph
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        attributes = dict(self.attribute_table[self.attribute_ids[index]])
+        name = self.graph.get_vertex_name(index)
+        if name is not None:
+            attributes = dict(name=name, **attributes)
+        return self.xs[index], self.ys[index], attributes
+
+    def __iter__(self) -> Iterator[Tuple[float, float, Dict[str, Any]]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_list(self) -> List[List[Any]]:
+        """
+        Copy the vertices into a list of [x, y, attributes] lists.
+
+        Returns:
+            List of vertices, as loaded from the JSON file.
+        """
+        return [list(vertex) for vertex in self]
+
+class LaneTable(Sequence):
+    """
+    Read-only list-like view of compiled lanes, giving (from, to, attributes)
+    tuples like the [from, to, attributes] entries of the JSON file. Lanes
+    with equal attributes share one dictionary, which must not be modified.
+    """
+    def __init__(self, graph: CompiledGraph):
+        """
+        Initialize the view.
+
+        Args:
+            graph: Compiled graph.
+        """
+        self.lane_from = graph.arrays["lane_from"]
+        self.lane_to = graph.arrays["lane_to"]
+        self.attribute_ids = graph.arrays["lane_attributes"]
+        self.attribute_table = graph.lane_attribute_table
+
+    def __len__(self) -> int:
+        return len(self.lane_from)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.lane_from[index], self.lane_to[index], self.attribute_table[self.attribute_ids[index]]
+
+    def __iter__(self) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_list(self) -> List[List[Any]]:
+        """
+        Copy the lanes into a list of [from, to, attributes] lists, each with
+        its own attribute dictionary.
+
+        Returns:
+            List of lanes, as loaded from the JSON file.
+        """
+        return [[from_vertex, to_vertex, dict(attributes)] for from_vertex, to_vertex, attributes in self]
+
+class AdjacencyIndex(dict):
+    """
+    Per-vertex adjacency of a compiled graph, copied out of its CSR arrays
+    the first time each vertex is looked up. Searches only copy the
+    vertices they reach, so levels no route passes through stay in the
+    mapped file. Maps a vertex index to the list of its neighbours or,
+    given lane IDs, to a dictionary of neighbour -> lane ID.
+    get_neighbors and find_lane read the arrays directly and copy nothing.
+    """
+    def __init__(self, offsets: memoryview, neighbors: memoryview, lanes: Optional[memoryview] = None):
+        """
+        Initialize the index.
+
+        Args:
+            offsets: CSR offsets, one per vertex plus the total.
+            neighbors: CSR neighbour of each entry.
+            lanes: CSR lane ID of each entry, or None to index neighbour lists.
+        """
+        super().__init__()
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.lanes = lanes
+        self.num_vertices = len(offsets) - 1
+
+    def __missing__(self, vertex: int):
+        if not 0 <= vertex < self.num_vertices:
+            raise IndexError(f"Vertex {vertex} is out of range")
+        start, end = self.offsets[vertex], self.offsets[vertex + 1]
+        neighbors = self.neighbors[start:end].tolist()
+        entry = neighbors if self.lanes is None else dict(zip(neighbors, self.lanes[start:end].tolist()))
+        self[vertex] = entry
+        return entry
+
+    def get_neighbors(self, vertex: int) -> List[int]:
+        """
+        Get the neighbours of a vertex without copying its entry into the index.
+
+        Args:
+            vertex: Vertex index.
+
+        Returns:
+            List of neighbour vertex indices.
+        """
+        entry = self.get(vertex)
+        if entry is not None:
+            return entry if self.lanes is None else list(entry)
+        return self.neighbors[self.offsets[vertex]:self.offsets[vertex + 1]].tolist()
+
+    def find_lane(self, vertex: int, neighbor: int) -> Optional[int]:
+        """
+        Get the lane from a vertex to a neighbour without copying the vertex's
+        entry into the index. Only valid for an index with lane IDs.
+
+        Args:
+            vertex: Vertex index.
+            neighbor: Index of the neighbour.
+
+        Returns:
+            Lane ID, or None if there is no such lane.
+        """
+        entry = self.get(vertex)
+        if entry is not None:
+            return entry.get(neighbor)
+        neighbors = self.neighbors
+        for i in range(self.offsets[vertex], self.offsets[vertex + 1]):
+            if neighbors[i] == neighbor:
+                return self.lanes[i]
+        return None
+
+    def append(self, entry) -> None:
+        """
+        Add a vertex after the compiled ones.
+
+        Args:
+            entry: Empty neighbour list or lane ID dictionary of the vertex.
+        """
+        self[self.num_vertices] = entry
+        self.num_vertices += 1
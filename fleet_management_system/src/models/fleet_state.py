@@ -0,0 +1,111 @@
+from typing import List
+
+import numpy as np
+
+from models.robot import MOVING, STATUS_CODES, WAITING, Robot, RobotStatus
+
+class FleetState:
+    """
+    Array-backed robot state in a structure-of-arrays layout.
+    Each robot owns a slot; the per-tick progress update and arrival check
+    run as batched NumPy operations over all slots, and the Robot objects
+    are only touched for robots that change lane or status.
+    """
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an empty fleet state.
+
+        Args:
+            capacity: Number of slots to allocate up front; grows as needed.
+        """
+        self.robots: List[Robot] = []  # Robot owning each slot
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.from_vertex = np.zeros(capacity, dtype=np.int32)
+        self.to_vertex = np.zeros(capacity, dtype=np.int32)
+        self.progress = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.waiting_time = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.robots)
+
+    def _grow(self) -> None:
+        """Double the capacity of every array."""
+        for name in ("status", "from_vertex", "to_vertex", "progress", "speed", "waiting_time"):
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add_robot(self, robot: Robot) -> int:
+        """
+        Allocate a slot for a robot and load its current state.
+
+        Args:
+            robot: Robot to add.
+
+        Returns:
+            Slot index of the robot.
+        """
+        slot = len(self.robots)
+        if slot == len(self.status):
+            self._grow()
+        self.robots.append(robot)
+        self.load(slot)
+        return slot
+
+    def load(self, slot: int) -> None:
+        """
+        Copy a robot's state from its Robot object into the arrays.
+        Called after Python code changes the robot's lane or status.
+
+        Args:
+            slot: Slot index of the robot.
+        """
+        robot = self.robots[slot]
+        self.status[slot] = robot.status_code
+        self.from_vertex[slot] = robot.current_vertex if robot.from_vertex is None else robot.from_vertex
+        self.to_vertex[slot] = robot.current_vertex if robot.to_vertex is None else robot.to_vertex
+        self.progress[slot] = robot.progress
+        self.speed[slot] = robot.speed
+        self.waiting_time[slot] = robot.waiting_time
+
+    def advance(self) -> np.ndarray:
+        """
+        Advance every moving robot along its lane and count a tick of
+        waiting for every queued one.
+
+        Returns:
+            Slot indices of the robots that reached the end of their lane.
+        """
+        count = len(self.robots)
+        status = self.status[:count]
+        progress = self.progress[:count]
+        moving = status == MOVING
+        np.add(progress, self.speed[:count], out=progress, where=moving)
+        waiting_time = self.waiting_time[:count]
+        np.add(waiting_time, 1, out=waiting_time, where=status == WAITING)
+        return np.flatnonzero(moving & (progress >= 1.0))
+
+    def get_slots_with_status(self, status: RobotStatus) -> np.ndarray:
+        """
+        Get the slots of all robots with a given status.
+
+        Args:
+            status: RobotStatus to look for.
+
+        Returns:
+            Array of slot indices.
+        """
+        return np.flatnonzero(self.status[:len(self.robots)] == STATUS_CODES[status])
+
+    def sync_progress(self) -> None:
+        """Copy the progress of moving robots and the waiting time of queued ones back to their Robot objects."""
+        robots = self.robots
+        progress = self.progress
+        status = self.status[:len(robots)]
+        for slot in np.flatnonzero(status == MOVING).tolist():
+            robots[slot].progress = float(progress[slot])
+        waiting_time = self.waiting_time
+        for slot in np.flatnonzero(status == WAITING).tolist():
+            robots[slot].waiting_time = int(waiting_time[slot])
@@ -1,274 +1,709 @@
-import json
-from typing import Dict, List, Tuple, Any, Optional
-
-class NavGraph:
-    """
-    Class to represent and manage the navigation graph.
-    Parses the JSON graph representation and provides methods to access
-    vertices, lanes, and navigate between them.
-    """
-    def __init__(self, graph_file: str):
-        """
-        Initialize the navigation graph from a JSON file.
-        
-        Args:
-            graph_file: Path to the JSON file containing the navigation graph.
-        """
-        self.vertices = []  # List of vertices (locations)
-        self.lanes = []  # List of lanes (paths between locations)
-        self.vertex_name_to_index = {}  # Dictionary mapping vertex names to indices
-        self.lane_occupancy = {}  # Dictionary tracking which lanes are currently occupied
-        
-        self.load_graph(graph_file)
-    
-    def load_graph(self, graph_file: str) -> None:
-        """
-        Load the navigation graph from a JSON file.
-        
-        Args:
-            graph_file: Path to the JSON file.
-        """
-        try:
-            with open(graph_file, 'r') as f:
-                data = json.load(f)
-                
-            # In the provided JSON, the graph is in levels > level1 > vertices/lanes
-            level_data = next(iter(data.get('levels', {}).values()))
-            
-            self.vertices = level_data.get('vertices', [])
-            self.lanes = level_data.get('lanes', [])
-            
-            # Create a mapping of vertex names to indices for easier lookup
-            for i, vertex in enumerate(self.vertices):
-                attributes = vertex[2] if len(vertex) > 2 else {}
-                name = attributes.get('name', f"Vertex_{i}")
-                self.vertex_name_to_index[name] = i
-                
-            # Initialize lane occupancy
-            for lane in self.lanes:
-                lane_id = self._get_lane_id(lane[0], lane[1])
-                self.lane_occupancy[lane_id] = None  # None means lane is free
-                
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"Error loading navigation graph: {e}")
-            raise
-    
-    def get_vertex_coordinates(self, vertex_index: int) -> Tuple[float, float]:
-        """
-        Get the x, y coordinates of a vertex.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            
-        Returns:
-            Tuple of (x, y) coordinates.
-        """
-        if 0 <= vertex_index < len(self.vertices):
-            return self.vertices[vertex_index][0], self.vertices[vertex_index][1]
-        return 0, 0
-    
-    def get_vertex_attributes(self, vertex_index: int) -> Dict[str, Any]:
-        """
-        Get the attributes of a vertex.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            
-        Returns:
-            Dictionary of vertex attributes.
-        """
-        if 0 <= vertex_index < len(self.vertices):
-            attributes = self.vertices[vertex_index][2] if len(self.vertices[vertex_index]) > 2 else {}
-            return attributes
-        return {}
-    
-    def is_vertex_charger(self, vertex_index: int) -> bool:
-        """
-        Check if a vertex is a charging station.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            
-        Returns:
-            True if the vertex is a charger, False otherwise.
-        """
-        attributes = self.get_vertex_attributes(vertex_index)
-        return attributes.get('is_charger', False)
-    
-    def get_vertex_name(self, vertex_index: int) -> str:
-        """
-        Get the name of a vertex.
-        
-        Args:
-            vertex_index: Index of the vertex.
-            
-        Returns:
-            Name of the vertex.
-        """
-        attributes = self.get_vertex_attributes(vertex_index)
-        return attributes.get('name', f"Vertex_{vertex_index}")
-    
-    def get_vertex_index_by_name(self, name: str) -> Optional[int]:
-        """
-        Get the index of a vertex by its name.
-        
-        Args:
-            name: Name of the vertex.
-            
-        Returns:
-            Index of the vertex, or None if not found.
-        """
-        return self.vertex_name_to_index.get(name)
-    
-    def get_connected_vertices(self, vertex_index: int) -> List[int]:
-        """
-        Get all vertices that can be reached from a given vertex.
-        
-        Args:
-            vertex_index: Index of the source vertex.
-            
-        Returns:
-            List of connected vertex indices.
-        """
-        connected = []
-        for lane in self.lanes:
-            if lane[0] == vertex_index:
-                connected.append(lane[1])
-        return connected
-    
-    def is_lane_free(self, from_vertex: int, to_vertex: int) -> bool:
-        """
-        Check if a lane is free (not occupied by any robot).
-        
-        Args:
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            
-        Returns:
-            True if the lane is free, False otherwise.
-        """
-        lane_id = self._get_lane_id(from_vertex, to_vertex)
-        return self.lane_occupancy.get(lane_id) is None
-    
-    def occupy_lane(self, from_vertex: int, to_vertex: int, robot_id: str) -> bool:
-        """
-        Mark a lane as occupied by a robot.
-        
-        Args:
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            robot_id: ID of the robot occupying the lane.
-            
-        Returns:
-            True if the lane was successfully occupied, False otherwise.
-        """
-        lane_id = self._get_lane_id(from_vertex, to_vertex)
-        if lane_id in self.lane_occupancy and self.lane_occupancy[lane_id] is None:
-            self.lane_occupancy[lane_id] = robot_id
-            return True
-        return False
-    
-    def free_lane(self, from_vertex: int, to_vertex: int, robot_id: str) -> bool:
-        """
-        Mark a lane as free.
-        
-        Args:
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            robot_id: ID of the robot that was occupying the lane.
-            
-        Returns:
-            True if the lane was successfully freed, False otherwise.
-        """
-        lane_id = self._get_lane_id(from_vertex, to_vertex)
-        if lane_id in self.lane_occupancy and self.lane_occupancy[lane_id] == robot_id:
-            self.lane_occupancy[lane_id] = None
-            return True
-        return False
-    
-    def lane_exists(self, from_vertex: int, to_vertex: int) -> bool:
-        """
-        Check if a lane exists between two vertices.
-        
-        Args:
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            
-        Returns:
-            True if the lane exists, False otherwise.
-        """
-        for lane in self.lanes:
-            if lane[0] == from_vertex and lane[1] == to_vertex:
-                return True
-        return False
-    
-    def _get_lane_id(self, from_vertex: int, to_vertex: int) -> str:
-        """
-        Generate a unique identifier for a lane.
-        
-        Args:
-            from_vertex: Starting vertex index.
-            to_vertex: Ending vertex index.
-            
-        Returns:
-            String identifier for the lane.
-        """
-        return f"{from_vertex}->{to_vertex}"
-    
-    def get_all_vertices(self) -> List[Tuple[int, float, float, Dict[str, Any]]]:
-        """
-        Get all vertices with their indices, coordinates, and attributes.
-        
-        Returns:
-            List of tuples (index, x, y, attributes).
-        """
-        result = []
-        for i, vertex in enumerate(self.vertices):
-            x, y = vertex[0], vertex[1]
-            attributes = vertex[2] if len(vertex) > 2 else {}
-            result.append((i, x, y, attributes))
-        return result
-    
-    def get_all_lanes(self) -> List[Tuple[int, int]]:
-        """
-        Get all lanes as pairs of vertex indices.
-        
-        Returns:
-            List of tuples (from_vertex, to_vertex).
-        """
-        result = []
-        for lane in self.lanes:
-            result.append((lane[0], lane[1]))
-        return result
-    
-    def find_path(self, start_vertex: int, end_vertex: int) -> List[int]:
-        """
-        Find a path from start_vertex to end_vertex using BFS.
-        
-        Args:
-            start_vertex: Starting vertex index.
-            end_vertex: Ending vertex index.
-            
-        Returns:
-            List of vertex indices representing the path (including start and end).
-        """
-        if start_vertex == end_vertex:
-            return [start_vertex]
-            
-        # BFS to find the shortest path
-        queue = [(start_vertex, [start_vertex])]
-        visited = set([start_vertex])
-        
-        while queue:
-            (vertex, path) = queue.pop(0)
-            
-            # Get all adjacent vertices
-            for next_vertex in self.get_connected_vertices(vertex):
-                if next_vertex == end_vertex:
-                    return path + [next_vertex]
-                if next_vertex not in visited:
-                    visited.add(next_vertex)
-                    queue.append((next_vertex, path + [next_vertex]))
-        
-        # No path found
-        return []
\ No newline at end of file
+import json
+import math
+import bisect
+from typing import Dict, List, Set, Tuple, Any, Optional
+
+from models.compiled_graph import (AdjacencyIndex, CompiledGraph, LaneTable, VertexTable, flatten_levels,
+                                   load_compiled_graph)
+from planning.level_router import LevelRouter
+from planning.planners import PathPlanner, create_planner
+from planning.route_cache import RouteCache, NextHopTable
+from utils.metrics import Metrics, timed
+
+class NavGraph:
+    """
+    Class to represent and manage the navigation graph.
+    Parses the JSON graph representation and provides methods to access
+    vertices, lanes, and navigate between them.
+    
+    By default the graph is loaded through a compiled binary cache next to
+    the JSON file (see models.compiled_graph). vertices and lanes are then
+    read-only views of the memory-mapped cache, which are copied into lists
+    the first time the graph is edited, and the adjacency indexes are filled
+    from the cache one vertex at a time as searches reach them.
+    
+    Every level of the file is loaded, each into its own contiguous range of
+    vertex indices, and the file's transitions (lifts and ramps between
+    levels) become lanes. Routes between levels are planned hierarchically
+    by a LevelRouter, so with the cache, levels no route passes through are
+    never read into memory.
+    """
+    # Speed assumed for lanes whose speed_limit is missing or 0 (unlimited)
+    DEFAULT_LANE_SPEED = 1.0
+    
+    # Graphs with at most this many vertices answer queries from an all-pairs next-hop table
+    ALL_PAIRS_MAX_VERTICES = 256
+    
+    def __init__(self, graph_file: str, route_cache_size: int = 1024,
+                 all_pairs_max_vertices: Optional[int] = None, use_graph_cache: bool = True):
+        """
+        Initialize the navigation graph from a JSON file.
+        
+        Args:
+            graph_file: Path to the JSON file containing the navigation graph.
+            route_cache_size: Maximum number of routes kept in the LRU route cache.
+            all_pairs_max_vertices: Largest graph for which an all-pairs next-hop
+                table is precomputed (0 disables it). Defaults to ALL_PAIRS_MAX_VERTICES.
+            use_graph_cache: True to load the graph through a compiled cache
+                file, False to parse the JSON file into lists every time.
+        """
+        self.use_graph_cache = use_graph_cache
+        self.vertices = []  # List of vertices (locations)
+        self.lanes = []  # List of lanes (paths between locations)
+        self.vertex_xs: List[float] = []  # X-coordinate of each vertex
+        self.vertex_ys: List[float] = []  # Y-coordinate of each vertex
+        self.level_names: List[str] = []  # Name of each level, in file order
+        self.level_offsets: List[int] = [0]  # First vertex index of each level, then the vertex count
+        self.transition_lanes: List[int] = []  # IDs of lanes between levels
+        # Dictionary mapping vertex names to indices; built on first use for a compiled graph
+        self.vertex_name_to_index: Optional[Dict[str, int]] = {}
+        self.compiled_graph: Optional[CompiledGraph] = None  # Compiled graph the views point into
+        # Per-vertex indexes: lists, or AdjacencyIndex dictionaries for a compiled graph
+        self.adjacency: List[List[int]] = []  # Outgoing neighbours of each vertex
+        self.reverse_adjacency: List[List[int]] = []  # Incoming neighbours of each vertex
+        self.lane_ids: List[Dict[int, int]] = []  # Per source vertex, maps target vertex to lane ID
+        self.lane_occupancy: List[Optional[str]] = []  # Robot ID occupying each lane, indexed by lane ID
+        self.lane_travel_times: List[float] = []  # Time to traverse each lane, indexed by lane ID
+        self.max_lane_speed = self.DEFAULT_LANE_SPEED  # Fastest lane speed, used by planner heuristics
+        self.planners: Dict[str, PathPlanner] = {}  # Planner instances created on demand by name
+        
+        # Route caching; the version is bumped whenever vertices or lanes change
+        self.version = 0
+        self.topology_version = 0  # Bumped only when vertices or lanes are added, not when travel times change
+        self.route_cache = RouteCache(route_cache_size)
+        self.all_pairs_max_vertices = (
+            self.ALL_PAIRS_MAX_VERTICES if all_pairs_max_vertices is None else all_pairs_max_vertices
+        )
+        self.next_hop_tables: Dict[bool, NextHopTable] = {}  # Keyed by whether lanes are weighted
+        self.metrics: Optional[Metrics] = None  # Records find_path timings when set
+        self.level_router = LevelRouter(self)
+        
+        self.load_graph(graph_file)
+    
+    def load_graph(self, graph_file: str) -> None:
+        """
+        Load the navigation graph from a JSON file.
+        The file holds levels > <level name> > vertices/lanes, with vertex
+        indices local to each level, and optionally a list of transitions,
+        [from level, from vertex, to level, to vertex, attributes] lanes
+        between levels, usually with a travel_time attribute.
+        
+        Args:
+            graph_file: Path to the JSON file.
+        """
+        try:
+            if self.use_graph_cache:
+                self._load_compiled(load_compiled_graph(graph_file, self.DEFAULT_LANE_SPEED))
+                return
+            
+            with open(graph_file, 'r') as f:
+                data = json.load(f)
+            
+            self.vertices, self.lanes, levels = flatten_levels(data)
+            self.level_names = [name for name, _ in levels]
+            self.level_offsets = [offset for _, offset in levels] + [len(self.vertices)]
+            
+            # Create a mapping of vertex names to indices for easier lookup
+            self.vertex_name_to_index = {}
+            for i, vertex in enumerate(self.vertices):
+                attributes = vertex[2] if len(vertex) > 2 else {}
+                name = attributes.get('name', f"Vertex_{i}")
+                self.vertex_name_to_index[name] = i
+                
+            self._build_indexes()
+                
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            print(f"Error loading navigation graph: {e}")
+            raise
+    
+    def _load_compiled(self, graph: CompiledGraph) -> None:
+        """
+        Use a compiled graph. Nothing is copied out of its arrays here: the
+        adjacency indexes copy each vertex's CSR entries when a search first
+        looks it up, lane lookups and neighbour queries read the CSR arrays
+        directly, lane travel times stay a view until one is changed, and
+        vertex names are indexed on the first name lookup.
+        
+        Args:
+            graph: Compiled graph.
+        """
+        arrays = graph.arrays
+        self.compiled_graph = graph
+        self.vertices = VertexTable(graph)
+        self.lanes = LaneTable(graph)
+        self.vertex_xs = arrays["vertex_x"]
+        self.vertex_ys = arrays["vertex_y"]
+        self.level_names = [name for name, _ in graph.levels]
+        self.level_offsets = [offset for _, offset in graph.levels] + [graph.num_vertices]
+        self.transition_lanes = list(graph.transition_lanes)
+        self.vertex_name_to_index = None
+        
+        self.adjacency = AdjacencyIndex(arrays["out_offsets"], arrays["out_targets"])
+        self.reverse_adjacency = AdjacencyIndex(arrays["in_offsets"], arrays["in_sources"])
+        self.lane_ids = AdjacencyIndex(arrays["out_offsets"], arrays["out_targets"], arrays["out_lanes"])
+        self.lane_occupancy = [None] * graph.num_lanes
+        self.lane_travel_times = arrays["lane_travel_times"]
+        self.max_lane_speed = graph.max_lane_speed
+        
+        self._mark_changed()
+    
+    def _get_name_index(self) -> Dict[str, int]:
+        """
+        Get the vertex name index, building it from the compiled graph's name table on first use.
+        
+        Returns:
+            Dictionary mapping vertex names to indices.
+        """
+        if self.vertex_name_to_index is None:
+            names = self.compiled_graph.get_vertex_names()
+            self.vertex_name_to_index = {
+                f"Vertex_{i}" if name is None else name: i for i, name in enumerate(names)
+            }
+        return self.vertex_name_to_index
+    
+    def _materialize(self) -> None:
+        """Copy the vertices, lanes and travel times of a compiled graph into lists so they can be edited."""
+        if isinstance(self.vertices, VertexTable):
+            self.vertices = self.vertices.to_list()
+            self.vertex_xs = self.vertex_xs.tolist()
+            self.vertex_ys = self.vertex_ys.tolist()
+        if isinstance(self.lanes, LaneTable):
+            self.lanes = self.lanes.to_list()
+            self.lane_travel_times = self.lane_travel_times.tolist()
+    
+    def _build_indexes(self) -> None:
+        """
+        Build the adjacency indexes and the dense lane ID table.
+        
+        A lane's ID is its position in self.lanes. If the JSON lists the same
+        lane twice, only the first entry is indexed.
+        """
+        num_vertices = len(self.vertices)
+        self.vertex_xs = [vertex[0] for vertex in self.vertices]
+        self.vertex_ys = [vertex[1] for vertex in self.vertices]
+        self.adjacency = [[] for _ in range(num_vertices)]
+        self.reverse_adjacency = [[] for _ in range(num_vertices)]
+        self.lane_ids = [{} for _ in range(num_vertices)]
+        self.transition_lanes = []
+        self.lane_occupancy = []
+        self.lane_travel_times = []
+        self.max_lane_speed = self.DEFAULT_LANE_SPEED
+        
+        for lane_id in range(len(self.lanes)):
+            self._index_lane(lane_id)
+        
+        self._mark_changed()
+    
+    def _index_lane(self, lane_id: int) -> None:
+        """
+        Add a lane from self.lanes to the adjacency, occupancy and travel time indexes.
+        
+        Args:
+            lane_id: Lane ID (index into self.lanes).
+        """
+        lane = self.lanes[lane_id]
+        from_vertex, to_vertex = lane[0], lane[1]
+        
+        # None means lane is free
+        self.lane_occupancy.append(None)
+        
+        # Travel time of the lane from its length and speed limit
+        self.lane_travel_times.append(self.get_lane_travel_time(lane))
+        self.max_lane_speed = max(self.max_lane_speed, self.get_lane_speed(lane))
+        if self.get_vertex_level(from_vertex) != self.get_vertex_level(to_vertex):
+            self.transition_lanes.append(lane_id)
+        
+        if to_vertex not in self.lane_ids[from_vertex]:
+            self.lane_ids[from_vertex][to_vertex] = lane_id
+            self.adjacency[from_vertex].append(to_vertex)
+            self.reverse_adjacency[to_vertex].append(from_vertex)
+    
+    def _get_lane_length(self, lane: List[Any]) -> float:
+        """
+        Get the straight-line length of a lane.
+        
+        Args:
+            lane: Lane entry from the graph file, [from, to, attributes].
+            
+        Returns:
+            Euclidean distance between the lane's endpoints.
+        """
+        from_x, from_y = self.get_vertex_coordinates(lane[0])
+        to_x, to_y = self.get_vertex_coordinates(lane[1])
+        return math.hypot(to_x - from_x, to_y - from_y)
+    
+    def _mark_changed(self, topology: bool = True) -> None:
+        """
+        Bump the graph version so cached routes planned on the old graph are dropped.
+        
+        Args:
+            topology: False if only lane travel times changed.
+        """
+        self.version += 1
+        if topology:
+            self.topology_version += 1
+    
+    def add_vertex(self, x: float, y: float, attributes: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Add a vertex to the graph, on the last level.
+        
+        Args:
+            x: X-coordinate of the vertex.
+            y: Y-coordinate of the vertex.
+            attributes: Vertex attributes such as name and is_charger.
+            
+        Returns:
+            Index of the new vertex.
+        """
+        self._materialize()
+        attributes = attributes or {}
+        vertex_index = len(self.vertices)
+        self.vertices.append([x, y, attributes])
+        self.vertex_xs.append(x)
+        self.vertex_ys.append(y)
+        self.level_offsets[-1] = len(self.vertices)
+        self._get_name_index()[attributes.get('name', f"Vertex_{vertex_index}")] = vertex_index
+        self.adjacency.append([])
+        self.reverse_adjacency.append([])
+        self.lane_ids.append({})
+        
+        self._mark_changed()
+        return vertex_index
+    
+    def add_lane(self, from_vertex: int, to_vertex: int,
+                 attributes: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Add a lane between two existing vertices.
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            attributes: Lane attributes such as speed_limit.
+            
+        Returns:
+            ID of the new lane, or None if a vertex does not exist or the lane
+            already exists.
+        """
+        num_vertices = len(self.vertices)
+        if not (0 <= from_vertex < num_vertices and 0 <= to_vertex < num_vertices):
+            return None
+        if self.lane_exists(from_vertex, to_vertex):
+            return None
+        
+        self._materialize()
+        lane_id = len(self.lanes)
+        self.lanes.append([from_vertex, to_vertex, attributes or {}])
+        self._index_lane(lane_id)
+        
+        self._mark_changed()
+        return lane_id
+    
+    def set_lane_speed_limit(self, from_vertex: int, to_vertex: int, speed_limit: float) -> bool:
+        """
+        Change the speed limit of a lane.
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            speed_limit: New speed limit (0 means DEFAULT_LANE_SPEED).
+            
+        Returns:
+            True if the lane exists and was updated, False otherwise.
+        """
+        lane_id = self.get_lane_id(from_vertex, to_vertex)
+        if lane_id is None:
+            return False
+        
+        self._materialize()
+        lane = self.lanes[lane_id]
+        if len(lane) > 2:
+            lane[2]['speed_limit'] = speed_limit
+        else:
+            lane.append({'speed_limit': speed_limit})
+        self.lane_travel_times[lane_id] = self.get_lane_travel_time(lane)
+        self.max_lane_speed = max(
+            [self.DEFAULT_LANE_SPEED] + [self.get_lane_speed(lane) for lane in self.lanes]
+        )
+        
+        self._mark_changed(topology=False)
+        return True
+    
+    def get_lane_speed(self, lane: List[Any]) -> float:
+        """
+        Get the speed robots travel at along a lane.
+        
+        Args:
+            lane: Lane entry from the graph file, [from, to, attributes].
+            
+        Returns:
+            The lane's speed_limit, or DEFAULT_LANE_SPEED if it has none.
+            Lanes with a travel_time, such as lifts, move at their length
+            divided by it.
+        """
+        attributes = lane[2] if len(lane) > 2 else {}
+        travel_time = attributes.get('travel_time', 0)
+        if travel_time and travel_time > 0:
+            return self._get_lane_length(lane) / travel_time
+        speed_limit = attributes.get('speed_limit', 0)
+        return speed_limit if speed_limit and speed_limit > 0 else self.DEFAULT_LANE_SPEED
+    
+    def get_lane_travel_time(self, lane: List[Any]) -> float:
+        """
+        Get the time robots take to traverse a lane.
+        
+        Args:
+            lane: Lane entry from the graph file, [from, to, attributes].
+            
+        Returns:
+            The lane's travel_time attribute if it has one, otherwise its
+            length divided by its speed.
+        """
+        attributes = lane[2] if len(lane) > 2 else {}
+        travel_time = attributes.get('travel_time', 0)
+        if travel_time and travel_time > 0:
+            return travel_time
+        return self._get_lane_length(lane) / self.get_lane_speed(lane)
+    
+    def get_vertex_level(self, vertex_index: int) -> Optional[int]:
+        """
+        Get the level a vertex is on.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            Index of the level in level_names, or None if the vertex does not exist.
+        """
+        if not 0 <= vertex_index < self.level_offsets[-1]:
+            return None
+        return bisect.bisect_right(self.level_offsets, vertex_index, hi=len(self.level_names)) - 1
+    
+    def get_level_vertices(self, level: int) -> range:
+        """
+        Get the vertices of a level.
+        
+        Args:
+            level: Index of the level.
+            
+        Returns:
+            Range of the level's vertex indices.
+        """
+        return range(self.level_offsets[level], self.level_offsets[level + 1])
+    
+    def get_vertex_index_on_level(self, level_name: str, local_index: int) -> Optional[int]:
+        """
+        Get the vertex index of a vertex given by its level and its index within the level.
+        
+        Args:
+            level_name: Name of the level.
+            local_index: Index of the vertex in the level's vertex list.
+            
+        Returns:
+            Vertex index, or None if there is no such vertex.
+        """
+        if level_name not in self.level_names:
+            return None
+        vertices = self.get_level_vertices(self.level_names.index(level_name))
+        return vertices[local_index] if 0 <= local_index < len(vertices) else None
+    
+    def get_vertex_coordinates(self, vertex_index: int) -> Tuple[float, float]:
+        """
+        Get the x, y coordinates of a vertex.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            Tuple of (x, y) coordinates.
+        """
+        if 0 <= vertex_index < len(self.vertex_xs):
+            return self.vertex_xs[vertex_index], self.vertex_ys[vertex_index]
+        return 0, 0
+    
+    def get_vertex_attributes(self, vertex_index: int) -> Dict[str, Any]:
+        """
+        Get the attributes of a vertex.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            Dictionary of vertex attributes.
+        """
+        if 0 <= vertex_index < len(self.vertices):
+            attributes = self.vertices[vertex_index][2] if len(self.vertices[vertex_index]) > 2 else {}
+            return attributes
+        return {}
+    
+    def is_vertex_charger(self, vertex_index: int) -> bool:
+        """
+        Check if a vertex is a charging station.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            True if the vertex is a charger, False otherwise.
+        """
+        attributes = self.get_vertex_attributes(vertex_index)
+        return attributes.get('is_charger', False)
+    
+    def get_vertex_name(self, vertex_index: int) -> str:
+        """
+        Get the name of a vertex.
+        
+        Args:
+            vertex_index: Index of the vertex.
+            
+        Returns:
+            Name of the vertex.
+        """
+        attributes = self.get_vertex_attributes(vertex_index)
+        return attributes.get('name', f"Vertex_{vertex_index}")
+    
+    def get_vertex_index_by_name(self, name: str) -> Optional[int]:
+        """
+        Get the index of a vertex by its name.
+        
+        Args:
+            name: Name of the vertex.
+            
+        Returns:
+            Index of the vertex, or None if not found.
+        """
+        return self._get_name_index().get(name)
+    
+    def get_connected_vertices(self, vertex_index: int) -> List[int]:
+        """
+        Get all vertices that can be reached from a given vertex.
+        
+        Args:
+            vertex_index: Index of the source vertex.
+            
+        Returns:
+            List of connected vertex indices. The list may be shared with
+            the graph's adjacency index and must not be modified.
+        """
+        if not 0 <= vertex_index < len(self.vertices):
+            return []
+        if isinstance(self.adjacency, AdjacencyIndex):
+            return self.adjacency.get_neighbors(vertex_index)
+        return self.adjacency[vertex_index]
+    
+    def get_incoming_vertices(self, vertex_index: int) -> List[int]:
+        """
+        Get all vertices that have a lane leading to a given vertex.
+        
+        Args:
+            vertex_index: Index of the target vertex.
+            
+        Returns:
+            List of vertex indices. The list may be shared with the graph's
+            reverse adjacency index and must not be modified.
+        """
+        if not 0 <= vertex_index < len(self.vertices):
+            return []
+        if isinstance(self.reverse_adjacency, AdjacencyIndex):
+            return self.reverse_adjacency.get_neighbors(vertex_index)
+        return self.reverse_adjacency[vertex_index]
+    
+    def is_lane_free(self, from_vertex: int, to_vertex: int) -> bool:
+        """
+        Check if a lane is free (not occupied by any robot).
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            
+        Returns:
+            True if the lane is free, False otherwise.
+        """
+        lane_id = self.get_lane_id(from_vertex, to_vertex)
+        return lane_id is None or self.lane_occupancy[lane_id] is None
+    
+    def occupy_lane(self, from_vertex: int, to_vertex: int, robot_id: str) -> bool:
+        """
+        Mark a lane as occupied by a robot.
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            robot_id: ID of the robot occupying the lane.
+            
+        Returns:
+            True if the lane was successfully occupied, False otherwise.
+        """
+        lane_id = self.get_lane_id(from_vertex, to_vertex)
+        if lane_id is not None and self.lane_occupancy[lane_id] is None:
+            self.lane_occupancy[lane_id] = robot_id
+            return True
+        return False
+    
+    def free_lane(self, from_vertex: int, to_vertex: int, robot_id: str) -> bool:
+        """
+        Mark a lane as free.
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            robot_id: ID of the robot that was occupying the lane.
+            
+        Returns:
+            True if the lane was successfully freed, False otherwise.
+        """
+        lane_id = self.get_lane_id(from_vertex, to_vertex)
+        if lane_id is not None and self.lane_occupancy[lane_id] == robot_id:
+            self.lane_occupancy[lane_id] = None
+            return True
+        return False
+    
+    def lane_exists(self, from_vertex: int, to_vertex: int) -> bool:
+        """
+        Check if a lane exists between two vertices.
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            
+        Returns:
+            True if the lane exists, False otherwise.
+        """
+        return self.get_lane_id(from_vertex, to_vertex) is not None
+    
+    def get_lane_id(self, from_vertex: int, to_vertex: int) -> Optional[int]:
+        """
+        Get the integer identifier of a lane.
+        
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+            
+        Returns:
+            Lane ID (index into self.lanes), or None if no such lane exists.
+        """
+        if not 0 <= from_vertex < len(self.vertices):
+            return None
+        if isinstance(self.lane_ids, AdjacencyIndex):
+            return self.lane_ids.find_lane(from_vertex, to_vertex)
+        return self.lane_ids[from_vertex].get(to_vertex)
+    
+    def get_lane_endpoints(self, lane_id: int) -> Tuple[int, int]:
+        """
+        Get the vertices a lane connects.
+        
+        Args:
+            lane_id: Lane ID.
+            
+        Returns:
+            Tuple of (from_vertex, to_vertex).
+        """
+        lane = self.lanes[lane_id]
+        return lane[0], lane[1]
+    
+    def get_all_vertices(self) -> List[Tuple[int, float, float, Dict[str, Any]]]:
+        """
+        Get all vertices with their indices, coordinates, and attributes.
+        
+        Returns:
+            List of tuples (index, x, y, attributes).
+        """
+        result = []
+        for i, vertex in enumerate(self.vertices):
+            x, y = vertex[0], vertex[1]
+            attributes = vertex[2] if len(vertex) > 2 else {}
+            result.append((i, x, y, attributes))
+        return result
+    
+    def get_all_lanes(self) -> List[Tuple[int, int]]:
+        """
+        Get all lanes as pairs of vertex indices.
+        
+        Returns:
+            List of tuples (from_vertex, to_vertex).
+        """
+        result = []
+        for lane in self.lanes:
+            result.append((lane[0], lane[1]))
+        return result
+    
+    def get_planner(self, name: str) -> PathPlanner:
+        """
+        Get the path planner with the given name, creating it on first use.
+        
+        Args:
+            name: Planner name, e.g. "bfs", "dijkstra", "astar" or "ch".
+            
+        Returns:
+            PathPlanner instance bound to this graph.
+        """
+        planner = self.planners.get(name)
+        if planner is None:
+            planner = create_planner(name, self)
+            self.planners[name] = planner
+        return planner
+    
+    @timed("find_path")
+    def find_path(self, start_vertex: int, end_vertex: int, planner: str = "bfs",
+                  avoid_lanes: Optional[Set[int]] = None) -> List[int]:
+        """
+        Find a path from start_vertex to end_vertex.
+        
+        Small graphs answer from a precomputed all-pairs next-hop table; larger
+        ones check the LRU route cache before running the planner, or the
+        level router for routes between levels. Queries that avoid lanes
+        always run the planner.
+        
+        Args:
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+            planner: Name of the planner to use. "bfs" minimises the number of
+                lanes, "dijkstra", "astar" and "ch" minimise travel time.
+            avoid_lanes: IDs of lanes the path must not use.
+            
+        Returns:
+            List of vertex indices representing the path (including start and end).
+        """
+        path_planner = self.get_planner(planner)
+        
+        if avoid_lanes:
+            return path_planner.find_path(start_vertex, end_vertex, avoid_lanes)
+        
+        if len(self.vertices) <= self.all_pairs_max_vertices:
+            return self._get_next_hop_table(path_planner.weighted).find_path(start_vertex, end_vertex)
+        
+        path = self.route_cache.get(planner, start_vertex, end_vertex, self.version)
+        if path is None:
+            if path_planner.use_level_router and self.level_router.is_cross_level(start_vertex, end_vertex):
+                path = self.level_router.find_path(start_vertex, end_vertex, path_planner.weighted)
+            if path is None:
+                path = path_planner.find_path(start_vertex, end_vertex)
+            self.route_cache.put(planner, start_vertex, end_vertex, self.version, path)
+        return path
+    
+    def _get_next_hop_table(self, weighted: bool) -> NextHopTable:
+        """
+        Get the all-pairs next-hop table, rebuilding it if the graph has changed.
+        
+        Args:
+            weighted: True for travel time costs, False for lane counts.
+            
+        Returns:
+            NextHopTable for the current graph version.
+        """
+        table = self.next_hop_tables.get(weighted)
+        if table is None or table.version != self.version:
+            table = NextHopTable(self, weighted)
+            self.next_hop_tables[weighted] = table
+        return table
+    
+    def get_route_cache_stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss statistics of the route cache and next-hop tables.
+        
+        Returns:
+            Dictionary of cache counters, plus the number of next-hop table lookups.
+        """
+        stats = self.route_cache.get_stats()
+        stats["next_hop_lookups"] = sum(table.lookups for table in self.next_hop_tables.values())
+        stats["version"] = self.version
+        return stats
\ No newline at end of file
@@ -1,179 +1,248 @@
-import time
-import random
-from enum import Enum
-from typing import List, Tuple, Optional, Callable
-
-class RobotStatus(Enum):
-    """Enum representing the possible statuses of a robot."""
-    IDLE = "idle"
-    MOVING = "moving"
-    WAITING = "waiting"
-    CHARGING = "charging"
-    TASK_COMPLETE = "task_complete"
-
-class Robot:
-    """
-    Class representing a robot in the fleet management system.
-    Manages robot state, position, and navigation tasks.
-    """
-    # Available colors for robots
-    COLORS = [
-        "#FF5733", "#33FF57", "#3357FF", "#FF33F5", "#F5FF33",
-        "#33FFF5", "#FF5733", "#FF8C33", "#33FF8C", "#8C33FF",
-        "#FF338C", "#338CFF"
-    ]
-    
-    def __init__(self, robot_id: str, current_vertex: int, log_callback: Callable = None):
-        """
-        Initialize a robot.
-        
-        Args:
-            robot_id: Unique identifier for the robot.
-            current_vertex: Index of the vertex where the robot starts.
-            log_callback: Function to call for logging robot actions.
-        """
-        self.id = robot_id
-        self.current_vertex = current_vertex
-        self.target_vertex = None
-        self.path = []
-        self.current_path_index = 0
-        self.status = RobotStatus.IDLE
-        self.color = random.choice(self.COLORS)
-        self.progress = 0.0  # Progress along the current lane (0.0 to 1.0)
-        self.speed = 0.05  # Speed at which the robot moves (progress units per update)
-        self.from_vertex = None  # Current lane starting vertex
-        self.to_vertex = None  # Current lane ending vertex
-        self.waiting_time = 0  # Time spent waiting
-        self.log_callback = log_callback or (lambda msg: None)  # Default no-op callback
-        
-        self.log(f"Robot {self.id} spawned at vertex {self.current_vertex}")
-    
-    def assign_task(self, target_vertex: int, path: List[int]) -> bool:
-        """
-        Assign a navigation task to the robot.
-        
-        Args:
-            target_vertex: Destination vertex index.
-            path: List of vertex indices forming the path.
-            
-        Returns:
-            True if task was assigned successfully, False otherwise.
-        """
-        if not path or len(path) < 2:
-            self.log(f"Invalid path assigned to Robot {self.id}")
-            return False
-            
-        self.target_vertex = target_vertex
-        self.path = path
-        self.current_path_index = 0
-        self.status = RobotStatus.MOVING
-        self.progress = 0.0
-        self.from_vertex = path[0]
-        self.to_vertex = path[1]
-        
-        self.log(f"Robot {self.id} assigned task to navigate to vertex {target_vertex} via path {path}")
-        return True
-    
-    def update(self, is_lane_free_func, occupy_lane_func, free_lane_func) -> None:
-        """
-        Update the robot's state.
-        
-        Args:
-            is_lane_free_func: Function to check if a lane is free.
-            occupy_lane_func: Function to occupy a lane.
-            free_lane_func: Function to free a lane.
-        """
-        if self.status == RobotStatus.IDLE or self.status == RobotStatus.TASK_COMPLETE:
-            return
-            
-        if self.status == RobotStatus.WAITING:
-            self.waiting_time += 1
-            # Check if the lane is now free
-            if is_lane_free_func(self.from_vertex, self.to_vertex):
-                if occupy_lane_func(self.from_vertex, self.to_vertex, self.id):
-                    self.status = RobotStatus.MOVING
-                    self.waiting_time = 0
-                    self.log(f"Robot {self.id} resumed movement from vertex {self.from_vertex} to {self.to_vertex}")
-            return
-            
-        if self.status == RobotStatus.MOVING:
-            # Update progress along the current lane
-            self.progress += self.speed
-            
-            if self.progress >= 1.0:
-                # Reached the next vertex
-                self.progress = 0.0
-                self.current_vertex = self.to_vertex
-                free_lane_func(self.from_vertex, self.to_vertex, self.id)
-                self.log(f"Robot {self.id} reached vertex {self.current_vertex}")
-                
-                self.current_path_index += 1
-                
-                # Check if we've reached the destination
-                if self.current_path_index >= len(self.path) - 1:
-                    self.status = RobotStatus.TASK_COMPLETE
-                    self.log(f"Robot {self.id} completed task at vertex {self.current_vertex}")
-                    return
-                    
-                # Start moving along the next lane
-                self.from_vertex = self.path[self.current_path_index]
-                self.to_vertex = self.path[self.current_path_index + 1]
-                
-                # Check if the next lane is free
-                if is_lane_free_func(self.from_vertex, self.to_vertex):
-                    if occupy_lane_func(self.from_vertex, self.to_vertex, self.id):
-                        self.log(f"Robot {self.id} moving from vertex {self.from_vertex} to {self.to_vertex}")
-                    else:
-                        self.status = RobotStatus.WAITING
-                        self.log(f"Robot {self.id} couldn't occupy lane from {self.from_vertex} to {self.to_vertex}")
-                else:
-                    self.status = RobotStatus.WAITING
-                    self.log(f"Robot {self.id} waiting at vertex {self.current_vertex} - lane to {self.to_vertex} occupied")
-    
-    def get_position(self) -> Tuple[int, int, float]:
-        """
-        Get the current position of the robot.
-        
-        Returns:
-            Tuple of (from_vertex, to_vertex, progress) indicating the robot's position.
-        """
-        if self.status == RobotStatus.MOVING:
-            return (self.from_vertex, self.to_vertex, self.progress)
-        return (self.current_vertex, self.current_vertex, 0.0)
-    
-    def get_status(self) -> RobotStatus:
-        """
-        Get the current status of the robot.
-        
-        Returns:
-            RobotStatus enum value.
-        """
-        return self.status
-    
-    def is_selected(self, vertex_index: int) -> bool:
-        """
-        Check if the robot is at the specified vertex.
-        
-        Args:
-            vertex_index: The vertex to check.
-            
-        Returns:
-            True if the robot is at this vertex, False otherwise.
-        """
-        return self.current_vertex == vertex_index and (
-            self.status == RobotStatus.IDLE or 
-            self.status == RobotStatus.WAITING or 
-            self.status == RobotStatus.TASK_COMPLETE
-        )
-    
-    def log(self, message: str) -> None:
-        """
-        Log a robot action or status change.
-        
-        Args:
-            message: Message to log.
-        """
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        log_message = f"[{timestamp}] {message}"
-        if self.log_callback:
-            self.log_callback(log_message)
\ No newline at end of file
+import random
+from array import array
+from enum import Enum
+from typing import Dict, List, Tuple, Optional, Callable
+
+class RobotStatus(Enum):
+    """Enum representing the possible statuses of a robot."""
+    IDLE = "idle"
+    MOVING = "moving"
+    WAITING = "waiting"
+    CHARGING = "charging"
+    TASK_COMPLETE = "task_complete"
+
+# Small-int status codes stored on robots and in FleetState; RobotStatus is
+# only used at the API boundary
+IDLE, MOVING, WAITING, CHARGING, TASK_COMPLETE = range(5)
+CODE_STATUSES: List[RobotStatus] = list(RobotStatus)
+STATUS_CODES: Dict[RobotStatus, int] = {status: code for code, status in enumerate(CODE_STATUSES)}
+
+# Path of robots that have not been given a task; paths are never modified in place
+_NO_PATH = array('i')
+
+def _ignore_log(robot_id: str, event: str, message: str, *args) -> None:
+    """Log callback of robots created without one."""
+
+class Robot:
+    """
+    Class representing a robot in the fleet management system.
+    Manages robot state, position, and navigation tasks.
+    Robots use __slots__, store their status as a small-int code and their
+    path as an array of vertex indices, to keep large fleets compact.
+    """
+    # Available colors for robots
+    COLORS = [
+        "#FF5733", "#33FF57", "#3357FF", "#FF33F5", "#F5FF33",
+        "#33FFF5", "#FF5733", "#FF8C33", "#33FF8C", "#8C33FF",
+        "#FF338C", "#338CFF"
+    ]
+    
+    # Attributes making up the robot's state, as returned by get_state
+    STATE_FIELDS = ("id", "current_vertex", "target_vertex", "path", "current_path_index", "status_code",
+                    "color_index", "progress", "speed", "from_vertex", "to_vertex", "waiting_time")
+    __slots__ = STATE_FIELDS + ("log_callback",)
+    
+    def __init__(self, robot_id: str, current_vertex: int, log_callback: Callable = None):
+        """
+        Initialize a robot.
+        
+        Args:
+            robot_id: Unique identifier for the robot.
+            current_vertex: Index of the vertex where the robot starts.
+            log_callback: Function (robot_id, event, message, *args) to call for
+                logging robot actions; message is a %-style format string.
+        """
+        self.id = robot_id
+        self.current_vertex = current_vertex
+        self.target_vertex = None
+        self.path = _NO_PATH
+        self.current_path_index = 0
+        self.status_code = IDLE
+        self.color_index = random.randrange(len(self.COLORS))
+        self.progress = 0.0  # Progress along the current lane (0.0 to 1.0)
+        self.speed = 0.05  # Speed at which the robot moves (progress units per update)
+        self.from_vertex = None  # Current lane starting vertex
+        self.to_vertex = None  # Current lane ending vertex
+        self.waiting_time = 0  # Time spent waiting
+        self.log_callback = log_callback or _ignore_log
+        
+        self.log("spawned", "Robot %s spawned at vertex %s", self.id, self.current_vertex)
+    
+    def get_state(self) -> Tuple:
+        """
+        Get the robot's state as a picklable tuple, e.g. to move it to another process.
+        
+        Returns:
+            Tuple of the STATE_FIELDS values.
+        """
+        return tuple(getattr(self, name) for name in self.STATE_FIELDS)
+    
+    @classmethod
+    def from_state(cls, state: Tuple, log_callback: Callable = None) -> "Robot":
+        """
+        Recreate a robot from a tuple returned by get_state, without logging a spawn.
+        
+        Args:
+            state: Tuple of the STATE_FIELDS values.
+            log_callback: Function (robot_id, event, message, *args) to call for logging robot actions.
+            
+        Returns:
+            Robot instance.
+        """
+        robot = cls.__new__(cls)
+        for name, value in zip(cls.STATE_FIELDS, state):
+            setattr(robot, name, value)
+        robot.log_callback = log_callback or _ignore_log
+        return robot
+    
+    @property
+    def status(self) -> RobotStatus:
+        """Status of the robot as a RobotStatus."""
+        return CODE_STATUSES[self.status_code]
+    
+    @status.setter
+    def status(self, status: RobotStatus) -> None:
+        self.status_code = STATUS_CODES[status]
+    
+    @property
+    def color(self) -> str:
+        """Fill colour of the robot in the GUI."""
+        return self.COLORS[self.color_index]
+    
+    def assign_task(self, target_vertex: int, path: List[int]) -> bool:
+        """
+        Assign a navigation task to the robot.
+        
+        Args:
+            target_vertex: Destination vertex index.
+            path: List of vertex indices forming the path.
+            
+        Returns:
+            True if task was assigned successfully, False otherwise.
+        """
+        if not path or len(path) < 2:
+            self.log("invalid_path", "Invalid path assigned to Robot %s", self.id)
+            return False
+            
+        self.target_vertex = target_vertex
+        self.path = array('i', path)
+        self.current_path_index = 0
+        self.status_code = MOVING
+        self.progress = 0.0
+        self.from_vertex = path[0]
+        self.to_vertex = path[1]
+        
+        self.log("assigned", "Robot %s assigned task to navigate to vertex %s via path %s",
+                 self.id, target_vertex, path)
+        return True
+    
+    def update(self, request_lane_func, release_lane_func) -> None:
+        """
+        Update the robot's state.
+        
+        Args:
+            request_lane_func: Function (robot_id, from_vertex, to_vertex) that
+                grants a lane or queues the robot for it.
+            release_lane_func: Function (robot_id, from_vertex, to_vertex) that
+                releases a lane.
+        """
+        status = self.status_code
+        if status == MOVING:
+            # Update progress along the current lane
+            self.progress += self.speed
+            
+            if self.progress >= 1.0:
+                self.reach_next_vertex(request_lane_func, release_lane_func)
+        elif status == WAITING:
+            # Queued for the lane; on_lane_granted resumes movement
+            self.waiting_time += 1
+    
+    def reach_next_vertex(self, request_lane_func, release_lane_func) -> None:
+        """
+        Hand the robot over from the lane it just finished to the next lane on its path.
+        The finished lane is only released once the robot is granted the next
+        one, since until then it is still standing at the end of it.
+        
+        Args:
+            request_lane_func: Function (robot_id, from_vertex, to_vertex) that
+                grants a lane, releasing the one the robot held, or queues the
+                robot for it.
+            release_lane_func: Function (robot_id, from_vertex, to_vertex) that
+                releases a lane.
+        """
+        # Reached the next vertex
+        self.progress = 0.0
+        self.current_vertex = self.to_vertex
+        self.log("reached", "Robot %s reached vertex %s", self.id, self.current_vertex)
+        
+        self.current_path_index += 1
+        
+        # Check if we've reached the destination
+        if self.current_path_index >= len(self.path) - 1:
+            release_lane_func(self.id, self.from_vertex, self.to_vertex)
+            self.status_code = TASK_COMPLETE
+            self.log("completed", "Robot %s completed task at vertex %s", self.id, self.current_vertex)
+            return
+            
+        # Start moving along the next lane
+        self.from_vertex = self.to_vertex
+        self.to_vertex = self.path[self.current_path_index + 1]
+        
+        # Request the next lane, queueing for it if it is occupied
+        if request_lane_func(self.id, self.from_vertex, self.to_vertex):
+            self.log("moving", "Robot %s moving from vertex %s to %s", self.id, self.from_vertex, self.to_vertex)
+        else:
+            self.status_code = WAITING
+            self.log("waiting", "Robot %s waiting at vertex %s - lane to %s occupied",
+                     self.id, self.current_vertex, self.to_vertex)
+    
+    def on_lane_granted(self) -> None:
+        """Resume movement after the lane the robot was queued for has been handed to it."""
+        self.status_code = MOVING
+        self.waiting_time = 0
+        self.log("resumed", "Robot %s resumed movement from vertex %s to %s",
+                 self.id, self.from_vertex, self.to_vertex)
+    
+    def get_position(self) -> Tuple[int, int, float]:
+        """
+        Get the current position of the robot.
+        
+        Returns:
+            Tuple of (from_vertex, to_vertex, progress) indicating the robot's position.
+        """
+        if self.status_code == MOVING:
+            return (self.from_vertex, self.to_vertex, self.progress)
+        return (self.current_vertex, self.current_vertex, 0.0)
+    
+    def get_status(self) -> RobotStatus:
+        """
+        Get the current status of the robot.
+        
+        Returns:
+            RobotStatus enum value.
+        """
+        return CODE_STATUSES[self.status_code]
+    
+    def is_selected(self, vertex_index: int) -> bool:
+        """
+        Check if the robot is at the specified vertex.
+        
+        Args:
+            vertex_index: The vertex to check.
+            
+        Returns:
+            True if the robot is at this vertex, False otherwise.
+        """
+        return self.current_vertex == vertex_index and self.status_code in (IDLE, WAITING, TASK_COMPLETE)
+    
+    def log(self, event: str, message: str, *args) -> None:
+        """
+        Log a robot action or status change.
+        The message is only formatted if the event is enabled.
+        
+        Args:
+            event: Event type, such as "moving" or "completed".
+            message: %-style format string.
+            *args: Arguments for the format string.
+        """
+        self.log_callback(self.id, event, message, *args)
\ No newline at end of file
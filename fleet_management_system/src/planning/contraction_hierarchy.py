@@ -0,0 +1,481 @@
+import heapq
+import math
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over the lane travel times of a NavGraph.
+
+    Vertices are contracted one at a time, least important first: each
+    contraction removes a vertex and adds a shortcut lane between each pair
+    of its remaining neighbours whose shortest connection ran through it, as
+    found by a bounded witness search. A query then only has to search
+    upwards, towards more important vertices, from both ends.
+
+    Every contraction remembers the shortcuts it added and the vertices its
+    witness searches scanned. When lane travel times change, only the
+    contractions that could have followed a changed lane are redone, in the
+    original order, and the shortcuts they change are propagated the same
+    way, so the hierarchy stays exact without being rebuilt.
+    """
+    WITNESS_SETTLE_LIMIT = 60  # Vertices each witness search may settle before giving up
+
+    def __init__(self, nav_graph):
+        """
+        Build the hierarchy.
+
+        Args:
+            nav_graph: NavGraph instance to plan over.
+        """
+        self.nav_graph = nav_graph
+        num_vertices = len(nav_graph.vertices)
+        self.num_vertices = num_vertices
+        self.rank = [num_vertices] * num_vertices  # Contraction order; uncontracted vertices rank last
+
+        # Lane (a, b) -> {creator: travel time}, where the creator is the
+        # vertex whose contraction added the shortcut, or -1 for a lane of the
+        # graph. The same dictionary is shared by out_edges[a][b] and in_edges[b][a].
+        self.out_edges: List[Dict[int, Dict[int, float]]] = [{} for _ in range(num_vertices)]
+        self.in_edges: List[Dict[int, Dict[int, float]]] = [{} for _ in range(num_vertices)]
+        self.shortcuts: List[Dict[Tuple[int, int], float]] = [{} for _ in range(num_vertices)]  # Added per contraction
+        # Vertices each contraction's witness searches scanned, with the cost
+        # each was reached at, and the largest cost the searches looked up to
+        self.footprints: List[Tuple[Tuple[int, ...], array]] = [((), array('d'))] * num_vertices
+        self.search_bounds = array('d', bytes(8 * num_vertices))
+        self.watchers: Optional[List[Dict[int, float]]] = None  # Vertex -> contraction -> cost it was scanned at
+
+        # Search graph: upward[v][w] is the travel time of lane v -> w and
+        # downward[v][u] that of lane u -> v, for higher-ranked w and u
+        self.upward: List[Dict[int, float]] = [{} for _ in range(num_vertices)]
+        self.downward: List[Dict[int, float]] = [{} for _ in range(num_vertices)]
+        self.via: Dict[Tuple[int, int], int] = {}  # Shortcut (u, w) -> vertex it bypasses
+        self.expansions: Dict[Tuple[int, int], Tuple[int, ...]] = {}  # Shortcut -> lanes it stands for, filled by queries
+
+        for from_vertex in range(num_vertices):
+            for to_vertex, lane_id in nav_graph.lane_ids[from_vertex].items():
+                if from_vertex != to_vertex:
+                    self._get_contributions(from_vertex, to_vertex)[-1] = nav_graph.lane_travel_times[lane_id]
+        self._contract_all()
+
+    def _get_contributions(self, from_vertex: int, to_vertex: int) -> Dict[int, float]:
+        """
+        Get the travel times recorded for a lane or shortcut, creating an empty entry if needed.
+
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+
+        Returns:
+            Dictionary mapping each creator (-1 for the graph's own lane) to a travel time.
+        """
+        contributions = self.out_edges[from_vertex].get(to_vertex)
+        if contributions is None:
+            contributions = self.out_edges[from_vertex][to_vertex] = {}
+            self.in_edges[to_vertex][from_vertex] = contributions
+        return contributions
+
+    def _get_lanes_at(self, edges: List[Dict[int, Dict[int, float]]], vertex: int,
+                      rank: int) -> Dict[int, float]:
+        """
+        Get the edges of a vertex as they stood when the vertex of a given rank was contracted.
+
+        Args:
+            edges: out_edges or in_edges.
+            vertex: Vertex index.
+            rank: Rank of the contraction.
+
+        Returns:
+            Dictionary mapping each neighbour ranked above the contraction to the edge's travel time.
+        """
+        ranks = self.rank
+        lanes = {}
+        for neighbour, contributions in edges[vertex].items():
+            if ranks[neighbour] > rank:
+                # Fastest travel time added before the contraction
+                weight = math.inf
+                for creator, travel_time in contributions.items():
+                    if travel_time < weight and (creator < 0 or ranks[creator] < rank):
+                        weight = travel_time
+                if weight < math.inf:
+                    lanes[neighbour] = weight
+        return lanes
+
+    def _contract(self, vertex: int, incoming: Dict[int, float], outgoing: Dict[int, float],
+                  get_lanes: Callable[[int], Dict[int, float]]) -> Tuple[Dict[Tuple[int, int], float],
+                                                                         Dict[int, float], float]:
+        """
+        Work out the shortcuts contracting a vertex needs.
+
+        Args:
+            vertex: Vertex index.
+            incoming: Neighbour -> travel time of its edge to the vertex, on the remaining graph.
+            outgoing: Neighbour -> travel time of the vertex's edge to it, on the remaining graph.
+            get_lanes: Function giving the outgoing edges of any vertex on the remaining graph.
+
+        Returns:
+            Tuple of the shortcuts, (u, w) -> travel time of u -> vertex -> w,
+            the vertices whose edges the witness searches scanned, with the
+            least cost each was reached at, and the largest search bound.
+        """
+        shortcuts = {}
+        footprint = {}
+        search_bound = 0.0
+        for u, to_vertex in incoming.items():
+            targets = {w: to_vertex + from_vertex for w, from_vertex in outgoing.items() if w != u}
+            if not targets:
+                continue
+
+            # Witness search: is there a path from u to each target, avoiding
+            # the vertex, that is no slower than going through it?
+            bound = max(targets.values())
+            search_bound = max(search_bound, bound)
+            costs = {u: 0.0}
+            open_set = [(0.0, u)]
+            remaining = len(targets)
+            settled = 0
+            while open_set and settled < self.WITNESS_SETTLE_LIMIT:
+                cost, current = heapq.heappop(open_set)
+                if cost > costs[current]:
+                    continue  # Stale entry, a cheaper route was found later
+                if cost > bound:
+                    break
+                settled += 1
+                if cost < footprint.get(current, math.inf):
+                    footprint[current] = cost
+                if current in targets:
+                    remaining -= 1
+                    if not remaining:
+                        break
+                for next_vertex, travel_time in get_lanes(current).items():
+                    next_cost = cost + travel_time
+                    if next_cost < costs.get(next_vertex, math.inf) and next_vertex != vertex:
+                        costs[next_vertex] = next_cost
+                        heapq.heappush(open_set, (next_cost, next_vertex))
+
+            for w, cost in targets.items():
+                if costs.get(w, math.inf) > cost:
+                    shortcuts[(u, w)] = cost
+        return shortcuts, footprint, search_bound
+
+    def _recontract(self, vertex: int) -> Tuple[Dict[Tuple[int, int], float], Dict[int, float], float]:
+        """
+        Work out the shortcuts a contracted vertex needs on the graph as it
+        stood at its contraction, given the current lane travel times.
+
+        Args:
+            vertex: Vertex index.
+
+        Returns:
+            Tuple of the shortcuts, the vertices scanned and the search bound, as for _contract.
+        """
+        rank = self.rank[vertex]
+        lanes: Dict[int, Dict[int, float]] = {}
+
+        def get_lanes(current: int) -> Dict[int, float]:
+            result = lanes.get(current)
+            if result is None:
+                result = lanes[current] = self._get_lanes_at(self.out_edges, current, rank)
+            return result
+
+        return self._contract(vertex, self._get_lanes_at(self.in_edges, vertex, rank), get_lanes(vertex), get_lanes)
+
+    def _contract_all(self) -> None:
+        """
+        Contract every vertex, choosing the order greedily: the next vertex is
+        the one whose contraction adds the fewest shortcuts relative to the
+        edges it removes, plus its depth, the length of the longest chain of
+        contracted neighbours below it, so that the hierarchy stays shallow.
+        Priorities are updated lazily.
+        """
+        # Remaining graph: edges between uncontracted vertices, at their fastest so far
+        remaining_out: List[Dict[int, float]] = [{} for _ in range(self.num_vertices)]
+        remaining_in: List[Dict[int, float]] = [{} for _ in range(self.num_vertices)]
+        for from_vertex, edges in enumerate(self.out_edges):
+            for to_vertex, contributions in edges.items():
+                remaining_out[from_vertex][to_vertex] = remaining_in[to_vertex][from_vertex] = contributions[-1]
+        depth = [0] * self.num_vertices
+
+        def contract(vertex: int) -> Tuple[int, Dict[Tuple[int, int], float], Dict[int, float], float]:
+            incoming, outgoing = remaining_in[vertex], remaining_out[vertex]
+            shortcuts, footprint, search_bound = self._contract(vertex, incoming, outgoing,
+                                                                remaining_out.__getitem__)
+            priority = len(shortcuts) - len(incoming) - len(outgoing) + depth[vertex]
+            return priority, shortcuts, footprint, search_bound
+
+        queue = [(contract(vertex)[0], vertex) for vertex in range(self.num_vertices)]
+        heapq.heapify(queue)
+
+        next_rank = 0
+        while queue:
+            _, vertex = heapq.heappop(queue)
+            priority, shortcuts, footprint, search_bound = contract(vertex)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, vertex))
+                continue
+
+            self.rank[vertex] = next_rank
+            next_rank += 1
+            self._set_footprint(vertex, footprint, search_bound)
+            self.shortcuts[vertex] = shortcuts
+            for (u, w), travel_time in shortcuts.items():
+                self._get_contributions(u, w)[vertex] = travel_time
+                if travel_time < remaining_out[u].get(w, math.inf):
+                    remaining_out[u][w] = remaining_in[w][u] = travel_time
+
+            # Edges to and from the vertex leave the remaining graph with it
+            for u in remaining_in[vertex]:
+                del remaining_out[u][vertex]
+                depth[u] = max(depth[u], depth[vertex] + 1)
+            for w in remaining_out[vertex]:
+                del remaining_in[w][vertex]
+                depth[w] = max(depth[w], depth[vertex] + 1)
+            remaining_in[vertex] = remaining_out[vertex] = {}
+
+        for from_vertex in range(self.num_vertices):
+            for to_vertex in self.out_edges[from_vertex]:
+                self._update_search_edge(from_vertex, to_vertex)
+
+    def _set_footprint(self, vertex: int, footprint: Dict[int, float], search_bound: float) -> None:
+        """
+        Record what a contraction's witness searches scanned.
+
+        Args:
+            vertex: Contracted vertex.
+            footprint: Scanned vertex -> least cost it was reached at.
+            search_bound: Largest cost the searches looked up to.
+        """
+        if self.watchers is not None:
+            for scanned in self.footprints[vertex][0]:
+                del self.watchers[scanned][vertex]
+            for scanned, cost in footprint.items():
+                self.watchers[scanned][vertex] = cost
+        self.footprints[vertex] = (tuple(footprint), array('d', footprint.values()))
+        self.search_bounds[vertex] = search_bound
+
+    def _update_search_edge(self, from_vertex: int, to_vertex: int) -> None:
+        """
+        Copy the fastest travel time recorded for an edge into the search graph.
+
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+        """
+        contributions = self.out_edges[from_vertex].get(to_vertex)
+        if self.rank[from_vertex] < self.rank[to_vertex]:
+            edges, lower, higher = self.upward, from_vertex, to_vertex
+        else:
+            edges, lower, higher = self.downward, to_vertex, from_vertex
+        if not contributions:
+            edges[lower].pop(higher, None)
+            self.via.pop((from_vertex, to_vertex), None)
+            return
+        creator = min(contributions, key=contributions.get)
+        edges[lower][higher] = contributions[creator]
+        if creator < 0:
+            self.via.pop((from_vertex, to_vertex), None)
+        else:
+            self.via[(from_vertex, to_vertex)] = creator
+
+    def update_lanes(self, lane_ids: List[int]) -> int:
+        """
+        Bring the hierarchy up to date after the travel times of some lanes
+        changed, keeping the contraction order. Contractions are redone in
+        order, starting with those that read a changed lane; a contraction
+        whose shortcuts change in turn marks the later contractions that read
+        them.
+
+        Args:
+            lane_ids: IDs of the lanes whose travel time changed.
+
+        Returns:
+            Number of contractions redone.
+        """
+        nav_graph = self.nav_graph
+        ranks = self.rank
+        self.expansions.clear()
+        if self.watchers is None:
+            self.watchers = [{} for _ in range(self.num_vertices)]
+            for vertex, (scanned_vertices, costs) in enumerate(self.footprints):
+                for scanned, cost in zip(scanned_vertices, costs):
+                    self.watchers[scanned][vertex] = cost
+
+        pending = []
+        queued = set()
+
+        def mark_changed(from_vertex: int, to_vertex: int, creator_rank: int, fastest: float) -> None:
+            # Contractions after the change that read the edge: the lower
+            # endpoint's own, and those whose witness searches scanned its
+            # start early enough to follow it within their bound, at the
+            # faster of its old and new travel times
+            lowest = min(ranks[from_vertex], ranks[to_vertex])
+            bounds = self.search_bounds
+            readers = [vertex for vertex, cost in self.watchers[from_vertex].items()
+                       if creator_rank < ranks[vertex] < lowest and cost + fastest <= bounds[vertex]]
+            readers.append(from_vertex if ranks[from_vertex] == lowest else to_vertex)
+            for vertex in readers:
+                if vertex not in queued:
+                    queued.add(vertex)
+                    heapq.heappush(pending, (ranks[vertex], vertex))
+            self._update_search_edge(from_vertex, to_vertex)
+
+        for lane_id in lane_ids:
+            from_vertex, to_vertex = nav_graph.get_lane_endpoints(lane_id)
+            if from_vertex == to_vertex or nav_graph.get_lane_id(from_vertex, to_vertex) != lane_id:
+                continue  # Not the lane routes follow between these vertices
+            contributions = self._get_contributions(from_vertex, to_vertex)
+            fastest = min(contributions.values())
+            contributions[-1] = nav_graph.lane_travel_times[lane_id]
+            mark_changed(from_vertex, to_vertex, -1, min(fastest, min(contributions.values())))
+
+        redone = 0
+        while pending:
+            rank, vertex = heapq.heappop(pending)
+            queued.discard(vertex)
+            redone += 1
+            shortcuts, footprint, search_bound = self._recontract(vertex)
+            self._set_footprint(vertex, footprint, search_bound)
+
+            old_shortcuts = self.shortcuts[vertex]
+            self.shortcuts[vertex] = shortcuts
+            for edge in set(old_shortcuts) | set(shortcuts):
+                travel_time = shortcuts.get(edge)
+                if travel_time == old_shortcuts.get(edge):
+                    continue
+                u, w = edge
+                contributions = self._get_contributions(u, w)
+                fastest = min(contributions.values(), default=math.inf)
+                if travel_time is None:
+                    del contributions[vertex]
+                else:
+                    contributions[vertex] = travel_time
+                mark_changed(u, w, rank, min(fastest, min(contributions.values(), default=math.inf)))
+                if not contributions:
+                    del self.out_edges[u][w]
+                    del self.in_edges[w][u]
+        return redone
+
+    def find_path(self, start_vertex: int, end_vertex: int) -> List[int]:
+        """
+        Find the fastest path with a bidirectional search: forwards from the
+        start and backwards from the end, both only towards higher-ranked
+        vertices, until neither search can improve on the best meeting vertex.
+
+        Args:
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+
+        Returns:
+            List of vertex indices from start to end, or an empty list if no path exists.
+        """
+        if start_vertex == end_vertex:
+            return [start_vertex]
+
+        searches = (
+            ({start_vertex: 0.0}, {start_vertex: -1}, [(0.0, start_vertex)], self.upward),
+            ({end_vertex: 0.0}, {end_vertex: -1}, [(0.0, end_vertex)], self.downward),
+        )
+        best_cost = math.inf
+        meeting_vertex = -1
+        forward_queue, backward_queue = searches[0][2], searches[1][2]
+
+        while forward_queue or backward_queue:
+            if forward_queue and (not backward_queue or forward_queue[0][0] <= backward_queue[0][0]):
+                costs, parents, open_set, edges = searches[0]
+                other_costs = searches[1][0]
+            else:
+                costs, parents, open_set, edges = searches[1]
+                other_costs = searches[0][0]
+
+            cost, vertex = heapq.heappop(open_set)
+            if cost >= best_cost:
+                open_set.clear()  # Nothing left in this direction can beat the best path
+                continue
+            if cost > costs[vertex]:
+                continue  # Stale entry, a cheaper route was found later
+            if vertex in other_costs and cost + other_costs[vertex] < best_cost:
+                best_cost = cost + other_costs[vertex]
+                meeting_vertex = vertex
+
+            for next_vertex, travel_time in edges[vertex].items():
+                next_cost = cost + travel_time
+                if next_cost < costs.get(next_vertex, math.inf):
+                    costs[next_vertex] = next_cost
+                    parents[next_vertex] = vertex
+                    heapq.heappush(open_set, (next_cost, next_vertex))
+
+        if meeting_vertex < 0:
+            return []
+
+        # Chain of hierarchy edges from start to end through the meeting vertex
+        hops = []
+        vertex = meeting_vertex
+        while vertex != -1:
+            hops.append(vertex)
+            vertex = searches[0][1][vertex]
+        hops.reverse()
+        vertex = searches[1][1][meeting_vertex]
+        while vertex != -1:
+            hops.append(vertex)
+            vertex = searches[1][1][vertex]
+        return self._unpack(hops)
+
+    def _unpack(self, hops: List[int]) -> List[int]:
+        """
+        Expand shortcuts in a chain of hierarchy edges into lanes of the graph.
+
+        Args:
+            hops: Vertices joined by hierarchy edges.
+
+        Returns:
+            Vertices of the same route joined by lanes.
+        """
+        path = [hops[0]]
+        for from_vertex, to_vertex in zip(hops, hops[1:]):
+            path.extend(self._expand(from_vertex, to_vertex))
+        return path
+
+    def _expand(self, from_vertex: int, to_vertex: int) -> Tuple[int, ...]:
+        """
+        Expand one hierarchy edge into lanes, remembering the result for shortcuts.
+
+        Args:
+            from_vertex: Starting vertex index.
+            to_vertex: Ending vertex index.
+
+        Returns:
+            Vertices the edge passes through after from_vertex, ending with to_vertex.
+        """
+        via, expansions = self.via, self.expansions
+        if (from_vertex, to_vertex) not in via:
+            return (to_vertex,)
+
+        # Expand nested shortcuts before the shortcuts made of them, without recursion
+        stack = [(from_vertex, to_vertex)]
+        while stack:
+            edge = stack[-1]
+            if edge in expansions:
+                stack.pop()
+                continue
+            middle = via[edge]
+            parts = ((edge[0], middle), (middle, edge[1]))
+            missing = [part for part in parts if part in via and part not in expansions]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            expansions[edge] = sum((expansions[part] if part in via else (part[1],) for part in parts), ())
+        return expansions[(from_vertex, to_vertex)]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the size of the hierarchy.
+
+        Returns:
+            Dictionary with the number of vertices, search edges and shortcuts among them.
+        """
+        return {
+            "vertices": self.num_vertices,
+            "edges": sum(map(len, self.upward)) + sum(map(len, self.downward)),
+            "shortcuts": len(self.via),
+        }
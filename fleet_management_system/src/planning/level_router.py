@@ -0,0 +1,206 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+class LevelRouter:
+    """
+    Hierarchical planner for routes between the levels of a NavGraph.
+    A route is first planned over the level graph, whose vertices are the
+    levels and whose edges are the transitions (lifts, ramps) between them,
+    and then within each level on that route in turn, searching only that
+    level's vertices from where the robot arrives to the transitions
+    leading on. Levels off the route are never searched.
+    """
+    def __init__(self, nav_graph):
+        """
+        Initialize the router.
+
+        Args:
+            nav_graph: NavGraph instance to plan over.
+        """
+        self.nav_graph = nav_graph
+        self.version = -1  # Graph version the level graph was built for
+        self.exits: Dict[Tuple[int, int], List[int]] = {}  # (from level, to level) -> transition lane IDs
+        self.level_graph: List[Dict[int, float]] = []  # Level -> next level -> cheapest transition time
+
+    def _refresh(self) -> None:
+        """Rebuild the level graph if the navigation graph has changed."""
+        nav_graph = self.nav_graph
+        if self.version == nav_graph.version:
+            return
+        self.exits = {}
+        self.level_graph = [{} for _ in nav_graph.level_names]
+        for lane_id in nav_graph.transition_lanes:
+            from_vertex, to_vertex = nav_graph.get_lane_endpoints(lane_id)
+            from_level = nav_graph.get_vertex_level(from_vertex)
+            to_level = nav_graph.get_vertex_level(to_vertex)
+            self.exits.setdefault((from_level, to_level), []).append(lane_id)
+            travel_time = nav_graph.lane_travel_times[lane_id]
+            self.level_graph[from_level][to_level] = min(
+                self.level_graph[from_level].get(to_level, math.inf), travel_time)
+        self.version = nav_graph.version
+
+    def is_cross_level(self, start_vertex: int, end_vertex: int) -> bool:
+        """
+        Check whether a route leaves the level it starts on.
+
+        Args:
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+
+        Returns:
+            True if both vertices exist and are on different levels.
+        """
+        start_level = self.nav_graph.get_vertex_level(start_vertex)
+        end_level = self.nav_graph.get_vertex_level(end_vertex)
+        return start_level is not None and end_level is not None and start_level != end_level
+
+    def get_level_route(self, start_level: int, end_level: int, weighted: bool = True) -> List[int]:
+        """
+        Find the sequence of levels to pass through between two levels.
+
+        Args:
+            start_level: Index of the starting level.
+            end_level: Index of the destination level.
+            weighted: True to minimise transition travel time, False to
+                minimise the number of transitions.
+
+        Returns:
+            List of level indices from start to end, or an empty list if no
+            transitions lead from one to the other.
+        """
+        self._refresh()
+        costs = {start_level: 0.0}
+        parents = {start_level: -1}
+        open_set = [(0.0, start_level)]
+        while open_set:
+            cost, level = heapq.heappop(open_set)
+            if level == end_level:
+                route = []
+                while level != -1:
+                    route.append(level)
+                    level = parents[level]
+                route.reverse()
+                return route
+            if cost > costs[level]:
+                continue
+            for next_level, travel_time in self.level_graph[level].items():
+                next_cost = cost + (travel_time if weighted else 1.0)
+                if next_cost < costs.get(next_level, math.inf):
+                    costs[next_level] = next_cost
+                    parents[next_level] = level
+                    heapq.heappush(open_set, (next_cost, next_level))
+        return []
+
+    def _search_level(self, level: int, sources: Dict[int, float], targets: set,
+                      weighted: bool) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """
+        Run a multi-source Dijkstra search confined to one level, stopping
+        once every target has been settled.
+
+        Args:
+            level: Index of the level.
+            sources: Vertex -> cost of reaching it before this level.
+            targets: Vertices to settle.
+            weighted: True for travel time costs, False for lane counts.
+
+        Returns:
+            Tuple of the settled cost of each target reached and the parent
+            of each reached vertex (-1 for sources).
+        """
+        nav_graph = self.nav_graph
+        lane_ids = nav_graph.lane_ids
+        travel_times = nav_graph.lane_travel_times
+        vertices = nav_graph.get_level_vertices(level)
+        first, last = vertices.start, vertices.stop
+
+        costs = dict(sources)
+        parents = {vertex: -1 for vertex in sources}
+        open_set = [(cost, vertex) for vertex, cost in sources.items()]
+        heapq.heapify(open_set)
+        settled: Dict[int, float] = {}
+        remaining = len(targets)
+
+        while open_set and remaining:
+            cost, vertex = heapq.heappop(open_set)
+            if cost > costs[vertex]:
+                continue  # Stale entry, a cheaper route was found later
+            if vertex in targets and vertex not in settled:
+                settled[vertex] = cost
+                remaining -= 1
+            for next_vertex, lane_id in lane_ids[vertex].items():
+                if not first <= next_vertex < last:
+                    continue
+                next_cost = cost + (travel_times[lane_id] if weighted else 1.0)
+                if next_cost < costs.get(next_vertex, math.inf):
+                    costs[next_vertex] = next_cost
+                    parents[next_vertex] = vertex
+                    heapq.heappush(open_set, (next_cost, next_vertex))
+        return settled, parents
+
+    def find_path(self, start_vertex: int, end_vertex: int, weighted: bool = True) -> Optional[List[int]]:
+        """
+        Find a path between vertices on different levels.
+
+        Args:
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+            weighted: True to minimise travel time, False to minimise the number of lanes.
+
+        Returns:
+            List of vertex indices from start to end, or None if no path
+            follows the level route, in which case the caller should search
+            the whole graph.
+        """
+        nav_graph = self.nav_graph
+        level_route = self.get_level_route(nav_graph.get_vertex_level(start_vertex),
+                                           nav_graph.get_vertex_level(end_vertex), weighted)
+        if not level_route:
+            return None
+
+        sources = {start_vertex: 0.0}
+        layers: List[Dict[int, int]] = []  # Parents of each level's search
+        crossings: List[Dict[int, int]] = []  # Entry vertex -> exit vertex on the previous level
+        for position, level in enumerate(level_route):
+            if position + 1 == len(level_route):
+                settled, parents = self._search_level(level, sources, {end_vertex}, weighted)
+                layers.append(parents)
+                if end_vertex not in settled:
+                    return None
+                break
+
+            exit_lanes = self.exits[(level, level_route[position + 1])]
+            exit_vertices = {nav_graph.get_lane_endpoints(lane_id)[0] for lane_id in exit_lanes}
+            settled, parents = self._search_level(level, sources, exit_vertices, weighted)
+            layers.append(parents)
+
+            # Cross to the next level through the reached transitions
+            next_sources: Dict[int, float] = {}
+            crossing: Dict[int, int] = {}
+            for lane_id in exit_lanes:
+                from_vertex, to_vertex = nav_graph.get_lane_endpoints(lane_id)
+                if from_vertex not in settled:
+                    continue
+                cost = settled[from_vertex] + (nav_graph.lane_travel_times[lane_id] if weighted else 1.0)
+                if cost < next_sources.get(to_vertex, math.inf):
+                    next_sources[to_vertex] = cost
+                    crossing[to_vertex] = from_vertex
+            if not next_sources:
+                return None
+            crossings.append(crossing)
+            sources = next_sources
+
+        # Walk back through the levels, jumping across each transition
+        path = []
+        vertex = end_vertex
+        for position in range(len(layers) - 1, -1, -1):
+            parents = layers[position]
+            while True:
+                path.append(vertex)
+                if parents[vertex] == -1:
+                    break
+                vertex = parents[vertex]
+            if position > 0:
+                vertex = crossings[position - 1][vertex]
+        path.reverse()
+        return path
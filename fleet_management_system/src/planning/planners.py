@@ -0,0 +1,256 @@
+import heapq
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Type
+
+from planning.contraction_hierarchy import ContractionHierarchy
+
+class PathPlanner:
+    """
+    Base class for path planners operating on a NavGraph.
+    Subclasses implement find_path and register themselves in PLANNERS.
+    """
+    name = ""
+    weighted = True  # Whether the planner minimises travel time rather than lane count
+    use_level_router = True  # Whether NavGraph plans routes between levels with its LevelRouter instead
+
+    def __init__(self, nav_graph):
+        """
+        Initialize the planner.
+
+        Args:
+            nav_graph: NavGraph instance to plan over.
+        """
+        self.nav_graph = nav_graph
+
+    def find_path(self, start_vertex: int, end_vertex: int,
+                  avoid_lanes: Optional[Set[int]] = None) -> List[int]:
+        """
+        Find a path from start_vertex to end_vertex.
+
+        Args:
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+            avoid_lanes: IDs of lanes the path must not use.
+
+        Returns:
+            List of vertex indices representing the path (including start and end),
+            or an empty list if no path exists.
+        """
+        raise NotImplementedError
+
+    def prepare(self) -> None:
+        """Do any preprocessing the planner needs now rather than on the first query."""
+
+    def _is_valid_vertex(self, vertex_index: int) -> bool:
+        """
+        Check if a vertex index exists in the graph.
+
+        Args:
+            vertex_index: Index of the vertex.
+
+        Returns:
+            True if the vertex exists, False otherwise.
+        """
+        return 0 <= vertex_index < len(self.nav_graph.vertices)
+
+    @staticmethod
+    def _reconstruct_path(parents: Dict[int, int], end_vertex: int) -> List[int]:
+        """
+        Walk parent pointers back from the end vertex.
+
+        Args:
+            parents: Dictionary mapping each reached vertex to its predecessor
+                (the start vertex maps to -1).
+            end_vertex: Vertex to walk back from.
+
+        Returns:
+            List of vertex indices from start to end.
+        """
+        path = []
+        vertex = end_vertex
+        while vertex != -1:
+            path.append(vertex)
+            vertex = parents[vertex]
+        path.reverse()
+        return path
+
+class BFSPlanner(PathPlanner):
+    """Breadth-first search; minimises the number of lanes travelled."""
+    name = "bfs"
+    weighted = False
+
+    def find_path(self, start_vertex: int, end_vertex: int,
+                  avoid_lanes: Optional[Set[int]] = None) -> List[int]:
+        if not (self._is_valid_vertex(start_vertex) and self._is_valid_vertex(end_vertex)):
+            return []
+        if start_vertex == end_vertex:
+            return [start_vertex]
+
+        lane_ids = self.nav_graph.lane_ids
+        parents = {start_vertex: -1}
+        queue = deque([start_vertex])
+
+        while queue:
+            vertex = queue.popleft()
+            for next_vertex, lane_id in lane_ids[vertex].items():
+                if next_vertex in parents or (avoid_lanes and lane_id in avoid_lanes):
+                    continue
+                parents[next_vertex] = vertex
+                if next_vertex == end_vertex:
+                    return self._reconstruct_path(parents, end_vertex)
+                queue.append(next_vertex)
+
+        # No path found
+        return []
+
+class DijkstraPlanner(PathPlanner):
+    """Dijkstra's algorithm; minimises travel time using lane lengths and speed limits."""
+    name = "dijkstra"
+
+    def _heuristic(self, vertex_index: int, end_vertex: int) -> float:
+        """
+        Estimate the remaining travel time from a vertex to the end vertex.
+
+        Args:
+            vertex_index: Index of the vertex.
+            end_vertex: Index of the destination vertex.
+
+        Returns:
+            Lower bound on the travel time; Dijkstra uses no estimate.
+        """
+        return 0.0
+
+    def find_path(self, start_vertex: int, end_vertex: int,
+                  avoid_lanes: Optional[Set[int]] = None) -> List[int]:
+        if not (self._is_valid_vertex(start_vertex) and self._is_valid_vertex(end_vertex)):
+            return []
+        if start_vertex == end_vertex:
+            return [start_vertex]
+
+        lane_ids = self.nav_graph.lane_ids
+        travel_times = self.nav_graph.lane_travel_times
+        heuristic = self._heuristic
+
+        costs = {start_vertex: 0.0}
+        parents = {start_vertex: -1}
+        open_set = [(heuristic(start_vertex, end_vertex), 0.0, start_vertex)]
+
+        while open_set:
+            _, cost, vertex = heapq.heappop(open_set)
+            if vertex == end_vertex:
+                return self._reconstruct_path(parents, end_vertex)
+            if cost > costs[vertex]:
+                continue  # Stale entry, a cheaper route was found later
+
+            for next_vertex, lane_id in lane_ids[vertex].items():
+                if avoid_lanes and lane_id in avoid_lanes:
+                    continue
+                next_cost = cost + travel_times[lane_id]
+                if next_cost < costs.get(next_vertex, math.inf):
+                    costs[next_vertex] = next_cost
+                    parents[next_vertex] = vertex
+                    heapq.heappush(
+                        open_set,
+                        (next_cost + heuristic(next_vertex, end_vertex), next_cost, next_vertex)
+                    )
+
+        # No path found
+        return []
+
+class AStarPlanner(DijkstraPlanner):
+    """A* search with a straight-line travel time heuristic."""
+    name = "astar"
+
+    def _heuristic(self, vertex_index: int, end_vertex: int) -> float:
+        # Straight-line distance at the fastest lane speed never overestimates
+        nav_graph = self.nav_graph
+        xs, ys = nav_graph.vertex_xs, nav_graph.vertex_ys
+        distance = math.hypot(xs[end_vertex] - xs[vertex_index], ys[end_vertex] - ys[vertex_index])
+        return distance / nav_graph.max_lane_speed
+
+class ContractionHierarchyPlanner(AStarPlanner):
+    """
+    Bidirectional search over a contraction hierarchy; minimises travel time
+    like Dijkstra but only searches a small part of the graph per query.
+    The hierarchy is built on first use. If lane travel times change, only
+    the affected part is redone; if vertices or lanes are added, it is
+    rebuilt. Queries that avoid lanes fall back to A*.
+    """
+    name = "ch"
+    use_level_router = False  # The hierarchy already spans every level
+
+    def __init__(self, nav_graph):
+        """
+        Initialize the planner.
+
+        Args:
+            nav_graph: NavGraph instance to plan over.
+        """
+        super().__init__(nav_graph)
+        self.hierarchy: Optional[ContractionHierarchy] = None
+        self.version = -1  # Graph version the hierarchy is up to date with
+        self.topology_version = -1  # Graph topology version the hierarchy was built for
+        self.travel_times: List[float] = []  # Lane travel times the hierarchy was built with
+        self.lock = threading.Lock()  # Queries may come from planning worker threads
+
+    def _get_hierarchy(self) -> ContractionHierarchy:
+        """
+        Get the contraction hierarchy, bringing it up to date with the graph.
+
+        Returns:
+            ContractionHierarchy for the current graph version.
+        """
+        nav_graph = self.nav_graph
+        if self.hierarchy is not None and self.version == nav_graph.version:
+            return self.hierarchy
+        travel_times = nav_graph.lane_travel_times
+        if self.hierarchy is None or self.topology_version != nav_graph.topology_version:
+            self.hierarchy = ContractionHierarchy(nav_graph)
+        else:
+            changed = [lane_id for lane_id, (old, new) in enumerate(zip(self.travel_times, travel_times))
+                       if old != new]
+            self.hierarchy.update_lanes(changed)
+        self.travel_times = list(travel_times)
+        self.version = nav_graph.version
+        self.topology_version = nav_graph.topology_version
+        return self.hierarchy
+
+    def prepare(self) -> None:
+        """Build the contraction hierarchy, or bring it up to date with the graph."""
+        with self.lock:
+            self._get_hierarchy()
+
+    def find_path(self, start_vertex: int, end_vertex: int,
+                  avoid_lanes: Optional[Set[int]] = None) -> List[int]:
+        if avoid_lanes:
+            return super().find_path(start_vertex, end_vertex, avoid_lanes)
+        if not (self._is_valid_vertex(start_vertex) and self._is_valid_vertex(end_vertex)):
+            return []
+        with self.lock:
+            return self._get_hierarchy().find_path(start_vertex, end_vertex)
+
+# Registry of available planners by name
+PLANNERS: Dict[str, Type[PathPlanner]] = {
+    planner.name: planner
+    for planner in (BFSPlanner, DijkstraPlanner, AStarPlanner, ContractionHierarchyPlanner)
+}
+
+def create_planner(name: str, nav_graph) -> PathPlanner:
+    """
+    Create a planner by name.
+
+    Args:
+        name: Planner name (one of PLANNERS).
+        nav_graph: NavGraph instance to plan over.
+
+    Returns:
+        PathPlanner instance.
+
+    Raises:
+        ValueError: If no planner with the given name exists.
+    """
+    if name not in PLANNERS:
+        raise ValueError(f"Unknown planner '{name}', expected one of {sorted(PLANNERS)}")
+    return PLANNERS[name](nav_graph)
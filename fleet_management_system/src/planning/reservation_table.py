@@ -0,0 +1,116 @@
+import bisect
+import heapq
+from array import array
+from typing import Dict, List, Tuple
+
+# Reservations are half-open tick intervals [start, end)
+Interval = Tuple[int, int]
+
+class ReservationTable:
+    """
+    Space-time reservation table for lanes.
+    Records, for each lane, the tick intervals during which robots are
+    planned to hold it, so new routes can be planned around them.
+    """
+    def __init__(self):
+        """Initialize an empty reservation table."""
+        self.lane_reservations: Dict[int, List[Tuple[int, int, str]]] = {}  # Lane ID -> sorted (start, end, robot ID)
+        self.robot_reservations: Dict[str, array] = {}  # Robot ID -> flattened (lane ID, start, end) triples
+        self.robot_expiry: Dict[str, int] = {}  # Robot ID -> tick at which its last reservation ends
+        self.expiry_heap: List[Tuple[int, str]] = []  # (expiry tick, robot ID); entries replaced later are skipped
+
+    def reserve(self, robot_id: str, reservations: List[Tuple[int, int, int]]) -> None:
+        """
+        Replace a robot's reservations.
+
+        Args:
+            robot_id: ID of the robot.
+            reservations: List of (lane ID, start tick, end tick) intervals.
+        """
+        self.release(robot_id)
+        flattened = array('q')
+        for lane_id, start, end in reservations:
+            bisect.insort(self.lane_reservations.setdefault(lane_id, []), (start, end, robot_id))
+            flattened.extend((lane_id, start, end))
+        self.robot_reservations[robot_id] = flattened
+        if flattened:
+            expiry = max(flattened[2::3])
+            self.robot_expiry[robot_id] = expiry
+            heapq.heappush(self.expiry_heap, (expiry, robot_id))
+
+    def release(self, robot_id: str) -> None:
+        """
+        Remove all reservations of a robot.
+
+        Args:
+            robot_id: ID of the robot.
+        """
+        flattened = self.robot_reservations.pop(robot_id, ())
+        self.robot_expiry.pop(robot_id, None)
+        for i in range(0, len(flattened), 3):
+            lane_id, start, end = flattened[i:i + 3]
+            lane_reservations = self.lane_reservations[lane_id]
+            index = bisect.bisect_left(lane_reservations, (start, end, robot_id))
+            if index < len(lane_reservations) and lane_reservations[index] == (start, end, robot_id):
+                del lane_reservations[index]
+            if not lane_reservations:
+                del self.lane_reservations[lane_id]
+
+    def prune(self, now: int) -> None:
+        """
+        Drop the reservations of every robot whose reservations have all
+        ended by the given tick. Robots are kept on a heap by the tick their
+        last reservation ends, so this only looks at robots that expired.
+
+        Args:
+            now: Current tick.
+        """
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, robot_id = heapq.heappop(heap)
+            if self.robot_expiry.get(robot_id) == expiry:
+                self.release(robot_id)
+
+    def get_safe_intervals(self, lane_id: int, from_tick: int, exclude_robot: str = None) -> List[Interval]:
+        """
+        Get the intervals during which a lane is not reserved.
+
+        Args:
+            lane_id: ID of the lane.
+            from_tick: Earliest tick of interest.
+            exclude_robot: Robot whose own reservations are ignored.
+
+        Returns:
+            Sorted list of free [start, end) intervals from from_tick onwards;
+            the last one is open-ended (end is float('inf')).
+        """
+        intervals = []
+        start = from_tick
+        for reserved_start, reserved_end, robot_id in self.lane_reservations.get(lane_id, ()):
+            if robot_id == exclude_robot or reserved_end <= start:
+                continue
+            if reserved_start > start:
+                intervals.append((start, reserved_start))
+            start = max(start, reserved_end)
+        intervals.append((start, float('inf')))
+        return intervals
+
+    def is_free(self, lane_id: int, start: int, end: int, exclude_robot: str = None) -> bool:
+        """
+        Check if a lane is unreserved over an interval.
+
+        Args:
+            lane_id: ID of the lane.
+            start: First tick of the interval.
+            end: Tick after the interval.
+            exclude_robot: Robot whose own reservations are ignored.
+
+        Returns:
+            True if no other robot has reserved the lane during [start, end).
+        """
+        for reserved_start, reserved_end, robot_id in self.lane_reservations.get(lane_id, ()):
+            if reserved_start >= end:
+                break
+            if robot_id != exclude_robot and reserved_end > start:
+                return False
+        return True
@@ -0,0 +1,185 @@
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+class RouteCache:
+    """
+    LRU-bounded cache of planned routes.
+    Entries are only valid for the graph version they were planned on; the
+    whole cache is dropped as soon as a lookup sees a newer version.
+    Lookups and stores are locked, since routes may be planned on several threads.
+    """
+    def __init__(self, max_size: int = 1024):
+        """
+        Initialize the route cache.
+
+        Args:
+            max_size: Maximum number of routes kept; 0 disables the cache.
+        """
+        self.max_size = max_size
+        self.version = None  # Graph version the cached routes belong to
+        self.routes: "OrderedDict[Tuple[str, int, int], Tuple[int, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def _check_version(self, version: int) -> None:
+        """
+        Drop all cached routes if the graph has changed since they were stored.
+
+        Args:
+            version: Current graph version.
+        """
+        if version != self.version:
+            if self.routes:
+                self.routes.clear()
+                self.invalidations += 1
+            self.version = version
+
+    def get(self, planner: str, start_vertex: int, end_vertex: int, version: int) -> Optional[List[int]]:
+        """
+        Look up a cached route.
+
+        Args:
+            planner: Name of the planner the route was planned with.
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+            version: Current graph version.
+
+        Returns:
+            A copy of the cached path, or None on a miss.
+        """
+        key = (planner, start_vertex, end_vertex)
+        with self.lock:
+            self._check_version(version)
+            path = self.routes.get(key)
+            if path is None:
+                self.misses += 1
+                return None
+            self.routes.move_to_end(key)
+            self.hits += 1
+        return list(path)
+
+    def put(self, planner: str, start_vertex: int, end_vertex: int, version: int, path: List[int]) -> None:
+        """
+        Store a planned route, evicting the least recently used one if full.
+
+        Args:
+            planner: Name of the planner the route was planned with.
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+            version: Graph version the route was planned on.
+            path: Planned path (an empty list records that no path exists).
+        """
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self._check_version(version)
+            self.routes[(planner, start_vertex, end_vertex)] = tuple(path)
+            if len(self.routes) > self.max_size:
+                self.routes.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss statistics.
+
+        Returns:
+            Dictionary of counters and the current number of cached routes.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self.routes),
+        }
+
+class NextHopTable:
+    """
+    Precomputed all-pairs next-hop table.
+    next_hops[target][vertex] is the vertex to move to from `vertex` on a
+    shortest route to `target`, or -1 if `target` cannot be reached. The table
+    takes O(V^2) memory, so it is only meant for small graphs.
+    """
+    def __init__(self, nav_graph, weighted: bool = True):
+        """
+        Build the table with one reverse Dijkstra search per target vertex.
+
+        Args:
+            nav_graph: NavGraph instance to build the table for.
+            weighted: True to minimise lane travel time, False to minimise
+                the number of lanes.
+        """
+        self.version = nav_graph.version
+        self.weighted = weighted
+        self.lookups = 0
+        self.next_hops: List[List[int]] = [
+            self._build_next_hops(nav_graph, target)
+            for target in range(len(nav_graph.vertices))
+        ]
+
+    def _build_next_hops(self, nav_graph, target: int) -> List[int]:
+        """
+        Search backwards from a target to find every vertex's next hop towards it.
+
+        Args:
+            nav_graph: NavGraph instance.
+            target: Target vertex index.
+
+        Returns:
+            List mapping each vertex index to its next hop (-1 if unreachable).
+        """
+        num_vertices = len(nav_graph.vertices)
+        next_hops = [-1] * num_vertices
+        costs = [math.inf] * num_vertices
+        costs[target] = 0.0
+        next_hops[target] = target
+        open_set = [(0.0, target)]
+
+        while open_set:
+            cost, vertex = heapq.heappop(open_set)
+            if cost > costs[vertex]:
+                continue
+            for prev_vertex in nav_graph.reverse_adjacency[vertex]:
+                if self.weighted:
+                    lane_id = nav_graph.lane_ids[prev_vertex][vertex]
+                    prev_cost = cost + nav_graph.lane_travel_times[lane_id]
+                else:
+                    prev_cost = cost + 1.0
+                if prev_cost < costs[prev_vertex]:
+                    costs[prev_vertex] = prev_cost
+                    next_hops[prev_vertex] = vertex
+                    heapq.heappush(open_set, (prev_cost, prev_vertex))
+
+        return next_hops
+
+    def find_path(self, start_vertex: int, end_vertex: int) -> List[int]:
+        """
+        Follow next hops from the start vertex to the end vertex.
+
+        Args:
+            start_vertex: Starting vertex index.
+            end_vertex: Ending vertex index.
+
+        Returns:
+            List of vertex indices representing the path, or an empty list if
+            no path exists.
+        """
+        self.lookups += 1
+        if not (0 <= start_vertex < len(self.next_hops) and 0 <= end_vertex < len(self.next_hops)):
+            return []
+        next_hops = self.next_hops[end_vertex]
+        if next_hops[start_vertex] == -1:
+            return []
+
+        path = [start_vertex]
+        vertex = start_vertex
+        while vertex != end_vertex:
+            vertex = next_hops[vertex]
+            path.append(vertex)
+        return path
@@ -0,0 +1,170 @@
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from planning.reservation_table import ReservationTable
+
+class TimedPlan:
+    """A path together with the tick at which the robot enters each of its lanes."""
+    def __init__(self, path: List[int], lane_ids: List[int], enter_ticks: List[int], arrival_tick: int):
+        """
+        Initialize the plan.
+
+        Args:
+            path: Vertex indices from start to goal.
+            lane_ids: ID of each lane along the path.
+            enter_ticks: Tick at which the robot enters each lane.
+            arrival_tick: Tick at which the robot reaches the goal.
+        """
+        self.path = path
+        self.lane_ids = lane_ids
+        self.enter_ticks = enter_ticks
+        self.arrival_tick = arrival_tick
+
+    def get_reservations(self) -> List[Tuple[int, int, int]]:
+        """
+        Get the lane intervals this plan occupies. A robot holds each lane
+        from entering it until it enters the next one, so waiting at a vertex
+        extends the hold on the lane it arrived by.
+
+        Returns:
+            List of (lane ID, start tick, end tick) intervals.
+        """
+        ends = self.enter_ticks[1:] + [self.arrival_tick]
+        return list(zip(self.lane_ids, self.enter_ticks, ends))
+
+class SIPPPlanner:
+    """
+    Safe Interval Path Planning over lane reservations.
+    Each search state is a lane together with one of its safe (unreserved)
+    intervals, so waiting is only considered where it changes the outcome.
+    Every lane takes the same number of ticks to traverse, matching how
+    robots advance a fixed amount of progress per tick.
+    """
+    name = "sipp"
+
+    def __init__(self, nav_graph, reservation_table: ReservationTable, max_expansions: int = 100000):
+        """
+        Initialize the planner.
+
+        Args:
+            nav_graph: NavGraph instance to plan over.
+            reservation_table: Reservations of the other robots' plans.
+            max_expansions: Search states to expand before giving up.
+        """
+        self.nav_graph = nav_graph
+        self.reservation_table = reservation_table
+        self.max_expansions = max_expansions
+
+    def _hops_to_goal(self, goal: int) -> Dict[int, int]:
+        """
+        Count the lanes from every vertex to the goal with a reverse BFS.
+
+        Args:
+            goal: Goal vertex index.
+
+        Returns:
+            Dictionary mapping each vertex that can reach the goal to its lane count.
+        """
+        hops = {goal: 0}
+        queue = deque([goal])
+        while queue:
+            vertex = queue.popleft()
+            for prev_vertex in self.nav_graph.reverse_adjacency[vertex]:
+                if prev_vertex not in hops:
+                    hops[prev_vertex] = hops[vertex] + 1
+                    queue.append(prev_vertex)
+        return hops
+
+    def plan(self, robot_id: str, start_vertex: int, goal_vertex: int, start_tick: int,
+             ticks_per_lane: int, avoid_lanes: Optional[Set[int]] = None) -> Optional[TimedPlan]:
+        """
+        Plan the earliest-arriving route that avoids every reserved lane interval.
+
+        Args:
+            robot_id: ID of the robot; its own reservations are ignored.
+            start_vertex: Starting vertex index.
+            goal_vertex: Goal vertex index.
+            start_tick: Tick at which the robot can leave the start vertex.
+            ticks_per_lane: Ticks the robot takes to traverse a lane.
+            avoid_lanes: IDs of lanes the route must not use.
+
+        Returns:
+            TimedPlan, or None if the goal cannot be reached.
+        """
+        num_vertices = len(self.nav_graph.vertices)
+        if not (0 <= start_vertex < num_vertices and 0 <= goal_vertex < num_vertices):
+            return None
+        hops = self._hops_to_goal(goal_vertex)
+        if start_vertex not in hops:
+            return None
+        if start_vertex == goal_vertex:
+            return TimedPlan([start_vertex], [], [], start_tick)
+
+        lane_ids = self.nav_graph.lane_ids
+        reservations = self.reservation_table
+        # A state is (lane ID, safe interval start) with the robot at the lane's end;
+        # None is the start vertex, where the robot holds no lane and can wait freely
+        start_state = (None, start_tick)
+        arrivals = {start_state: start_tick}
+        parents: Dict[tuple, Tuple[Optional[tuple], int]] = {start_state: (None, start_tick)}
+        state_info = {start_state: (start_vertex, float('inf'))}  # Vertex and latest departure tick
+        open_set = [(start_tick + hops[start_vertex] * ticks_per_lane, start_tick, start_state)]
+        expansions = 0
+
+        while open_set and expansions < self.max_expansions:
+            _, arrival, state = heapq.heappop(open_set)
+            if arrival > arrivals[state]:
+                continue
+            expansions += 1
+            vertex, latest_departure = state_info[state]
+            if vertex == goal_vertex:
+                return self._build_plan(state, parents, state_info, arrival)
+
+            for next_vertex, lane_id in lane_ids[vertex].items():
+                if next_vertex not in hops or (avoid_lanes and lane_id in avoid_lanes):
+                    continue
+                for safe_start, safe_end in reservations.get_safe_intervals(lane_id, arrival, robot_id):
+                    departure = max(arrival, safe_start)
+                    if departure > latest_departure:
+                        break
+                    if departure + ticks_per_lane > safe_end:
+                        continue
+                    next_state = (lane_id, safe_start)
+                    next_arrival = departure + ticks_per_lane
+                    if next_arrival < arrivals.get(next_state, float('inf')):
+                        arrivals[next_state] = next_arrival
+                        parents[next_state] = (state, departure)
+                        state_info[next_state] = (next_vertex, safe_end)
+                        heapq.heappush(
+                            open_set,
+                            (next_arrival + hops[next_vertex] * ticks_per_lane, next_arrival, next_state)
+                        )
+        return None
+
+    def _build_plan(self, state: tuple, parents: Dict[tuple, Tuple[Optional[tuple], int]],
+                    state_info: Dict[tuple, Tuple[int, float]], arrival: int) -> TimedPlan:
+        """
+        Walk parent pointers back from the goal state.
+
+        Args:
+            state: Goal search state.
+            parents: Maps each state to (parent state, tick the robot left the parent).
+            state_info: Maps each state to (vertex, latest departure tick).
+            arrival: Tick at which the robot reaches the goal.
+
+        Returns:
+            TimedPlan from the start vertex to the goal.
+        """
+        path, lane_ids, enter_ticks = [], [], []
+        while state is not None:
+            path.append(state_info[state][0])
+            parent, departure = parents[state]
+            if parent is not None:
+                lane_ids.append(state[0])
+                enter_ticks.append(departure)
+            state = parent
+        path.reverse()
+        lane_ids.reverse()
+        enter_ticks.reverse()
+        return TimedPlan(path, lane_ids, enter_ticks, arrival)
@@ -0,0 +1,74 @@
+from typing import List, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+def build_lane_matrix(nav_graph, weighted: bool = True) -> csr_matrix:
+    """
+    Build a sparse adjacency matrix of the lanes.
+
+    Args:
+        nav_graph: NavGraph instance.
+        weighted: True to use lane travel times as entries, False to count lanes.
+
+    Returns:
+        Matrix whose entry [from, to] is the cost of the lane between the vertices.
+    """
+    rows, columns, costs = [], [], []
+    for from_vertex in range(len(nav_graph.vertices)):
+        for to_vertex, lane_id in nav_graph.lane_ids[from_vertex].items():
+            rows.append(from_vertex)
+            columns.append(to_vertex)
+            costs.append(nav_graph.lane_travel_times[lane_id] if weighted else 1.0)
+    num_vertices = len(nav_graph.vertices)
+    return csr_matrix((costs, (rows, columns)), shape=(num_vertices, num_vertices))
+
+def compute_travel_times(nav_graph, sources: List[int], targets: List[int], reverse: bool = False,
+                         weighted: bool = True) -> np.ndarray:
+    """
+    Compute shortest travel times between every source and target vertex,
+    with one multi-source Dijkstra search.
+
+    Args:
+        nav_graph: NavGraph instance.
+        sources: Source vertex indices.
+        targets: Target vertex indices.
+        reverse: True to follow lanes backwards, giving the travel time from
+            each target to each source instead.
+        weighted: True to use lane travel times, False to count lanes.
+
+    Returns:
+        Array of shape (len(sources), len(targets)); unreachable targets have
+        infinite travel time.
+    """
+    lanes = build_lane_matrix(nav_graph, weighted)
+    if reverse:
+        lanes = lanes.T.tocsr()
+    times = dijkstra(lanes, directed=True, indices=sources)
+    return times[:, targets]
+
+def solve_assignment(costs: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Find the rows-to-columns matching with the lowest total cost, using
+    SciPy's Hungarian-style linear sum assignment solver.
+
+    Args:
+        costs: Cost matrix; infinite entries are pairs that cannot be matched.
+
+    Returns:
+        List of (row, column) pairs. Every row is matched if there are no
+        more rows than columns (and every column otherwise), except rows
+        or columns that can only be matched at infinite cost.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    if costs.size == 0:
+        return []
+
+    # Forbidden pairs get a cost higher than any complete finite matching, so
+    # as many pairs as possible are matched at finite cost; they are then dropped
+    finite = np.isfinite(costs)
+    forbidden_cost = (np.abs(costs[finite]).sum() + 1.0) * (min(costs.shape) + 1) if finite.any() else 1.0
+    rows, columns = linear_sum_assignment(np.where(finite, costs, forbidden_cost))
+    return [(int(row), int(column)) for row, column in zip(rows, columns) if finite[row, column]]
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import argparse
+from collections import deque
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.event_journal import EVENT_NAMES, JournalReader
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Rebuild fleet state from a binary event journal.")
+    parser.add_argument("journal", help="Path to a journal written with simulate.py --journal.")
+    parser.add_argument("--tick", type=int, default=None,
+                        help="Tick to rebuild the fleet state at; defaults to the end of the journal.")
+    parser.add_argument("--robot", default=None, help="Only show the robot with this ID.")
+    parser.add_argument("--events", type=int, default=0,
+                        help="Also list this many events leading up to the tick.")
+    return parser.parse_args()
+
+def main():
+    """
+    Print the fleet state at a tick of a recorded run.
+    """
+    args = parse_args()
+    reader = JournalReader(args.journal)
+    if reader.num_records == 0:
+        print("Journal is empty")
+        return
+
+    robot_filter = None
+    if args.robot is not None:
+        robot_filter = reader.robot_numbers.get(args.robot)
+        if robot_filter is None:
+            print(f"Robot {args.robot} is not in the journal")
+            reader.close()
+            return
+
+    tick = args.tick
+    if tick is None:
+        tick = next(reader.iter_records(reader.num_records - 1))[0]
+
+    start = time.perf_counter()
+    state = reader.state_at(tick)
+    elapsed = time.perf_counter() - start
+
+    print(f"Journal: {reader.num_records} records, {len(reader.snapshots)} snapshots")
+    print(f"State at tick {tick} rebuilt in {elapsed * 1000:.2f} ms")
+    for robot, robot_state in sorted(state.robots.items()):
+        if robot_filter is not None and robot != robot_filter:
+            continue
+        line = f"  {reader.get_robot_id(robot)}: {robot_state.status.value} at vertex {robot_state.vertex}"
+        if robot_state.lane_from >= 0:
+            line += (f", lane {robot_state.lane_from}->{robot_state.lane_to}"
+                     f" ({robot_state.get_progress(tick):.2f})")
+        if robot_state.wait_to >= 0:
+            line += f", waiting for lane to {robot_state.wait_to}"
+        if robot_state.target >= 0:
+            line += f", target {robot_state.target}"
+        print(line)
+    print(f"Occupied lanes: {len(state.lanes)}")
+
+    if args.events:
+        events = deque(maxlen=args.events)
+        for record_tick, robot, event, a, b in reader.iter_records():
+            if record_tick > tick:
+                break
+            if robot_filter is None or robot == robot_filter:
+                events.append((record_tick, robot, event, a, b))
+        print("Events:")
+        for record_tick, robot, event, a, b in events:
+            print(f"  [{record_tick}] {reader.get_robot_id(robot)} {EVENT_NAMES[event]} {a} {b}")
+    reader.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import os
+import json
+import sys
+import time
+import random
+import logging
+import argparse
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.nav_graph import NavGraph
+from models.robot import RobotStatus
+from controllers.fleet_manager import FleetManager
+from controllers.traffic_manager import TrafficManager
+from controllers.simulator import Simulator
+from controllers.partitioned_simulator import PartitionedSimulator
+from utils.helpers import ensure_directory_exists
+from utils.metrics import Metrics
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Run a headless fleet simulation.")
+    parser.add_argument("--graph", default="../data/nav_graph.json",
+                        help="Path to the navigation graph JSON file.")
+    parser.add_argument("--robots", type=int, default=10, help="Number of robots to spawn.")
+    parser.add_argument("--ticks", type=int, default=1000, help="Number of ticks to simulate.")
+    parser.add_argument("--timestep", type=float, default=1 / 30, help="Simulated seconds per tick.")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Pace ticks to wall-clock time instead of running as fast as possible.")
+    parser.add_argument("--continuous", action="store_true",
+                        help="Give robots a new random task whenever they finish one.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Dispatch random tasks as one batch, matching robots to tasks to minimise total travel.")
+    parser.add_argument("--planner", default="astar",
+                        help="Path planner used for task assignment (bfs, dijkstra, astar, ch or sipp).")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Advance robots with batched NumPy operations.")
+    parser.add_argument("--event-driven", action="store_true",
+                        help="Only process robots when they reach a vertex or a lane is freed.")
+    parser.add_argument("--deadlock-policy", default="backoff_youngest",
+                        help="How circular waits between robots are broken (backoff_youngest or replan).")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for spawns and tasks.")
+    parser.add_argument("--log-file", default="logs/fleet_logs.txt", help="Path to the log file.")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Logging level (robot events are logged at INFO).")
+    parser.add_argument("--journal", default=None,
+                        help="Record a binary event journal to this path (see replay.py).")
+    parser.add_argument("--mute-events", default="",
+                        help="Comma-separated robot event types not to log, such as moving,reached.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-phase timings and counters and print them after the run.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Also run the sampling profiler and print the functions most time is spent in.")
+    parser.add_argument("--metrics-output", default=None,
+                        help="Write the recorded metrics to this JSON file (implies --metrics).")
+    parser.add_argument("--regions", type=int, default=None,
+                        help="Split the graph into this many regions, each simulated in its own process.")
+    parser.add_argument("--sync-interval", type=int, default=10,
+                        help="Ticks between exchanges of robots and lanes between regions (with --regions).")
+    return parser.parse_args()
+
+def assign_random_tasks(fleet_manager: FleetManager, rng: random.Random, num_vertices: int) -> int:
+    """
+    Give every idle or finished robot a task to a random vertex.
+
+    Args:
+        fleet_manager: FleetManager instance.
+        rng: Random number generator.
+        num_vertices: Number of vertices in the graph.
+
+    Returns:
+        Number of tasks assigned.
+    """
+    assigned = 0
+    for robot_id, robot in fleet_manager.get_all_robots().items():
+        if robot.get_status() in (RobotStatus.IDLE, RobotStatus.TASK_COMPLETE):
+            if fleet_manager.assign_task(robot_id, rng.randrange(num_vertices)):
+                assigned += 1
+    return assigned
+
+def dispatch_random_tasks(fleet_manager: FleetManager, rng: random.Random, num_vertices: int) -> int:
+    """
+    Dispatch one random task per idle or finished robot as a single batch.
+
+    Args:
+        fleet_manager: FleetManager instance.
+        rng: Random number generator.
+        num_vertices: Number of vertices in the graph.
+
+    Returns:
+        Number of tasks assigned.
+    """
+    available = sum(
+        1 for robot in fleet_manager.get_all_robots().values()
+        if robot.get_status() in (RobotStatus.IDLE, RobotStatus.TASK_COMPLETE)
+    )
+    targets = [rng.randrange(num_vertices) for _ in range(available)]
+    return sum(1 for robot_id in fleet_manager.dispatch_tasks(targets) if robot_id is not None)
+
+def run_partitioned(args: argparse.Namespace) -> None:
+    """
+    Run a headless simulation split over one worker process per graph region.
+
+    Args:
+        args: Parsed command line arguments.
+    """
+    unsupported = [flag for flag, enabled in (
+        ("--vectorized", args.vectorized), ("--event-driven", args.event_driven), ("--batch", args.batch),
+        ("--journal", args.journal), ("--realtime", args.realtime),
+        ("--metrics", args.metrics or args.profile or args.metrics_output),
+    ) if enabled]
+    if unsupported:
+        sys.exit(f"--regions cannot be combined with {', '.join(unsupported)}")
+
+    with PartitionedSimulator(args.graph, args.regions, planner=args.planner,
+                              deadlock_policy=args.deadlock_policy, seed=args.seed,
+                              sync_interval=args.sync_interval) as simulator:
+        simulator.spawn_robots(args.robots)
+        result = simulator.run(args.ticks, continuous=args.continuous)
+
+    nav_graph = simulator.nav_graph
+    print(f"Graph: {len(nav_graph.vertices)} vertices, {len(nav_graph.lanes)} lanes, "
+          f"{simulator.num_regions} regions ({simulator.cut_lanes} lanes cross a region boundary)")
+    print(f"Robots: {result['robots']}, tasks assigned: {result['tasks_assigned']}, "
+          f"robots finished: {result['robots_finished']}, region handoffs: {result['handoffs']}")
+    print(f"Ticks: {result['ticks']} ({result['ticks'] * args.timestep:.1f} simulated seconds) "
+          f"in {result['elapsed']:.2f}s")
+    print(f"Tick throughput: {result['ticks_per_second']:.1f} ticks/s")
+    for region in result["regions"]:
+        print(f"  Region {region['region']}: {region['robots']} robots, {region['busy_time']:.2f}s simulating, "
+              f"{region['wait_time']:.2f}s exchanging with neighbours")
+    print(f"Deadlocks: {result['deadlocks']} detected")
+
+def main():
+    """
+    Run a headless simulation and report throughput.
+    """
+    args = parse_args()
+    if args.regions is not None:
+        run_partitioned(args)
+        return
+    rng = random.Random(args.seed)
+
+    ensure_directory_exists(os.path.dirname(args.log_file) or ".")
+    nav_graph = NavGraph(args.graph)
+    traffic_manager = TrafficManager(nav_graph, deadlock_policy=args.deadlock_policy)
+    metrics = Metrics() if args.metrics or args.profile or args.metrics_output else None
+    fleet_manager = FleetManager(nav_graph, args.log_file, planner=args.planner,
+                                 vectorized=args.vectorized, event_driven=args.event_driven,
+                                 traffic_manager=traffic_manager, journal_file=args.journal,
+                                 metrics=metrics)
+    logging.getLogger().setLevel(args.log_level.upper())
+    for event in filter(None, args.mute_events.split(",")):
+        fleet_manager.log_filter.set_event_level(event.strip(), None)
+
+    num_vertices = len(nav_graph.vertices)
+    for _ in range(args.robots):
+        fleet_manager.spawn_robot(rng.randrange(num_vertices))
+
+    simulator = Simulator(fleet_manager, timestep=args.timestep, realtime=args.realtime)
+    assign_tasks = dispatch_random_tasks if args.batch else assign_random_tasks
+    tasks_assigned = assign_tasks(fleet_manager, rng, num_vertices)
+
+    # Tasks are reassigned between chunks of ticks in continuous mode
+    chunk = 30 if args.continuous else args.ticks
+    if args.profile:
+        metrics.start_profiler()
+    start = time.perf_counter()
+    remaining = args.ticks
+    while remaining > 0:
+        remaining -= simulator.run(num_ticks=min(chunk, remaining))
+        if args.continuous:
+            tasks_assigned += assign_tasks(fleet_manager, rng, num_vertices)
+    elapsed = time.perf_counter() - start
+    if args.profile:
+        metrics.stop_profiler()
+    if fleet_manager.journal is not None:
+        fleet_manager.journal.close()
+
+    completed = sum(
+        1 for robot in fleet_manager.get_all_robots().values()
+        if robot.get_status() == RobotStatus.TASK_COMPLETE
+    )
+    print(f"Graph: {num_vertices} vertices, {len(nav_graph.lanes)} lanes")
+    print(f"Robots: {args.robots}, tasks assigned: {tasks_assigned}, robots finished: {completed}")
+    print(f"Ticks: {simulator.tick_count} ({simulator.sim_time:.1f} simulated seconds) in {elapsed:.2f}s")
+    print(f"Tick throughput: {simulator.get_ticks_per_second():.1f} ticks/s")
+    deadlocks = traffic_manager.get_deadlock_stats()
+    print(f"Deadlocks: {deadlocks['detected']} detected, {deadlocks['resolved']} resolved "
+          f"({deadlocks['policy']}, mean latency {deadlocks['mean_resolution_latency'] * 1000:.3f} ms)")
+    if metrics is not None:
+        print("Metrics:")
+        for line in metrics.format_summary(top=10):
+            print(f"  {line}")
+    if args.metrics_output:
+        with open(args.metrics_output, 'w') as f:
+            json.dump(fleet_manager.get_metrics(), f, indent=2)
+
+if __name__ == "__main__":
+    main()
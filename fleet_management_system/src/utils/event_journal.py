@@ -0,0 +1,318 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from models.robot import CODE_STATUSES, STATUS_CODES, RobotStatus
+
+# Journal record: tick, robot number, event type, two event-specific vertex fields.
+# Robots are numbered in the order they first appear; the ID of each number
+# is written to a side file, one JSON string per line
+RECORD = struct.Struct("<IIB3xii")
+
+# Event types and their (a, b) fields
+SPAWN = 0     # (vertex, speed in millionths of a lane per tick)
+ASSIGN = 1    # (current vertex, target vertex)
+OCCUPY = 2    # (lane start vertex, lane end vertex)
+FREE = 3      # (lane start vertex, lane end vertex)
+WAIT = 4      # (vertex, vertex of the lane waited for)
+COMPLETE = 5  # (vertex, unused)
+EVENT_NAMES = ["spawn", "assign", "occupy", "free", "wait", "complete"]
+
+# Snapshot: header (index of the first record not applied, tick of the last
+# record applied, robot count) followed by one ROBOT_STATE per robot
+SNAPSHOT_HEADER = struct.Struct("<QII")
+ROBOT_STATE = struct.Struct("<IB3xiiiiiii")
+
+class JournalRobotState:
+    """State of one robot as rebuilt from the journal."""
+    __slots__ = ("status", "vertex", "lane_from", "lane_to", "wait_to", "target", "since_tick", "speed")
+
+    def __init__(self, vertex: int, speed: int, tick: int):
+        """
+        Initialize the state of a newly spawned robot.
+
+        Args:
+            vertex: Spawn vertex index.
+            speed: Speed in millionths of a lane per tick.
+            tick: Spawn tick.
+        """
+        self.status = RobotStatus.IDLE
+        self.vertex = vertex
+        self.lane_from = -1  # Lane held by the robot, -1 if none
+        self.lane_to = -1
+        self.wait_to = -1  # End vertex of the lane the robot is queued for
+        self.target = -1
+        self.since_tick = tick  # Tick of the last status or lane change
+        self.speed = speed
+
+    def get_progress(self, tick: int) -> float:
+        """
+        Get how far along its lane a moving robot is.
+
+        Args:
+            tick: Current tick.
+
+        Returns:
+            Progress between 0.0 and 1.0, or 0.0 if the robot is not moving.
+        """
+        if self.status != RobotStatus.MOVING:
+            return 0.0
+        return min(1.0, (tick - self.since_tick) * self.speed / 1e6)
+
+class JournalState:
+    """
+    Fleet state rebuilt by applying journal records in order.
+    Used both by the writer, to produce snapshots, and by the replay reader.
+    """
+    def __init__(self):
+        """Initialize an empty state."""
+        self.robots: Dict[int, JournalRobotState] = {}  # Robot number -> state
+        self.lanes: Dict[Tuple[int, int], int] = {}  # (from, to) -> number of the owning robot
+        self.last_tick = 0
+
+    def apply(self, tick: int, robot: int, event: int, a: int, b: int) -> None:
+        """
+        Apply one journal record.
+
+        Args:
+            tick: Tick of the record.
+            robot: Robot number.
+            event: Event type.
+            a: First event field.
+            b: Second event field.
+        """
+        self.last_tick = tick
+        if event == SPAWN:
+            self.robots[robot] = JournalRobotState(a, b, tick)
+            return
+        state = self.robots.get(robot)
+        if state is None:
+            return
+
+        if event == OCCUPY:
+            state.status = RobotStatus.MOVING
+            state.vertex = a
+            state.lane_from, state.lane_to = a, b
+            state.wait_to = -1
+            state.since_tick = tick
+            self.lanes[(a, b)] = robot
+        elif event == FREE:
+            if (state.lane_from, state.lane_to) == (a, b):
+                state.lane_from = state.lane_to = -1
+            if self.lanes.get((a, b)) == robot:
+                del self.lanes[(a, b)]
+        elif event == ASSIGN:
+            state.status = RobotStatus.MOVING
+            state.vertex = a
+            state.target = b
+        elif event == WAIT:
+            state.status = RobotStatus.WAITING
+            state.vertex = a
+            state.wait_to = b
+            state.since_tick = tick
+        elif event == COMPLETE:
+            state.status = RobotStatus.TASK_COMPLETE
+            state.vertex = a
+            state.since_tick = tick
+
+    def pack(self, record_index: int) -> bytes:
+        """
+        Serialize the state as a snapshot.
+
+        Args:
+            record_index: Number of journal records applied to this state.
+
+        Returns:
+            Snapshot bytes.
+        """
+        parts = [SNAPSHOT_HEADER.pack(record_index, self.last_tick, len(self.robots))]
+        for robot, state in self.robots.items():
+            parts.append(ROBOT_STATE.pack(
+                robot, STATUS_CODES[state.status], state.vertex, state.lane_from, state.lane_to,
+                state.wait_to, state.target, state.since_tick, state.speed
+            ))
+        return b"".join(parts)
+
+    @classmethod
+    def unpack(cls, data: bytes, robot_count: int, last_tick: int) -> "JournalState":
+        """
+        Rebuild a state from the robot records of a snapshot.
+
+        Args:
+            data: Robot records following the snapshot header.
+            robot_count: Number of robot records.
+            last_tick: Tick of the last record applied to the snapshot.
+
+        Returns:
+            JournalState.
+        """
+        journal_state = cls()
+        journal_state.last_tick = last_tick
+        for (robot, status, vertex, lane_from, lane_to, wait_to, target,
+             since_tick, speed) in ROBOT_STATE.iter_unpack(data[:robot_count * ROBOT_STATE.size]):
+            state = JournalRobotState(vertex, speed, since_tick)
+            state.status = CODE_STATUSES[status]
+            state.lane_from, state.lane_to = lane_from, lane_to
+            state.wait_to = wait_to
+            state.target = target
+            journal_state.robots[robot] = state
+            if lane_from >= 0:
+                journal_state.lanes[(lane_from, lane_to)] = robot
+        return journal_state
+
+class EventJournal:
+    """
+    Append-only binary journal of fleet events.
+    Every record has the same fixed width, and a snapshot of the whole fleet
+    is written to a side file every snapshot_interval ticks, so a replay can
+    start from the nearest snapshot instead of the first record.
+    """
+    def __init__(self, path: str, snapshot_interval: int = 1000):
+        """
+        Create the journal, replacing an existing one at the same path.
+
+        Args:
+            path: Path of the journal file; snapshots go to path + ".snap"
+                and robot IDs to path + ".ids".
+            snapshot_interval: Ticks between snapshots.
+        """
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.file: BinaryIO = open(path, 'wb', buffering=1 << 16)
+        self.snapshot_file: BinaryIO = open(path + ".snap", 'wb')
+        self.ids_file: TextIO = open(path + ".ids", 'w', encoding="utf-8")
+        self.robot_numbers: Dict[str, int] = {}  # Robot ID -> number in the records
+        self.state = JournalState()
+        self.records_written = 0
+        self.next_snapshot_tick = snapshot_interval
+
+    def record(self, tick: int, robot_id: str, event: int, a: int = -1, b: int = -1) -> None:
+        """
+        Append a record.
+
+        Args:
+            tick: Tick at which the event happened.
+            robot_id: ID of the robot.
+            event: Event type.
+            a: First event field.
+            b: Second event field.
+        """
+        if tick >= self.next_snapshot_tick:
+            self.snapshot_file.write(self.state.pack(self.records_written))
+            self.next_snapshot_tick = (tick // self.snapshot_interval + 1) * self.snapshot_interval
+        robot = self.robot_numbers.get(robot_id)
+        if robot is None:
+            robot = self.robot_numbers[robot_id] = len(self.robot_numbers)
+            self.ids_file.write(json.dumps(robot_id) + "\n")
+        self.file.write(RECORD.pack(tick, robot, event, a, b))
+        self.state.apply(tick, robot, event, a, b)
+        self.records_written += 1
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        self.file.flush()
+        self.snapshot_file.flush()
+        self.ids_file.flush()
+
+    def close(self) -> None:
+        """Flush and close the journal."""
+        if not self.file.closed:
+            self.file.close()
+            self.snapshot_file.close()
+            self.ids_file.close()
+
+class JournalReader:
+    """
+    Random access to a journal written by EventJournal.
+    The journal is memory-mapped, and the fleet state at any tick is rebuilt
+    from the latest snapshot at or before it plus the records that follow.
+    """
+    def __init__(self, path: str):
+        """
+        Open a journal.
+
+        Args:
+            path: Path of the journal file.
+        """
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.num_records = size // RECORD.size
+        self.snapshots: List[Tuple[int, int, int, int]] = []  # (last tick, record index, robot count, data offset)
+        self.snapshot_data = b""
+        if os.path.exists(path + ".snap"):
+            with open(path + ".snap", 'rb') as f:
+                self.snapshot_data = f.read()
+            self._index_snapshots()
+        self.snapshot_ticks = [snapshot[0] for snapshot in self.snapshots]
+        self.robot_ids: List[str] = []  # ID of each robot number
+        if os.path.exists(path + ".ids"):
+            with open(path + ".ids", encoding="utf-8") as f:
+                self.robot_ids = [json.loads(line) for line in f if line.strip()]
+        self.robot_numbers = {robot_id: robot for robot, robot_id in enumerate(self.robot_ids)}
+
+    def _index_snapshots(self) -> None:
+        """Collect the position of every snapshot in the snapshot file."""
+        offset = 0
+        while offset + SNAPSHOT_HEADER.size <= len(self.snapshot_data):
+            record_index, last_tick, robot_count = SNAPSHOT_HEADER.unpack_from(self.snapshot_data, offset)
+            offset += SNAPSHOT_HEADER.size
+            self.snapshots.append((last_tick, record_index, robot_count, offset))
+            offset += robot_count * ROBOT_STATE.size
+
+    def get_robot_id(self, robot: int) -> str:
+        """
+        Get the ID of a robot number.
+
+        Args:
+            robot: Robot number used in the records.
+
+        Returns:
+            The robot's ID, or the number itself if the journal has no ID for it.
+        """
+        return self.robot_ids[robot] if robot < len(self.robot_ids) else str(robot)
+
+    def iter_records(self, start: int = 0) -> Iterator[Tuple[int, int, int, int, int]]:
+        """
+        Iterate over records from an index onwards.
+
+        Args:
+            start: Index of the first record.
+
+        Returns:
+            Iterator of (tick, robot number, event type, a, b) tuples.
+        """
+        end = self.num_records * RECORD.size
+        return RECORD.iter_unpack(memoryview(self.data)[start * RECORD.size:end])
+
+    def state_at(self, tick: int) -> JournalState:
+        """
+        Rebuild the fleet state after every event up to and including a tick.
+
+        Args:
+            tick: Tick to rebuild.
+
+        Returns:
+            JournalState at the tick.
+        """
+        index = bisect.bisect_right(self.snapshot_ticks, tick) - 1
+        if index >= 0:
+            last_tick, start, robot_count, offset = self.snapshots[index]
+            state = JournalState.unpack(memoryview(self.snapshot_data)[offset:], robot_count, last_tick)
+        else:
+            state, start = JournalState(), 0
+
+        for record in self.iter_records(start):
+            if record[0] > tick:
+                break
+            state.apply(*record)
+        return state
+
+    def close(self) -> None:
+        """Close the journal."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
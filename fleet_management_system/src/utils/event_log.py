@@ -0,0 +1,78 @@
+import logging
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Tuple
+
+class EventLog:
+    """
+    Bounded in-memory log of recent fleet events.
+    Every entry gets a sequence number, so readers such as the GUI can ask
+    for just the entries they have not seen yet. Messages are stored with
+    their format arguments and only formatted when read.
+    """
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize an empty event log.
+
+        Args:
+            capacity: Number of entries kept; older entries are dropped.
+        """
+        self.entries: Deque[Tuple[float, int, str, tuple]] = deque(maxlen=capacity)  # (time, level, message, args)
+        self.next_sequence = 0  # Sequence number of the next entry
+
+    def append(self, level: int, message: str, *args) -> None:
+        """
+        Add an entry.
+
+        Args:
+            level: Logging level of the entry.
+            message: %-style format string.
+            *args: Arguments for the format string.
+        """
+        self.entries.append((time.time(), level, message, args))
+        self.next_sequence += 1
+
+    def get_first_sequence(self) -> int:
+        """
+        Get the sequence number of the oldest entry still kept.
+
+        Returns:
+            Sequence number, equal to next_sequence if the log is empty.
+        """
+        return self.next_sequence - len(self.entries)
+
+    def get_since(self, sequence: int) -> List[Tuple[int, str]]:
+        """
+        Get the entries from a sequence number onwards.
+        Entries that have already been dropped are skipped.
+
+        Args:
+            sequence: Sequence number of the first entry wanted.
+
+        Returns:
+            List of (sequence number, formatted line) tuples.
+        """
+        first = self.get_first_sequence()
+        start = max(sequence, first)
+        lines = []
+        for offset, entry in enumerate(islice(self.entries, start - first, None)):
+            lines.append((start + offset, self.format_entry(entry)))
+        return lines
+
+    @staticmethod
+    def format_entry(entry: Tuple[float, int, str, tuple]) -> str:
+        """
+        Format an entry like a line of the log file.
+
+        Args:
+            entry: (time, level, message, args) tuple.
+
+        Returns:
+            Formatted line without a trailing newline.
+        """
+        created, level, message, args = entry
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+        if args:
+            message = message % args
+        return f"{timestamp} [{logging.getLevelName(level)}] {message}"
@@ -0,0 +1,129 @@
+import json
+from typing import Any, Dict, List
+
+def _make_graph(vertices: List[List[Any]], lanes: List[List[Any]]) -> Dict[str, Any]:
+    """
+    Wrap vertices and lanes in the nav_graph.json layout.
+
+    Args:
+        vertices: List of [x, y, attributes] vertices.
+        lanes: List of [from_vertex, to_vertex, attributes] lanes.
+
+    Returns:
+        Graph dictionary with a single level.
+    """
+    return {"levels": {"level1": {"lanes": lanes, "vertices": vertices}}}
+
+def generate_grid_graph(rows: int, cols: int, spacing: float = 2.0) -> Dict[str, Any]:
+    """
+    Generate a grid with two-way lanes between neighbouring vertices.
+
+    Args:
+        rows: Number of rows.
+        cols: Number of columns.
+        spacing: Distance between neighbouring vertices.
+
+    Returns:
+        Graph dictionary in the nav_graph.json schema.
+    """
+    vertices = []
+    for row in range(rows):
+        for col in range(cols):
+            attributes = {"name": f"G{row}_{col}"}
+            if row == 0 and col == 0:
+                attributes["is_charger"] = True
+            vertices.append([col * spacing, row * spacing, attributes])
+
+    lanes = []
+    for row in range(rows):
+        for col in range(cols):
+            index = row * cols + col
+            if col + 1 < cols:
+                lanes.append([index, index + 1, {"speed_limit": 0}])
+                lanes.append([index + 1, index, {"speed_limit": 0}])
+            if row + 1 < rows:
+                lanes.append([index, index + cols, {"speed_limit": 0}])
+                lanes.append([index + cols, index, {"speed_limit": 0}])
+    return _make_graph(vertices, lanes)
+
+def generate_warehouse_graph(aisles: int, aisle_length: int, spacing: float = 2.0) -> Dict[str, Any]:
+    """
+    Generate a warehouse layout: parallel one-way aisles joined by two-way
+    cross-aisles at both ends, with alternating aisle directions and
+    chargers along the bottom cross-aisle.
+
+    Args:
+        aisles: Number of aisles.
+        aisle_length: Number of vertices along each aisle, including both cross-aisles.
+        spacing: Distance between neighbouring vertices.
+
+    Returns:
+        Graph dictionary in the nav_graph.json schema.
+    """
+    vertices = []
+    for aisle in range(aisles):
+        for slot in range(aisle_length):
+            attributes = {"name": f"A{aisle}_{slot}"}
+            if slot == aisle_length - 1 and aisle % 4 == 0:
+                attributes["is_charger"] = True
+            vertices.append([aisle * spacing, slot * spacing, attributes])
+
+    lanes = []
+    for aisle in range(aisles):
+        base = aisle * aisle_length
+        # One-way aisle, alternating direction
+        for slot in range(aisle_length - 1):
+            if aisle % 2 == 0:
+                lanes.append([base + slot, base + slot + 1, {"speed_limit": 0}])
+            else:
+                lanes.append([base + slot + 1, base + slot, {"speed_limit": 0}])
+        # Two-way cross-aisles at both ends
+        if aisle + 1 < aisles:
+            for slot in (0, aisle_length - 1):
+                lanes.append([base + slot, base + aisle_length + slot, {"speed_limit": 0}])
+                lanes.append([base + aisle_length + slot, base + slot, {"speed_limit": 0}])
+    return _make_graph(vertices, lanes)
+
+def generate_multilevel_graph(levels: int, rows: int, cols: int, lifts: int = 2,
+                              lift_time: float = 10.0, spacing: float = 2.0) -> Dict[str, Any]:
+    """
+    Generate a building of identical grid floors joined by two-way lifts
+    between consecutive floors, spread along the first row.
+
+    Args:
+        levels: Number of floors.
+        rows: Number of rows on each floor.
+        cols: Number of columns on each floor.
+        lifts: Number of lifts.
+        lift_time: Travel time of a lift between neighbouring floors.
+        spacing: Distance between neighbouring vertices.
+
+    Returns:
+        Graph dictionary in the nav_graph.json schema, with transitions.
+    """
+    floor = generate_grid_graph(rows, cols, spacing)["levels"]["level1"]
+    graph = {"levels": {}, "transitions": []}
+    for level in range(levels):
+        vertices = [[x, y, dict(attributes, name=f"L{level}_{attributes['name']}")]
+                    for x, y, attributes in floor["vertices"]]
+        graph["levels"][f"level{level + 1}"] = {"lanes": floor["lanes"], "vertices": vertices}
+
+    lift_columns = sorted({(cols - 1) * (lift + 1) // (lifts + 1) for lift in range(lifts)})
+    for level in range(levels - 1):
+        for col in lift_columns:
+            lower, upper = f"level{level + 1}", f"level{level + 2}"
+            attributes = {"type": "lift", "travel_time": lift_time}
+            graph["transitions"].append([lower, col, upper, col, attributes])
+            graph["transitions"].append([upper, col, lower, col, dict(attributes)])
+    return graph
+
+def write_graph(graph: Dict[str, Any], graph_file: str) -> None:
+    """
+    Write a generated graph to a JSON file that NavGraph can load.
+
+    Args:
+        graph: Graph dictionary.
+        graph_file: Path of the file to write.
+    """
+    with open(graph_file, 'w') as f:
+        json.dump(graph, f)
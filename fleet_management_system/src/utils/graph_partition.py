@@ -0,0 +1,83 @@
+from typing import List, Set
+
+def partition_graph(nav_graph, num_regions: int) -> List[int]:
+    """
+    Split the vertices of a graph into regions of nearly equal size by
+    recursive coordinate bisection: the vertices are cut in two along the
+    axis with the larger extent, in proportion to the number of regions
+    each half gets, and each half is split again. Regions are spatially
+    compact, which keeps the number of lanes crossing between them low on
+    warehouse-like layouts.
+
+    On a multi-level graph the level is the first sort key of every cut, so
+    vertices stacked at the same x/y on different floors are never split by
+    index. A cut falls between two levels or across one level, and a region
+    holds whole levels plus at most a compact slab of a level at each end.
+
+    Args:
+        nav_graph: NavGraph instance.
+        num_regions: Number of regions; clamped to the number of vertices.
+
+    Returns:
+        List mapping each vertex index to its region index.
+    """
+    coordinates = (nav_graph.vertex_xs, nav_graph.vertex_ys)
+    num_vertices = len(nav_graph.vertex_xs)
+    regions = [0] * num_vertices
+    num_regions = max(1, min(num_regions, num_vertices))
+    level_offsets = nav_graph.level_offsets
+    levels: List[int] = []  # Level of each vertex
+    for level in range(len(level_offsets) - 1):
+        levels.extend([level] * (level_offsets[level + 1] - level_offsets[level]))
+
+    def split(indices: List[int], first_region: int, count: int) -> None:
+        if count == 1:
+            for index in indices:
+                regions[index] = first_region
+            return
+        xs = [coordinates[0][index] for index in indices]
+        ys = [coordinates[1][index] for index in indices]
+        axis = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+        major, minor = coordinates[axis], coordinates[1 - axis]
+        indices = sorted(indices, key=lambda index: (levels[index], major[index], minor[index], index))
+        left_count = count // 2
+        cut = len(indices) * left_count // count
+        split(indices[:cut], first_region, left_count)
+        split(indices[cut:], first_region + left_count, count - left_count)
+
+    split(list(range(num_vertices)), 0, num_regions)
+    return regions
+
+def get_region_neighbours(nav_graph, regions: List[int]) -> List[Set[int]]:
+    """
+    Find the regions connected to each region by a lane in either direction.
+
+    Args:
+        nav_graph: NavGraph instance.
+        regions: Region index of each vertex.
+
+    Returns:
+        List mapping each region index to the set of its neighbouring regions.
+    """
+    neighbours: List[Set[int]] = [set() for _ in range(max(regions, default=-1) + 1)]
+    for from_vertex in range(len(nav_graph.vertices)):
+        for to_vertex in nav_graph.lane_ids[from_vertex]:
+            from_region, to_region = regions[from_vertex], regions[to_vertex]
+            if from_region != to_region:
+                neighbours[from_region].add(to_region)
+                neighbours[to_region].add(from_region)
+    return neighbours
+
+def count_cut_lanes(nav_graph, regions: List[int]) -> int:
+    """
+    Count the lanes whose ends lie in different regions.
+
+    Args:
+        nav_graph: NavGraph instance.
+        regions: Region index of each vertex.
+
+    Returns:
+        Number of lanes crossing a region boundary.
+    """
+    return sum(1 for from_vertex in range(len(nav_graph.vertices))
+               for to_vertex in nav_graph.lane_ids[from_vertex] if regions[from_vertex] != regions[to_vertex])
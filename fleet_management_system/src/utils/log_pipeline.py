@@ -0,0 +1,208 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+_STOP = object()  # Queued by LogPipeline.close to stop the writer thread
+
+# Level at which each robot event type is logged; None disables the event
+DEFAULT_EVENT_LEVELS: Dict[str, Optional[int]] = {
+    "spawned": logging.INFO,
+    "assigned": logging.INFO,
+    "invalid_path": logging.INFO,
+    "reached": logging.INFO,
+    "moving": logging.INFO,
+    "waiting": logging.INFO,
+    "resumed": logging.INFO,
+    "completed": logging.INFO,
+}
+
+class RobotLogFilter:
+    """
+    Per-event and per-robot log levels for robot events.
+    Checked before a robot event message is formatted, so disabled events
+    such as the per-lane "moving" message cost a couple of dictionary lookups.
+    """
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            logger: Logger robot events are written to; defaults to the root logger.
+        """
+        self.logger = logger or logging.getLogger()
+        self.event_levels: Dict[str, Optional[int]] = dict(DEFAULT_EVENT_LEVELS)
+        self.robot_levels: Dict[str, int] = {}  # Robot ID -> minimum level logged for that robot
+
+    def set_event_level(self, event: str, level: Optional[int]) -> None:
+        """
+        Set the level an event type is logged at.
+
+        Args:
+            event: Event type, such as "moving".
+            level: Logging level, or None to drop the event entirely.
+        """
+        self.event_levels[event] = level
+
+    def set_robot_level(self, robot_id: str, level: int) -> None:
+        """
+        Set the minimum level of events logged for one robot.
+
+        Args:
+            robot_id: ID of the robot.
+            level: Logging level.
+        """
+        self.robot_levels[robot_id] = level
+
+    def get_level(self, robot_id: str, event: str) -> Optional[int]:
+        """
+        Get the level a robot event should be logged at.
+
+        Args:
+            robot_id: ID of the robot.
+            event: Event type.
+
+        Returns:
+            Logging level, or None if the event should be dropped.
+        """
+        level = self.event_levels.get(event, logging.INFO)
+        if level is None or level < self.robot_levels.get(robot_id, logging.NOTSET):
+            return None
+        if not self.logger.isEnabledFor(level):
+            return None
+        return level
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves timestamp formatting to the writer thread."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, since they may change before the writer runs
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+class LogPipeline:
+    """
+    Asynchronous, batched log output.
+    Log calls only put the record on a queue; a background thread formats
+    queued records and writes them to the log file and stderr in batches,
+    flushing when a batch fills up or the flush interval elapses.
+    """
+    def __init__(self, log_file: str, batch_size: int = 256, flush_interval: float = 0.5,
+                 stream: bool = True):
+        """
+        Initialize the pipeline and start its writer thread.
+
+        Args:
+            log_file: Path to the log file, opened for appending.
+            batch_size: Records after which the writer flushes.
+            flush_interval: Seconds after which queued records are flushed.
+            stream: True to also write records to stderr.
+        """
+        self.log_file = log_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = _DeferredQueueHandler(self.queue)
+        self.formatter = logging.Formatter(LOG_FORMAT)
+        self.streams = [open(log_file, 'a')]
+        if stream:
+            self.streams.append(sys.stderr)
+        self.records_written = 0
+        self.batches_written = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="LogPipeline", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Writer thread: collect records into batches and write them out."""
+        batch: List[logging.LogRecord] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, logging.LogRecord):
+                batch.append(item)
+                if len(batch) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            self._write(batch)
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            if item is _STOP:
+                return
+            if isinstance(item, threading.Event):
+                item.set()  # A flush request; everything queued before it is written
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        """
+        Format and write a batch of records with one write per stream.
+
+        Args:
+            batch: Records to write.
+        """
+        if not batch:
+            return
+        text = "".join(self.formatter.format(record) + "\n" for record in batch)
+        for stream in self.streams:
+            try:
+                stream.write(text)
+                stream.flush()
+            except (OSError, ValueError):
+                pass  # Output closed underneath us; keep the simulation running
+        self.records_written += len(batch)
+        self.batches_written += 1
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until every record queued so far has been written.
+
+        Args:
+            timeout: Seconds to wait at most, or None to wait indefinitely.
+        """
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write out the remaining records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(_STOP)
+        self._thread.join()
+        self.streams[0].close()
+
+_installed_pipeline: Optional[LogPipeline] = None
+
+def install_log_pipeline(log_file: str, **kwargs) -> LogPipeline:
+    """
+    Route the root logger through a LogPipeline.
+    Like logging.basicConfig, only the first call installs a pipeline;
+    later calls return the one already installed.
+
+    Args:
+        log_file: Path to the log file.
+        **kwargs: Further LogPipeline arguments.
+
+    Returns:
+        The installed LogPipeline.
+    """
+    global _installed_pipeline
+    if _installed_pipeline is None:
+        _installed_pipeline = LogPipeline(log_file, **kwargs)
+        root = logging.getLogger()
+        root.addHandler(_installed_pipeline.handler)
+        root.setLevel(logging.INFO)
+        atexit.register(_installed_pipeline.close)
+    return _installed_pipeline
@@ -0,0 +1,320 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class Histogram:
+    """
+    Timing histogram with power-of-two microsecond buckets.
+    Bucket i holds durations in [2^(i-1), 2^i) microseconds (bucket 0 holds
+    anything under a microsecond), so recording is a bit_length call and
+    percentiles are accurate to within a factor of two.
+    """
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.buckets: List[int] = [0] * 40
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a duration.
+
+        Args:
+            seconds: Duration in seconds.
+        """
+        self.buckets[min(int(seconds * 1e6).bit_length(), 39)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        Get an upper bound on a percentile of the recorded durations.
+
+        Args:
+            percentile: Percentile between 0 and 100.
+
+        Returns:
+            Upper edge of the bucket containing the percentile, in seconds,
+            capped at the largest duration recorded.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = percentile / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dictionary with the count and total, mean, min, max, p50 and p95 durations in seconds.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.get_percentile(50),
+            "p95": self.get_percentile(95),
+        }
+
+class SamplingProfiler:
+    """
+    Statistical profiler that periodically samples the stack of one thread
+    from a background thread. It costs nothing on the sampled thread apart
+    from the GIL switches, which makes it usable on a running simulation.
+    """
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples.
+            thread_id: Identifier of the thread to sample; defaults to the calling thread.
+        """
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.self_samples: Counter = Counter()  # Function -> samples in which it was running
+        self.total_samples: Counter = Counter()  # Function -> samples in which it was on the stack
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread to exit."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def is_running(self) -> bool:
+        """
+        Check whether the profiler is sampling.
+
+        Returns:
+            True if sampling.
+        """
+        return self._thread is not None
+
+    def _run(self) -> None:
+        """Take samples until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.self_samples[self._describe(frame)] += 1
+            on_stack = set()
+            while frame is not None:
+                on_stack.add(self._describe(frame))
+                frame = frame.f_back
+            self.total_samples.update(on_stack)
+
+    @staticmethod
+    def _describe(frame) -> str:
+        """
+        Name the function a frame is executing.
+
+        Args:
+            frame: Stack frame.
+
+        Returns:
+            "file:function" string.
+        """
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def get_top(self, count: int = 10) -> List[Tuple[str, int, int]]:
+        """
+        Get the functions the sampled thread spent the most time in.
+
+        Args:
+            count: Number of functions to return.
+
+        Returns:
+            List of (function, self samples, total samples), by self samples.
+        """
+        return [(function, samples, self.total_samples[function])
+                for function, samples in self.self_samples.most_common(count)]
+
+class Metrics:
+    """
+    Collects timing histograms per phase of the simulation and drawing
+    loop, event counters and optional sampling-profiler results.
+    Components hold an optional Metrics and only record when one is set,
+    so instrumentation costs a single None check when it is disabled.
+    Only whole phases are timed, never per-robot or per-lane calls, so that
+    check runs a handful of times per tick however large the fleet is.
+    """
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.timings: Dict[str, Histogram] = {}
+        self.counters: Counter = Counter()
+        self.profiler: Optional[SamplingProfiler] = None
+        self.started_at = time.perf_counter()
+
+    def record(self, phase: str, seconds: float) -> None:
+        """
+        Record the duration of one run of a phase.
+
+        Args:
+            phase: Name of the phase, such as "find_path".
+            seconds: Duration in seconds.
+        """
+        histogram = self.timings.get(phase)
+        if histogram is None:
+            histogram = self.timings[phase] = Histogram()
+        histogram.record(seconds)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            counter: Name of the counter, such as "lane_contention".
+            amount: Amount to add.
+        """
+        self.counters[counter] += amount
+
+    def start_profiler(self, interval: float = 0.001) -> None:
+        """
+        Start sampling the calling thread's stack.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        if self.profiler is None:
+            self.profiler = SamplingProfiler(interval)
+        self.profiler.start()
+
+    def stop_profiler(self) -> None:
+        """Stop the sampling profiler, keeping its samples."""
+        if self.profiler is not None:
+            self.profiler.stop()
+
+    def toggle_profiler(self) -> bool:
+        """
+        Start the sampling profiler if it is stopped, or stop it if it is running.
+
+        Returns:
+            True if the profiler is now running.
+        """
+        if self.profiler is not None and self.profiler.is_running():
+            self.stop_profiler()
+            return False
+        self.start_profiler()
+        return True
+
+    def reset(self) -> None:
+        """Clear all timings, counters and profiler samples."""
+        running = self.profiler is not None and self.profiler.is_running()
+        self.stop_profiler()
+        self.timings.clear()
+        self.counters.clear()
+        self.profiler = None
+        self.started_at = time.perf_counter()
+        if running:
+            self.start_profiler()
+
+    def snapshot(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Get all metrics as plain data, e.g. for JSON output.
+
+        Args:
+            top: Number of profiler functions to include.
+
+        Returns:
+            Dictionary with the elapsed time, per-phase timing summaries, counters
+            and, if the profiler has run, its sample count and top functions.
+        """
+        result = {
+            "elapsed": time.perf_counter() - self.started_at,
+            "timings": {phase: histogram.to_dict() for phase, histogram in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self.profiler is not None:
+            result["profile"] = {
+                "samples": self.profiler.samples,
+                "top": [{"function": function, "self": own, "total": total}
+                        for function, own, total in self.profiler.get_top(top)],
+            }
+        return result
+
+    def format_summary(self, top: int = 5) -> List[str]:
+        """
+        Format the metrics as short text lines.
+
+        Args:
+            top: Number of profiler functions to include.
+
+        Returns:
+            List of lines: one per phase (count, mean and p95 in milliseconds),
+            the counters, and the top profiler functions if the profiler has run.
+        """
+        lines = []
+        for phase, histogram in sorted(self.timings.items()):
+            lines.append(f"{phase:<18} n={histogram.count:<7} mean={histogram.total / histogram.count * 1000:.3f}ms "
+                         f"p95={histogram.get_percentile(95) * 1000:.3f}ms")
+        if self.counters:
+            lines.append("  ".join(f"{counter}={count}" for counter, count in sorted(self.counters.items())))
+        if self.profiler is not None and self.profiler.samples:
+            state = "on" if self.profiler.is_running() else "off"
+            lines.append(f"profiler ({state}, {self.profiler.samples} samples):")
+            for function, own, total in self.profiler.get_top(top):
+                lines.append(f"  {own * 100 / self.profiler.samples:5.1f}% self "
+                             f"{total * 100 / self.profiler.samples:5.1f}% total  {function}")
+        return lines
+
+def timed(phase: str) -> Callable:
+    """
+    Decorate a method so that each call is recorded under a phase in the
+    Metrics held by the instance's metrics attribute, if it has one.
+    Meant for methods that run once per phase, such as a tick, rather than
+    once per robot event.
+
+    Args:
+        phase: Name of the phase.
+
+    Returns:
+        Method decorator.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorator
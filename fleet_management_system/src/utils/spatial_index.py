@@ -0,0 +1,70 @@
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class GridIndex:
+    """
+    Uniform grid of buckets over 2D points.
+    A radius query only looks at the buckets the search circle overlaps, so
+    with a cell size close to the query radius a lookup touches a handful
+    of points regardless of how many are indexed.
+    """
+    def __init__(self, cell_size: float):
+        """
+        Initialize an empty index.
+
+        Args:
+            cell_size: Width and height of a grid cell.
+        """
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Tuple[Hashable, float, float]]] = {}
+        self.size = 0
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        Get the cell containing a point.
+
+        Args:
+            x: X-coordinate.
+            y: Y-coordinate.
+
+        Returns:
+            Cell coordinates.
+        """
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, key: Hashable, x: float, y: float) -> None:
+        """
+        Add a point.
+
+        Args:
+            key: Identifier returned by queries.
+            x: X-coordinate.
+            y: Y-coordinate.
+        """
+        self.cells.setdefault(self._cell(x, y), []).append((key, x, y))
+        self.size += 1
+
+    def nearest(self, x: float, y: float, max_distance: float) -> Optional[Hashable]:
+        """
+        Find the point closest to a location within a maximum distance.
+
+        Args:
+            x: X-coordinate of the location.
+            y: Y-coordinate of the location.
+            max_distance: Points further away than this are ignored.
+
+        Returns:
+            Key of the nearest point, or None if none is close enough.
+        """
+        min_cell_x, min_cell_y = self._cell(x - max_distance, y - max_distance)
+        max_cell_x, max_cell_y = self._cell(x + max_distance, y + max_distance)
+        closest_key = None
+        closest_dist = max_distance
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                for key, point_x, point_y in self.cells.get((cell_x, cell_y), ()):
+                    dist = math.hypot(point_x - x, point_y - y)
+                    if dist < closest_dist:
+                        closest_dist = dist
+                        closest_key = key
+        return closest_key
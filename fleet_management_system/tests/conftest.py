@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from utils.graph_generators import generate_warehouse_graph, write_graph
+
+@pytest.fixture
+def warehouse_graph(tmp_path) -> str:
+    """
+    Write a 12-aisle warehouse graph to a temporary file.
+
+    Returns:
+        Path of the graph file.
+    """
+    graph_file = str(tmp_path / "warehouse.json")
+    write_graph(generate_warehouse_graph(12, 6), graph_file)
+    return graph_file
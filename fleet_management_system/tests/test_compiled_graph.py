@@ -0,0 +1,87 @@
+import logging
+import os
+
+import pytest
+
+from models.compiled_graph import CACHE_SUFFIX, CompiledGraph, load_compiled_graph
+from utils.graph_generators import generate_grid_graph, write_graph
+
+DEFAULT_SPEED = 1.0
+
+@pytest.fixture
+def grid_graph(tmp_path) -> str:
+    """
+    Write a small grid graph to a temporary file.
+
+    Returns:
+        Path of the graph file.
+    """
+    graph_file = str(tmp_path / "grid.json")
+    write_graph(generate_grid_graph(4, 4), graph_file)
+    return graph_file
+
+def is_cached(graph: CompiledGraph) -> bool:
+    """Check whether a graph was mapped from a cache file rather than compiled from JSON."""
+    return graph.buffer is not None
+
+def test_cache_is_written_and_reused(grid_graph):
+    """The first load compiles the JSON and writes the cache; the second maps it."""
+    assert not is_cached(load_compiled_graph(grid_graph, DEFAULT_SPEED))
+    assert os.path.exists(grid_graph + CACHE_SUFFIX)
+    assert is_cached(load_compiled_graph(grid_graph, DEFAULT_SPEED))
+
+def test_touched_json_reuses_cache(grid_graph):
+    """A new modification time with the same contents keeps the cache, without rewriting it."""
+    load_compiled_graph(grid_graph, DEFAULT_SPEED)
+    cache_stat = os.stat(grid_graph + CACHE_SUFFIX)
+    stat = os.stat(grid_graph)
+    os.utime(grid_graph, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10 ** 9))
+
+    assert is_cached(load_compiled_graph(grid_graph, DEFAULT_SPEED))
+    assert os.stat(grid_graph + CACHE_SUFFIX).st_mtime_ns == cache_stat.st_mtime_ns
+
+def test_same_size_edit_rebuilds_cache(grid_graph):
+    """An edit that keeps the size and the modification time still rebuilds the cache."""
+    load_compiled_graph(grid_graph, DEFAULT_SPEED)
+    stat = os.stat(grid_graph)
+    with open(grid_graph) as f:
+        text = f.read()
+    with open(grid_graph, 'w') as f:
+        f.write(text.replace('"G0_0"', '"G9_9"', 1))
+    os.utime(grid_graph, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(grid_graph).st_size == stat.st_size
+
+    graph = load_compiled_graph(grid_graph, DEFAULT_SPEED)
+    assert not is_cached(graph)
+    assert graph.get_vertex_name(0) == "G9_9"
+    graph = load_compiled_graph(grid_graph, DEFAULT_SPEED)
+    assert is_cached(graph)
+    assert graph.get_vertex_name(0) == "G9_9"
+
+def test_default_speed_change_rebuilds_cache(grid_graph):
+    """Travel times depend on the default speed, so changing it rebuilds the cache."""
+    slow = load_compiled_graph(grid_graph, DEFAULT_SPEED)
+    fast = load_compiled_graph(grid_graph, 2 * DEFAULT_SPEED)
+    assert not is_cached(fast)
+    assert fast.arrays["lane_travel_times"][0] == pytest.approx(slow.arrays["lane_travel_times"][0] / 2)
+    assert is_cached(load_compiled_graph(grid_graph, 2 * DEFAULT_SPEED))
+
+@pytest.mark.parametrize("blocked_by", ["read_only_directory", "directory_at_cache_path"])
+def test_unwritable_cache_falls_back_to_json(grid_graph, tmp_path, caplog, blocked_by):
+    """If the cache cannot be written, every load compiles the JSON and logs a warning."""
+    if blocked_by == "read_only_directory":
+        os.chmod(tmp_path, 0o555)
+        if os.access(tmp_path, os.W_OK):
+            os.chmod(tmp_path, 0o755)
+            pytest.skip("permissions are not enforced for this user")
+    else:
+        os.mkdir(grid_graph + CACHE_SUFFIX)
+    try:
+        with caplog.at_level(logging.WARNING):
+            for _ in range(2):
+                graph = load_compiled_graph(grid_graph, DEFAULT_SPEED)
+                assert not is_cached(graph)
+                assert graph.num_vertices == 16
+        assert "Could not write graph cache" in caplog.text
+    finally:
+        os.chmod(tmp_path, 0o755)
@@ -0,0 +1,70 @@
+import random
+from typing import List
+
+import pytest
+
+from models.nav_graph import NavGraph
+from utils.graph_generators import (generate_grid_graph, generate_multilevel_graph,
+                                    generate_warehouse_graph, write_graph)
+
+GRAPHS = {
+    "grid": lambda: generate_grid_graph(8, 8),
+    "warehouse": lambda: generate_warehouse_graph(12, 6),
+    "multilevel": lambda: generate_multilevel_graph(3, 5, 5),
+}
+NUM_QUERIES = 200
+NUM_UPDATES = 4  # Rounds of speed limit changes after the first comparison
+LANES_PER_UPDATE = 10
+
+def get_path_cost(nav_graph: NavGraph, path: List[int]) -> float:
+    """
+    Get the travel time of a path, checking that every hop is a lane.
+
+    Returns:
+        Sum of the lane travel times along the path.
+    """
+    cost = 0.0
+    for from_vertex, to_vertex in zip(path, path[1:]):
+        lane_id = nav_graph.get_lane_id(from_vertex, to_vertex)
+        assert lane_id is not None, f"no lane {from_vertex} -> {to_vertex}"
+        cost += nav_graph.lane_travel_times[lane_id]
+    return cost
+
+def assert_same_costs(nav_graph: NavGraph, rng: random.Random) -> None:
+    """Check that CH and Dijkstra find paths of equal travel time between random vertices."""
+    ch_planner = nav_graph.get_planner("ch")
+    dijkstra_planner = nav_graph.get_planner("dijkstra")
+    num_vertices = len(nav_graph.vertices)
+    for _ in range(NUM_QUERIES):
+        start, end = rng.randrange(num_vertices), rng.randrange(num_vertices)
+        ch_path = ch_planner.find_path(start, end)
+        dijkstra_path = dijkstra_planner.find_path(start, end)
+        assert bool(ch_path) == bool(dijkstra_path), (start, end)
+        if not ch_path:
+            continue
+        assert (ch_path[0], ch_path[-1]) == (start, end)
+        assert get_path_cost(nav_graph, ch_path) == pytest.approx(get_path_cost(nav_graph, dijkstra_path)), \
+            (start, end)
+
+@pytest.mark.parametrize("graph_name", sorted(GRAPHS))
+def test_ch_matches_dijkstra(tmp_path, graph_name):
+    """
+    The contraction hierarchy must find routes as fast as Dijkstra's, both
+    when first built and after lane speed limits change.
+    """
+    graph_file = str(tmp_path / f"{graph_name}.json")
+    write_graph(GRAPHS[graph_name](), graph_file)
+    nav_graph = NavGraph(graph_file)
+    rng = random.Random(0)
+    assert_same_costs(nav_graph, rng)
+
+    lanes = nav_graph.get_all_lanes()
+    for _ in range(NUM_UPDATES):
+        for from_vertex, to_vertex in rng.sample(lanes, LANES_PER_UPDATE):
+            nav_graph.set_lane_speed_limit(from_vertex, to_vertex, rng.choice([0.2, 0.5, 2.0, 5.0]))
+        assert_same_costs(nav_graph, rng)
+
+    # Restoring the default speed makes some shortcuts fast again
+    for from_vertex, to_vertex in lanes:
+        nav_graph.set_lane_speed_limit(from_vertex, to_vertex, 0)
+    assert_same_costs(nav_graph, rng)
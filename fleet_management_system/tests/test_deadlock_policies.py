@@ -0,0 +1,55 @@
+import logging
+import random
+
+import pytest
+
+from controllers.fleet_manager import FleetManager
+from controllers.traffic_manager import TrafficManager
+from models.nav_graph import NavGraph
+from models.robot import IDLE, TASK_COMPLETE, WAITING
+
+NUM_ROBOTS = 120
+NUM_TICKS = 1500
+TASK_INTERVAL = 30  # Ticks between handing new tasks to idle robots
+WINDOW = 300  # Ticks in which at least one task must complete
+MAX_WAIT = 750  # Longest a robot may wait for a lane without moving
+
+@pytest.mark.parametrize("mode", ["scalar", "vectorized", "event_driven"])
+@pytest.mark.parametrize("policy", ["backoff_youngest", "replan"])
+def test_policy_keeps_fleet_moving(warehouse_graph, tmp_path, caplog, policy, mode):
+    """
+    A crowded warehouse must keep completing tasks under every deadlock
+    policy, and no robot may stay stuck waiting for a lane.
+    """
+    caplog.set_level(logging.WARNING)
+    nav_graph = NavGraph(warehouse_graph)
+    fleet_manager = FleetManager(nav_graph, str(tmp_path / "fleet.log"),
+                                 vectorized=mode == "vectorized", event_driven=mode == "event_driven",
+                                 traffic_manager=TrafficManager(nav_graph, deadlock_policy=policy))
+    rng = random.Random(0)
+    num_vertices = len(nav_graph.vertices)
+    for _ in range(NUM_ROBOTS):
+        fleet_manager.spawn_robot(rng.randrange(num_vertices))
+
+    statuses = {robot_id: IDLE for robot_id in fleet_manager.robots}
+    waiting_since = {}
+    completions = [0] * (NUM_TICKS // WINDOW)
+    for tick in range(NUM_TICKS):
+        if tick % TASK_INTERVAL == 0:
+            for robot in fleet_manager.robots.values():
+                if robot.status_code in (IDLE, TASK_COMPLETE):
+                    fleet_manager.assign_task(robot.id, rng.randrange(num_vertices))
+        fleet_manager.update_robots(1)
+
+        for robot in fleet_manager.robots.values():
+            status = robot.status_code
+            if status == TASK_COMPLETE and statuses[robot.id] != TASK_COMPLETE:
+                completions[tick // WINDOW] += 1
+            statuses[robot.id] = status
+            if status == WAITING:
+                since = waiting_since.setdefault(robot.id, tick)
+                assert tick - since <= MAX_WAIT, f"{robot.id} waited since tick {since}"
+            else:
+                waiting_since.pop(robot.id, None)
+
+    assert all(count > 0 for count in completions), completions
@@ -0,0 +1,71 @@
+import logging
+import random
+
+import pytest
+
+from controllers.fleet_manager import FleetManager
+from models.nav_graph import NavGraph
+from models.robot import IDLE, TASK_COMPLETE
+from utils.event_journal import JournalReader
+
+NUM_ROBOTS = 40
+NUM_TICKS = 1200  # Long enough for the journal to write a snapshot
+TASK_INTERVAL = 30
+CHECK_INTERVAL = 200
+
+def get_live_state(fleet_manager: FleetManager):
+    """
+    Get the state a journal replay should rebuild from a running fleet.
+
+    Returns:
+        Tuple of ({robot ID: (status, vertex)}, {(from, to): owning robot ID}).
+    """
+    nav_graph = fleet_manager.nav_graph
+    robots = {robot.id: (robot.status, robot.current_vertex) for robot in fleet_manager.robots.values()}
+    lanes = {nav_graph.get_lane_endpoints(lane_id): robot_id
+             for lane_id, robot_id in enumerate(nav_graph.lane_occupancy) if robot_id is not None}
+    return robots, lanes
+
+@pytest.mark.parametrize("mode", ["scalar", "vectorized", "event_driven"])
+def test_replay_matches_live_fleet(warehouse_graph, tmp_path, caplog, mode):
+    """
+    Replaying a journal must rebuild the live fleet state at any tick,
+    with robots reported under their original, non-numeric IDs.
+    """
+    caplog.set_level(logging.WARNING)
+    journal_file = str(tmp_path / "run.journal")
+    nav_graph = NavGraph(warehouse_graph)
+    fleet_manager = FleetManager(nav_graph, str(tmp_path / "fleet.log"),
+                                 vectorized=mode == "vectorized", event_driven=mode == "event_driven",
+                                 journal_file=journal_file)
+    rng = random.Random(0)
+    num_vertices = len(nav_graph.vertices)
+    for i in range(NUM_ROBOTS):
+        robot_id = f"amr-{i:02d}" if i % 2 else f"dock/{chr(ord('a') + i % 26)}{i}"
+        fleet_manager.spawn_robot(rng.randrange(num_vertices), robot_id=robot_id)
+
+    # Sample after each tick's task assignments, which are journaled at that tick
+    expected = {}
+    for tick in range(NUM_TICKS + 1):
+        if tick % TASK_INTERVAL == 0:
+            for robot in fleet_manager.robots.values():
+                if robot.status_code in (IDLE, TASK_COMPLETE):
+                    fleet_manager.assign_task(robot.id, rng.randrange(num_vertices))
+        if tick % CHECK_INTERVAL == 0:
+            expected[fleet_manager.get_current_tick()] = get_live_state(fleet_manager)
+        fleet_manager.update_robots(1)
+    fleet_manager.journal.close()
+
+    reader = JournalReader(journal_file)
+    try:
+        assert reader.snapshots
+        assert sorted(reader.robot_ids) == sorted(fleet_manager.robots)
+        for tick, (robots, lanes) in expected.items():
+            state = reader.state_at(tick)
+            replayed_robots = {reader.get_robot_id(robot): (robot_state.status, robot_state.vertex)
+                               for robot, robot_state in state.robots.items()}
+            replayed_lanes = {lane: reader.get_robot_id(robot) for lane, robot in state.lanes.items()}
+            assert replayed_robots == robots, f"robots differ at tick {tick}"
+            assert replayed_lanes == lanes, f"lanes differ at tick {tick}"
+    finally:
+        reader.close()
@@ -0,0 +1,40 @@
+import pytest
+
+from models.nav_graph import NavGraph
+from utils.graph_generators import generate_multilevel_graph, write_graph
+from utils.graph_partition import partition_graph
+
+@pytest.fixture
+def building(tmp_path) -> NavGraph:
+    """
+    Load a three-floor building whose floors are stacked at the same coordinates.
+
+    Returns:
+        NavGraph of the building.
+    """
+    graph_file = str(tmp_path / "building.json")
+    write_graph(generate_multilevel_graph(3, 6, 6), graph_file)
+    return NavGraph(graph_file)
+
+def get_region_levels(nav_graph: NavGraph, regions):
+    """Get the levels each region has vertices on."""
+    region_levels = {}
+    for vertex, region in enumerate(regions):
+        region_levels.setdefault(region, set()).add(nav_graph.get_vertex_level(vertex))
+    return region_levels
+
+def test_one_region_per_level(building):
+    """With as many regions as levels, each region is exactly one floor."""
+    regions = partition_graph(building, 3)
+    assert get_region_levels(building, regions) == {0: {0}, 1: {1}, 2: {2}}
+
+@pytest.mark.parametrize("num_regions", [2, 4, 5, 6])
+def test_regions_are_balanced_across_levels(building, num_regions):
+    """Regions have nearly equal sizes, and no two regions share more than a slab of one floor."""
+    regions = partition_graph(building, num_regions)
+    sizes = [regions.count(region) for region in range(num_regions)]
+    assert max(sizes) - min(sizes) <= 1
+    # Regions are cut in level order, so their levels form consecutive, barely overlapping ranges
+    region_levels = get_region_levels(building, regions)
+    for region in range(num_regions - 1):
+        assert max(region_levels[region]) <= min(region_levels[region + 1])
@@ -0,0 +1,53 @@
+import pytest
+
+from models.nav_graph import NavGraph
+from utils.graph_generators import generate_multilevel_graph, write_graph
+
+@pytest.fixture
+def building_graph(tmp_path) -> str:
+    """
+    Write a three-floor building graph to a temporary file.
+
+    Returns:
+        Path of the graph file.
+    """
+    graph_file = str(tmp_path / "building.json")
+    write_graph(generate_multilevel_graph(3, 6, 6), graph_file)
+    return graph_file
+
+def get_indexed_levels(nav_graph: NavGraph):
+    """Get the levels of every vertex the adjacency indexes have copied out of the cache."""
+    vertices = set(nav_graph.adjacency) | set(nav_graph.reverse_adjacency) | set(nav_graph.lane_ids)
+    return {nav_graph.get_vertex_level(vertex) for vertex in vertices}
+
+@pytest.mark.parametrize("planner", ["bfs", "dijkstra", "astar"])
+def test_levels_off_the_route_are_not_indexed(building_graph, planner):
+    """Routing between two floors must not read the third floor's adjacency out of the cache."""
+    NavGraph(building_graph)  # Write the cache
+    nav_graph = NavGraph(building_graph, all_pairs_max_vertices=0)
+    assert get_indexed_levels(nav_graph) == set()
+
+    start = nav_graph.get_vertex_index_on_level("level1", 0)
+    end = nav_graph.get_vertex_index_on_level("level2", 35)
+    path = nav_graph.find_path(start, end, planner)
+    assert path[0] == start and path[-1] == end
+    assert get_indexed_levels(nav_graph) == {0, 1}
+
+def test_cached_graph_matches_json(building_graph):
+    """A graph loaded from the cache must have the same lanes, indexes and names as one parsed from JSON."""
+    NavGraph(building_graph)
+    cached = NavGraph(building_graph)
+    parsed = NavGraph(building_graph, use_graph_cache=False)
+    assert len(cached.vertices) == len(parsed.vertices)
+    assert cached.transition_lanes == parsed.transition_lanes
+    for vertex in range(len(parsed.vertices)):
+        assert cached.lane_ids[vertex] == parsed.lane_ids[vertex]
+        assert cached.reverse_adjacency[vertex] == parsed.reverse_adjacency[vertex]
+        assert cached.get_vertex_name(vertex) == parsed.get_vertex_name(vertex)
+        assert cached.get_vertex_index_by_name(parsed.get_vertex_name(vertex)) == vertex
+
+    vertex = cached.add_vertex(100.0, 100.0, {"name": "dock"})
+    assert cached.add_lane(0, vertex) is not None
+    assert cached.get_vertex_index_by_name("dock") == vertex
+    assert cached.get_connected_vertices(0)[-1] == vertex
+    assert cached.get_incoming_vertices(vertex) == [0]